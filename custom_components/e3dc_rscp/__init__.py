@@ -5,12 +5,10 @@
 #    log once when reconnected.
 #    -> Needs special care, as auth credentials change when E3DC is offline,
 #       haven't tested this yet, so we work only as long as we're connected.
-# 2. Handles device/service unavailable. Log a warning once when unavailable,
-#    log once when reconnected.
-#    -> Similar to previous point, right now, we'll run into connection errors,
-#       we need an update to the E3DC lib to catch this safely, working on that one.
-# 3. Set available property to False if appropriate
-#    -> once 2 is done, update the entity's available state appropriately.
+#
+# Device/service unavailability is handled by the connection supervisor in
+# e3dc_proxy.py, which paces reconnects and fails the coordinator update, making
+# the entities unavailable while the connection is lost.
 
 from __future__ import annotations
 
@@ -26,6 +24,8 @@ from homeassistant.const import (
 )
 from .coordinator import E3DCCoordinator
 from .services import async_setup_services
+from .state_snapshot import E3DCStateSnapshot
+from .topology_cache import E3DCTopologyCache
 from e3dc._e3dc_rscp_local import DEFAULT_PORT as RSCP_PORT
 
 
@@ -57,19 +57,33 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.unique_id] = coordinator
-    await coordinator.async_identify_farm(hass)
-    await coordinator.async_identify_sgready()
-    await coordinator.async_identify_wallboxes(hass)
-    await coordinator.async_identify_batteries(hass)
+    # The platforms start with the core entities, farm, SG Ready, wallboxes and
+    # batteries are identified in the background and added once known.
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     await async_setup_services(hass)
+    coordinator.async_start_identification()
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
 
     return True
 
 
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options without reloading, keeping connection and topology."""
+    coordinator: E3DCCoordinator = hass.data[DOMAIN][entry.unique_id]
+    await coordinator.async_apply_options()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload the config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        # The coordinator shuts itself down along with the entry, stopping a
+        # running capture and its executor.
         hass.data[DOMAIN].pop(entry.unique_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached topology and the state snapshot along with the config entry."""
+    await E3DCTopologyCache(hass, entry.unique_id).async_remove()
+    await E3DCStateSnapshot(hass, entry.unique_id).async_remove()
@@ -120,148 +120,52 @@ class E3DCBatteryManager:
         # Clear battery pack data
         self._battery_packs.clear()
 
-    async def async_identify_batteries(self) -> None:
-        """Identify installed battery modules if enabled via options."""
+    async def async_identify_batteries(
+        self, topology: list[dict[str, Any]] | None = None
+    ) -> list[dict[str, Any]] | None:
+        """Identify installed battery modules if enabled via options.
+
+        Uses the given battery topology, discovering it from E3DC if it is not
+        known yet. Returns the topology in use, None if battery devices are
+        disabled or the topology could not be loaded.
+        """
         async with self._identify_lock:
             if not self.create_battery_devices:
                 _LOGGER.debug(
                     "Battery devices disabled via options, skipping identification"
                 )
                 await self.async_clear_battery_devices()
-                return
-
-            try:
-                batteries_config: list[
-                    dict[str, Any]
-                ] = await self.hass.async_add_executor_job(self.proxy.get_batteries)
-            except HomeAssistantError as ex:
-                _LOGGER.warning(
-                    "Failed to load battery configuration, skipping battery devices: %s",
-                    ex,
-                )
-                return
-
-            try:
-                battery_data: Any = await self.hass.async_add_executor_job(
-                    self.proxy.get_battery_data
-                )
-            except HomeAssistantError as ex:
-                _LOGGER.warning(
-                    "Failed to load battery data, continuing with limited information: %s",
-                    ex,
-                )
-                battery_data = None
-
-            if not isinstance(batteries_config, list):
-                _LOGGER.debug(
-                    "Battery configuration returned unexpected payload: %s",
-                    batteries_config,
-                )
-                batteries_config = []
-
-            battery_details_by_pack: dict[int, dict[str, Any]] = {}
-            if isinstance(battery_data, list):
-                for pack in battery_data:
-                    if isinstance(pack, dict) and "index" in pack:
-                        battery_details_by_pack[pack["index"]] = pack
-            elif isinstance(battery_data, dict):
-                pack_index = battery_data.get("index", 0)
-                battery_details_by_pack[pack_index] = battery_data
-
-            def _normalize(value: Any) -> Any:
-                if isinstance(value, str):
-                    stripped = value.strip()
-                    if stripped == "":
-                        return None
-                return value
-
-            self._batteries.clear()
-            pack_entries: dict[int, E3DCBatteryPack] = {}
-
-            for battery_config in batteries_config or []:
-                pack_index = battery_config.get("index", 0)
-                dcb_count = battery_config.get("dcbs", 0)
-                pack_details = battery_details_by_pack.get(pack_index, {})
-                dcbs_details: dict[int, dict[str, Any]] = {}
-                if isinstance(pack_details, dict):
-                    dcbs = pack_details.get("dcbs")
-                    if isinstance(dcbs, dict):
-                        dcbs_details = dcbs
-
-                pack_key = f"battery-pack-{pack_index}"
-                pack_unique_id = f"{self.uid}-{pack_key}"
-                pack_entry: E3DCBatteryPack | None = pack_entries.get(pack_index)
-                if pack_entry is None:
-                    pack_manufacturer = _normalize(pack_details.get("manufactureName"))
-                    pack_model = _normalize(pack_details.get("deviceName"))
-                    pack_name = f"Battery Pack {pack_index + 1}"
-
-                    deviceInfo: DeviceInfo = DeviceInfo(
-                        identifiers={(DOMAIN, pack_unique_id)},
-                        via_device=(DOMAIN, self.uid),
-                        manufacturer=pack_manufacturer,
-                        name=pack_name,
-                        model=pack_model,
-                    )
-
-                    pack_entry = E3DCBatteryPack(
-                        index=pack_index,
-                        key=pack_key,
-                        uniqueId=pack_unique_id,
-                        name=pack_name,
-                        deviceInfo=deviceInfo,
+                return None
+
+            battery_data: Any = None
+            discovered: bool = topology is None
+            if topology is None:
+                try:
+                    batteries_config: list[
+                        dict[str, Any]
+                    ] = await self.proxy.async_get_batteries()
+                except HomeAssistantError as ex:
+                    _LOGGER.warning(
+                        "Failed to load battery configuration, skipping battery devices: %s",
+                        ex,
                     )
-                    pack_entries[pack_index] = pack_entry
-
-                for dcb_index in range(dcb_count):
-                    battery_key = f"battery-{pack_index}-{dcb_index}"
-                    unique_id = f"{self.uid}-{battery_key}"
-                    dcb_detail = (
-                        dcbs_details.get(dcb_index, {})
-                        if isinstance(dcbs_details, dict)
-                        else {}
+                    return None
+
+                try:
+                    battery_data = await self.proxy.async_get_battery_data()
+                except HomeAssistantError as ex:
+                    _LOGGER.warning(
+                        "Failed to load battery data, continuing with limited information: %s",
+                        ex,
                     )
 
-                    manufacturer = _normalize(dcb_detail.get("manufactureName"))
-                    model = _normalize(dcb_detail.get("deviceName"))
-                    name = f"Battery Pack {pack_index + 1} Module {dcb_index + 1}"
-                    serial_no = _normalize(dcb_detail.get("serialNo"))
-                    fw_version = _normalize(dcb_detail.get("fwVersion"))
-                    pcb_version = _normalize(dcb_detail.get("pcbVersion"))
-
-                    deviceInfo = DeviceInfo(
-                        identifiers={(DOMAIN, unique_id)},
-                        via_device=(DOMAIN, pack_entry["uniqueId"]),
-                        manufacturer=manufacturer,
-                        name=name,
-                        model=model,
-                    )
+                topology = self._build_topology(batteries_config, battery_data)
 
-                    if serial_no is not None:
-                        deviceInfo["serial_number"] = str(serial_no)
-                    if fw_version is not None:
-                        deviceInfo["sw_version"] = str(fw_version)
-                    if pcb_version is not None:
-                        deviceInfo["hw_version"] = str(pcb_version)
-
-                    # Check if device reports SoH for this module
-                    has_device_soh = dcb_detail.get("soh") is not None
-
-                    battery_entry: E3DCBattery = {
-                        "packIndex": pack_index,
-                        "dcbIndex": dcb_index,
-                        "key": battery_key,
-                        "deviceInfo": deviceInfo,
-                        "hasDeviceReportedSoh": has_device_soh,
-                    }
-                    self._batteries.append(battery_entry)
-
-            self._battery_packs = [
-                pack_entries[index] for index in sorted(pack_entries.keys())
-            ]
+            self._apply_topology(topology)
 
             if len(self._batteries) > 0:
-                await self.async_load_and_process_battery_data(battery_data)
+                if discovered:
+                    await self.async_load_and_process_battery_data(battery_data)
                 _LOGGER.debug(
                     "Identified %s battery modules across %s packs",
                     len(self._batteries),
@@ -270,6 +174,151 @@ class E3DCBatteryManager:
             else:
                 _LOGGER.debug("No battery modules were identified")
 
+            return topology
+
+    async def async_discover_topology(self) -> list[dict[str, Any]]:
+        """Discover the battery topology from E3DC without applying it."""
+        batteries_config: list[dict[str, Any]] = await self.proxy.async_get_batteries()
+        battery_data: Any = await self.proxy.async_get_battery_data()
+        return self._build_topology(batteries_config, battery_data)
+
+    def _build_topology(
+        self, batteries_config: Any, battery_data: Any
+    ) -> list[dict[str, Any]]:
+        """Extract the identity of all packs and modules from the loaded data.
+
+        The result only consists of plain values, so that it can be cached.
+        """
+        if not isinstance(batteries_config, list):
+            _LOGGER.debug(
+                "Battery configuration returned unexpected payload: %s",
+                batteries_config,
+            )
+            batteries_config = []
+
+        battery_details_by_pack: dict[int, dict[str, Any]] = {}
+        if isinstance(battery_data, list):
+            for pack in battery_data:
+                if isinstance(pack, dict) and "index" in pack:
+                    battery_details_by_pack[pack["index"]] = pack
+        elif isinstance(battery_data, dict):
+            pack_index = battery_data.get("index", 0)
+            battery_details_by_pack[pack_index] = battery_data
+
+        def _normalize(value: Any) -> Any:
+            if isinstance(value, str):
+                stripped = value.strip()
+                if stripped == "":
+                    return None
+            return value
+
+        topology: list[dict[str, Any]] = []
+        for battery_config in batteries_config:
+            pack_index = battery_config.get("index", 0)
+            dcb_count = battery_config.get("dcbs", 0)
+            pack_details = battery_details_by_pack.get(pack_index, {})
+            dcbs_details: dict[int, dict[str, Any]] = {}
+            if isinstance(pack_details, dict):
+                dcbs = pack_details.get("dcbs")
+                if isinstance(dcbs, dict):
+                    dcbs_details = dcbs
+
+            dcbs_topology: list[dict[str, Any]] = []
+            for dcb_index in range(dcb_count):
+                dcb_detail = dcbs_details.get(dcb_index, {})
+                dcbs_topology.append(
+                    {
+                        "index": dcb_index,
+                        "manufactureName": _normalize(
+                            dcb_detail.get("manufactureName")
+                        ),
+                        "deviceName": _normalize(dcb_detail.get("deviceName")),
+                        "serialNo": _normalize(dcb_detail.get("serialNo")),
+                        "fwVersion": _normalize(dcb_detail.get("fwVersion")),
+                        "pcbVersion": _normalize(dcb_detail.get("pcbVersion")),
+                        # Check if device reports SoH for this module
+                        "hasDeviceReportedSoh": dcb_detail.get("soh") is not None,
+                    }
+                )
+
+            topology.append(
+                {
+                    "index": pack_index,
+                    "manufactureName": _normalize(pack_details.get("manufactureName")),
+                    "deviceName": _normalize(pack_details.get("deviceName")),
+                    "dcbs": dcbs_topology,
+                }
+            )
+
+        return topology
+
+    def _apply_topology(self, topology: list[dict[str, Any]]) -> None:
+        """Set up the battery packs and modules of the given topology."""
+        self._batteries.clear()
+        pack_entries: dict[int, E3DCBatteryPack] = {}
+
+        for pack_topology in topology:
+            pack_index = pack_topology["index"]
+            pack_key = f"battery-pack-{pack_index}"
+            pack_unique_id = f"{self.uid}-{pack_key}"
+            pack_entry: E3DCBatteryPack | None = pack_entries.get(pack_index)
+            if pack_entry is None:
+                pack_name = f"Battery Pack {pack_index + 1}"
+
+                deviceInfo: DeviceInfo = DeviceInfo(
+                    identifiers={(DOMAIN, pack_unique_id)},
+                    via_device=(DOMAIN, self.uid),
+                    manufacturer=pack_topology["manufactureName"],
+                    name=pack_name,
+                    model=pack_topology["deviceName"],
+                )
+
+                pack_entry = E3DCBatteryPack(
+                    index=pack_index,
+                    key=pack_key,
+                    uniqueId=pack_unique_id,
+                    name=pack_name,
+                    deviceInfo=deviceInfo,
+                )
+                pack_entries[pack_index] = pack_entry
+
+            for dcb_topology in pack_topology["dcbs"]:
+                dcb_index = dcb_topology["index"]
+                battery_key = f"battery-{pack_index}-{dcb_index}"
+                unique_id = f"{self.uid}-{battery_key}"
+                name = f"Battery Pack {pack_index + 1} Module {dcb_index + 1}"
+                serial_no = dcb_topology["serialNo"]
+                fw_version = dcb_topology["fwVersion"]
+                pcb_version = dcb_topology["pcbVersion"]
+
+                deviceInfo = DeviceInfo(
+                    identifiers={(DOMAIN, unique_id)},
+                    via_device=(DOMAIN, pack_entry["uniqueId"]),
+                    manufacturer=dcb_topology["manufactureName"],
+                    name=name,
+                    model=dcb_topology["deviceName"],
+                )
+
+                if serial_no is not None:
+                    deviceInfo["serial_number"] = str(serial_no)
+                if fw_version is not None:
+                    deviceInfo["sw_version"] = str(fw_version)
+                if pcb_version is not None:
+                    deviceInfo["hw_version"] = str(pcb_version)
+
+                battery_entry: E3DCBattery = {
+                    "packIndex": pack_index,
+                    "dcbIndex": dcb_index,
+                    "key": battery_key,
+                    "deviceInfo": deviceInfo,
+                    "hasDeviceReportedSoh": dcb_topology["hasDeviceReportedSoh"],
+                }
+                self._batteries.append(battery_entry)
+
+        self._battery_packs = [
+            pack_entries[index] for index in sorted(pack_entries.keys())
+        ]
+
     async def async_load_and_process_battery_data(
         self, battery_data: Any | None = None
     ) -> None:
@@ -277,9 +326,7 @@ class E3DCBatteryManager:
         data: Any | None = battery_data
         if data is None:
             try:
-                data = await self.hass.async_add_executor_job(
-                    self.proxy.get_battery_data
-                )
+                data = await self.proxy.async_get_battery_data()
             except HomeAssistantError as ex:
                 _LOGGER.warning(
                     "Failed to load battery data, not updating sensors: %s", ex
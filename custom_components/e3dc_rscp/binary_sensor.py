@@ -14,10 +14,10 @@ from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_WALLBOXES_IDENTIFIED
 from .coordinator import E3DCCoordinator
+from .utils import E3DCEntity, async_add_entities_on_signal
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -254,6 +254,21 @@ async def async_setup_entry(
         for description in SENSOR_DESCRIPTIONS
     ]
 
+    async_add_entities(entities)
+
+    async_add_entities_on_signal(
+        hass,
+        entry,
+        SIGNAL_WALLBOXES_IDENTIFIED,
+        async_add_entities,
+        lambda: _create_wallbox_entities(coordinator),
+    )
+
+
+def _create_wallbox_entities(coordinator: E3DCCoordinator) -> list["E3DCBinarySensor"]:
+    """Create the binary sensors of all identified wallboxes."""
+    wallbox_entities: list[E3DCBinarySensor] = []
+
     for wallbox in coordinator.wallboxes:
         # Get the UID & Key for the given wallbox
         device_info = wallbox["deviceInfo"]
@@ -275,7 +290,7 @@ async def async_setup_entry(
             off_icon="mdi:weather-sunny-off",
             device_class=None,
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCBinarySensor(
                 coordinator,
                 wallbox_sun_mode_description,
@@ -292,7 +307,7 @@ async def async_setup_entry(
             device_class=BinarySensorDeviceClass.LOCK,
             entity_registry_enabled_default=False,  # Disabled per default as only Wallbox easy connect provides this state
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCBinarySensor(
                 coordinator,
                 wallbox_plug_lock_description,
@@ -308,7 +323,7 @@ async def async_setup_entry(
             off_icon="mdi:power-plug-off",
             device_class=BinarySensorDeviceClass.PLUG,
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCBinarySensor(
                 coordinator, wallbox_plug_description, unique_id, device_info
             )
@@ -322,7 +337,7 @@ async def async_setup_entry(
             device_class=BinarySensorDeviceClass.POWER,
             entity_registry_enabled_default=False,  # Disabled per default as only Wallbox multi connect I provides this feature
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCBinarySensor(
                 coordinator,
                 wallbox_schuko_description,
@@ -338,7 +353,7 @@ async def async_setup_entry(
             off_icon="mdi:car-electric-outline",
             device_class=BinarySensorDeviceClass.BATTERY_CHARGING,
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCBinarySensor(
                 coordinator,
                 wallbox_charging_description,
@@ -354,7 +369,7 @@ async def async_setup_entry(
             off_icon="mdi:check-circle-outline",
             device_class=None,
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCBinarySensor(
                 coordinator,
                 wallbox_charging_canceled_description,
@@ -371,7 +386,7 @@ async def async_setup_entry(
             device_class=None,
             entity_registry_enabled_default=False,
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCBinarySensor(
                 coordinator,
                 wallbox_battery_to_car_description,
@@ -388,7 +403,7 @@ async def async_setup_entry(
             device_class=BinarySensorDeviceClass.LOCK,
             entity_registry_enabled_default=False,
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCBinarySensor(
                 coordinator,
                 wallbox_key_state_description,
@@ -397,10 +412,10 @@ async def async_setup_entry(
             )
         )
 
-    async_add_entities(entities)
+    return wallbox_entities
 
 
-class E3DCBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class E3DCBinarySensor(E3DCEntity, BinarySensorEntity):
     """Custom E3DC Binary Sensor implementation."""
 
     _attr_has_entity_name: bool = True
@@ -413,7 +428,7 @@ class E3DCBinarySensor(CoordinatorEntity, BinarySensorEntity):
         device_info: DeviceInfo | None = None,
     ) -> None:
         """Initialize the Sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, (description.key,))
         self.coordinator: E3DCCoordinator = coordinator
         self.entity_description: E3DCBinarySensorEntityDescription = description
         self._attr_unique_id = f"{uid}_{description.key}"
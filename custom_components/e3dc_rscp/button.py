@@ -15,8 +15,9 @@ from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_WALLBOXES_IDENTIFIED
 from .coordinator import E3DCCoordinator
+from .utils import async_add_entities_on_signal
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,6 +46,21 @@ async def async_setup_entry(
         E3DCButton(coordinator, description, entry.unique_id) for description in BUTTONS
     ]
 
+    async_add_entities(entities)
+
+    async_add_entities_on_signal(
+        hass,
+        entry,
+        SIGNAL_WALLBOXES_IDENTIFIED,
+        async_add_entities,
+        lambda: _create_wallbox_entities(coordinator),
+    )
+
+
+def _create_wallbox_entities(coordinator: E3DCCoordinator) -> list["E3DCButton"]:
+    """Create the buttons of all identified wallboxes."""
+    wallbox_entities: list[E3DCButton] = []
+
     for wallbox in coordinator.wallboxes:
         # Get the UID & Key for the given wallbox
         device_info = wallbox["deviceInfo"]
@@ -67,7 +83,7 @@ async def async_setup_entry(
                 coordinator.async_toggle_wallbox_phases(index)
             ),
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCButton(
                 coordinator,
                 wallbox_toggle_wallbox_phases_description,
@@ -84,7 +100,7 @@ async def async_setup_entry(
                 coordinator.async_toggle_wallbox_charging(index)
             ),
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCButton(
                 coordinator,
                 wallbox_toggle_wallbox_charging_description,
@@ -93,10 +109,10 @@ async def async_setup_entry(
             )
         )
 
-    async_add_entities(entities)
+    return wallbox_entities
 
 
-class E3DCButton(CoordinatorEntity, ButtonEntity):
+class E3DCButton(CoordinatorEntity[E3DCCoordinator], ButtonEntity):
     """Custom E3DC Button Implementation."""
 
     _attr_has_entity_name = True
@@ -109,7 +125,8 @@ class E3DCButton(CoordinatorEntity, ButtonEntity):
         device_info: DeviceInfo | None = None,
     ) -> None:
         """Initialize the Button."""
-        super().__init__(coordinator)
+        # Buttons show no data, they only follow the availability.
+        super().__init__(coordinator, ())
         self.coordinator: E3DCCoordinator = coordinator
         self.entity_description: E3DCButtonEntityDescription = description
         self._attr_unique_id = f"{uid}_{description.key}"
@@ -41,6 +41,8 @@ from .const import (
     CONF_FARMCONTROLLER,
     DEFAULT_CREATE_BATTERY_DEVICES,
     CONF_RSCPKEY,
+    CONF_SETPOINT_DEBOUNCE,
+    DEFAULT_SETPOINT_DEBOUNCE,
     CONF_VERSION,
     DOMAIN,
     ERROR_AUTH_INVALID,
@@ -126,6 +128,9 @@ class E3DCConfigFlowHandler(ConfigFlow, domain=DOMAIN):
 
     async def validate_input(self) -> str | None:
         """Validate the user input allows us to connect."""
+        if self._proxy is not None:
+            # Every attempt connects with a new proxy, drop the previous one.
+            await self._proxy.async_close()
         try:
             await self.hass.async_add_executor_job(self._async_check_login)
         except ConfigEntryAuthFailed:
@@ -134,6 +139,14 @@ class E3DCConfigFlowHandler(ConfigFlow, domain=DOMAIN):
             return ERROR_CANNOT_CONNECT
         return None
 
+    @callback
+    def async_remove(self) -> None:
+        """Close the connection used to validate the input along with the flow."""
+        if self._proxy is not None:
+            self.hass.async_create_background_task(
+                self._proxy.async_close(), f"{DOMAIN} close config flow connection"
+            )
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -571,8 +584,12 @@ class E3DCConfigFlowHandler(ConfigFlow, domain=DOMAIN):
         return E3DCOptionsFlowHandler()
 
 
-class E3DCOptionsFlowHandler(config_entries.OptionsFlowWithReload):
-    """Handle options for E3DC Remote Storage Control Protocol."""
+class E3DCOptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle options for E3DC Remote Storage Control Protocol.
+
+    Changed options are applied in place by the coordinator, see
+    E3DCCoordinator.async_apply_options(), the entry is not reloaded.
+    """
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
@@ -592,6 +609,13 @@ class E3DCOptionsFlowHandler(config_entries.OptionsFlowWithReload):
                             DEFAULT_CREATE_BATTERY_DEVICES,
                         ),
                     ): cv.boolean,
+                    vol.Required(
+                        CONF_SETPOINT_DEBOUNCE,
+                        default=self.config_entry.options.get(
+                            CONF_SETPOINT_DEBOUNCE,
+                            DEFAULT_SETPOINT_DEBOUNCE,
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
                 }
             ),
         )
@@ -1,6 +1,6 @@
 """Constants for the E3DC Remote Storage Control Protocol integration."""
 
-from enum import Enum
+from enum import Enum, IntEnum, StrEnum
 
 from homeassistant.const import Platform
 
@@ -16,6 +16,14 @@ ERROR_AUTH_INVALID = "invalid_auth"
 ERROR_CANNOT_CONNECT = "cannot_connect"
 CONF_CREATE_BATTERY_DEVICES = "create_battery_devices"
 DEFAULT_CREATE_BATTERY_DEVICES = False
+CONF_SETPOINT_DEBOUNCE = "setpoint_debounce"
+DEFAULT_SETPOINT_DEBOUNCE = 1.0
+# Sent with the unique id once a subsystem got identified in the background
+# after setup, or once battery devices got enabled via the options. The
+# platforms add the entities of the subsystem then.
+SIGNAL_BATTERIES_IDENTIFIED = "e3dc_rscp_batteries_identified_{}"
+SIGNAL_SGREADY_IDENTIFIED = "e3dc_rscp_sgready_identified_{}"
+SIGNAL_WALLBOXES_IDENTIFIED = "e3dc_rscp_wallboxes_identified_{}"
 
 # Battery module sensors (all are raw sensors with data_key)
 BATTERY_MODULE_RAW_SENSORS: tuple[tuple[str, str], ...] = (
@@ -95,6 +103,8 @@ SERVICE_SET_POWER_LIMITS = "set_power_limits"
 SERVICE_MANUAL_CHARGE = "manual_charge"
 SERVICE_SET_WALLBOX_MAX_CHARGE_CURRENT = "set_wallbox_max_charge_current"
 SERVICE_SET_POWER_MODE = "set_power_mode"
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
 MAX_WALLBOXES_POSSIBLE = 8  # 8 is the maximum according to RSCP Specification
 
 PLATFORMS: list[Platform] = [
@@ -144,6 +154,47 @@ class SetPowerMode(Enum):
         return self._value2member_map_.get(value, None)
 
 
+class PollGroup(StrEnum):
+    """Data groups the coordinator polls from E3DC, each on its own schedule.
+
+    All groups due within a cycle are batched into one RSCP frame, except for
+    the battery data, which is still loaded by the battery manager.
+    """
+
+    POLL = "poll"
+    POWER_MODE = "power-mode"
+    SYSTEM_STATUS = "system-status"
+    POWER_SETTINGS = "power-settings"
+    MANUAL_CHARGE = "manual-charge"
+    SGREADY_STATE = "sgready-state"
+    POWERMETERS_DATA = "powermeters-data"
+    WALLBOX_EMS_SETTINGS = "wallbox-ems-settings"
+    WALLBOX_DATA = "wallbox-data"
+    DB_DATA_TODAY = "db-data-today"
+    BATTERY_DATA = "battery-data"
+
+
+class ConnectionState(StrEnum):
+    """Health of the connection to E3DC as tracked by the connection supervisor."""
+
+    CONNECTED = "connected"
+    DEGRADED = "degraded"
+    RECONNECTING = "reconnecting"
+    OFFLINE = "offline"
+
+
+class RequestPriority(IntEnum):
+    """Priority of requests competing for the connection to E3DC, lowest first.
+
+    Control writes are sent ahead of queued reads, background reads only once
+    nothing else is waiting.
+    """
+
+    CONTROL = 0
+    READ = 1
+    BACKGROUND = 2
+
+
 class EntryType(Enum):
     """Entry types for E3DC sensors to distinguish between farm controller, members or both (ununsed atm)."""
 
@@ -1,8 +1,13 @@
 """Coordinator for E3DC integration."""
 
+import asyncio
+from collections import ChainMap, Counter
+from collections.abc import Callable, Collection, Coroutine, Iterator, Mapping
+from contextlib import contextmanager
 from datetime import timedelta, datetime
+from functools import partial
 import logging
-from time import time
+from time import monotonic
 from typing import Any, Final, TypedDict
 import pytz
 import re
@@ -10,13 +15,13 @@ import re
 from e3dc._rscpTags import PowermeterType
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback, Event
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback, Event
 from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
-from homeassistant.helpers.event import async_track_time_interval
-from homeassistant.util.dt import as_timestamp, start_of_local_day
+from homeassistant.util.dt import as_timestamp, start_of_local_day, utcnow
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.components.sensor import SensorStateClass
 from homeassistant.util.event_type import EventType
 
@@ -30,18 +35,65 @@ from custom_components.e3dc_rscp.utils import initialize_farm_controller_flow_if
 from .const import (
     CONF_RSCPKEY,
     CONF_CREATE_BATTERY_DEVICES,
+    CONF_SETPOINT_DEBOUNCE,
     DEFAULT_CREATE_BATTERY_DEVICES,
+    DEFAULT_SETPOINT_DEBOUNCE,
     DOMAIN,
     MAX_WALLBOXES_POSSIBLE,
+    PollGroup,
     PowerMode,
     SetPowerMode,
+    SIGNAL_BATTERIES_IDENTIFIED,
+    SIGNAL_SGREADY_IDENTIFIED,
+    SIGNAL_WALLBOXES_IDENTIFIED,
 )
 
-from .e3dc_proxy import E3DCProxy
+from .e3dc_proxy import E3DCProxy, E3DCTransport
 from .battery_manager import E3DCBatteryManager, E3DCBattery, E3DCBatteryPack
+from .power_mode import E3DCPowerModeController
+from .setpoint_writer import E3DCSetpointWriter
+from .state_snapshot import E3DCStateSnapshot
+from .topology_cache import E3DCTopologyCache
 
 _LOGGER = logging.getLogger(__name__)
-_STAT_REFRESH_INTERVAL = 60
+
+# Poll interval per data group in seconds. The coordinator ticks at the
+# shortest interval and polls all groups due at that tick in one go. Power
+# flows need a high resolution, settings and status flags rarely change.
+# Power statistics are updated by E3DC only once per 15 minutes anyway, once
+# a minute is a good compromise to get the metrics shortly before the end of
+# the day.
+_POLL_INTERVALS: Final[dict[PollGroup, float]] = {
+    PollGroup.POLL: 2,
+    PollGroup.POWERMETERS_DATA: 2,
+    PollGroup.WALLBOX_DATA: 2,
+    PollGroup.POWER_MODE: 10,
+    PollGroup.MANUAL_CHARGE: 10,
+    PollGroup.SYSTEM_STATUS: 60,
+    PollGroup.POWER_SETTINGS: 60,
+    PollGroup.SGREADY_STATE: 60,
+    PollGroup.WALLBOX_EMS_SETTINGS: 60,
+    PollGroup.DB_DATA_TODAY: 60,
+    PollGroup.BATTERY_DATA: 300,
+}
+
+# Groups which are slow to answer and not needed for the core entities. They
+# are left out of the first refresh, which the setup waits for, and follow
+# with the next tick.
+_DEFERRED_STARTUP_GROUPS: Final[tuple[PollGroup, ...]] = (
+    PollGroup.DB_DATA_TODAY,
+    PollGroup.BATTERY_DATA,
+)
+
+# Values restored from the last run fill in for the groups not polled yet. By
+# then every group had its turn, values still not reported are dropped.
+_RESTORED_LIFETIME: Final[float] = 2 * max(_POLL_INTERVALS.values())
+
+# A group E3DC answers with the same error this many times in a row is
+# considered unsupported by the firmware. Its circuit breaker opens and the group
+# is only probed once per probe interval until E3DC answers it again.
+_BREAKER_THRESHOLD: Final[int] = 3
+_BREAKER_PROBE_INTERVAL: Final[float] = 1800
 
 # Maps the system status flags as delivered by get_system_status() onto our
 # coordinator data keys. All of them are booleans describing the current state of
@@ -80,24 +132,249 @@ class E3DCWallbox(TypedDict):
     upperCurrentLimit: int
 
 
-class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+class _PollBreaker:
+    """Circuit breaker state of a single poll group."""
+
+    __slots__ = ("error", "failures", "opened")
+
+    def __init__(self) -> None:
+        """Initialize a closed breaker."""
+        self.error: str | None = None
+        self.failures: int = 0
+        self.opened: datetime | None = None
+
+
+class E3DCPollScheduler:
+    """Keeps an interval and a deadline for each poll group.
+
+    The coordinator asks for the due groups on every tick and polls them
+    together, so groups coming due at the same time share one RSCP frame.
+    Groups due within the next half tick are included as well, which keeps
+    groups of the same interval aligned despite timer jitter.
+
+    Each group has a circuit breaker as well. Once E3DC answers a group with
+    the same error _BREAKER_THRESHOLD times in a row, the breaker opens and the
+    group is only probed every _BREAKER_PROBE_INTERVAL seconds, until it is
+    answered again.
+    """
+
+    def __init__(self, intervals: dict[PollGroup, float]) -> None:
+        """Initialize the scheduler, all groups are due right away."""
+        self._intervals: dict[PollGroup, float] = intervals
+        self._tick: float = min(intervals.values())
+        self._deadlines: dict[PollGroup, float] = dict.fromkeys(intervals, 0.0)
+        self._breakers: dict[PollGroup, _PollBreaker] = {
+            group: _PollBreaker() for group in intervals
+        }
+
+    @property
+    def tick(self) -> timedelta:
+        """Return the interval at which the scheduler has to be polled."""
+        return timedelta(seconds=self._tick)
+
+    def get_due_groups(self) -> list[PollGroup]:
+        """Return all groups which are due for polling."""
+        horizon: float = monotonic() + self._tick / 2
+        return [
+            group for group, deadline in self._deadlines.items() if deadline <= horizon
+        ]
+
+    def mark_polled(self, group: PollGroup) -> None:
+        """Schedule the next poll of a group after it has been polled."""
+        interval: float = (
+            _BREAKER_PROBE_INTERVAL if self.is_open(group) else self._intervals[group]
+        )
+        self._deadlines[group] = monotonic() + interval
+
+    def request_poll(self, group: PollGroup) -> None:
+        """Poll a group with the next tick, regardless of its interval."""
+        self._deadlines[group] = 0.0
+
+    def defer(self, group: PollGroup) -> None:
+        """Leave a group out of the current tick, polling it with the next one."""
+        self._deadlines[group] = monotonic() + self._tick
+
+    def is_open(self, group: PollGroup) -> bool:
+        """Return True if the breaker of the group is open."""
+        return self._breakers[group].opened is not None
+
+    def record_success(self, group: PollGroup) -> None:
+        """Close the breaker of a group E3DC did answer."""
+        breaker: _PollBreaker = self._breakers[group]
+        if breaker.opened is not None:
+            _LOGGER.info("E3DC answers %s again, resuming regular polling", group)
+        breaker.error = None
+        breaker.failures = 0
+        breaker.opened = None
+
+    def record_failure(self, group: PollGroup, error: str) -> None:
+        """Count a failed answer, opening the breaker if it keeps failing alike."""
+        breaker: _PollBreaker = self._breakers[group]
+        if breaker.error == error:
+            breaker.failures += 1
+        else:
+            breaker.error = error
+            breaker.failures = 1
+
+        if breaker.opened is None and breaker.failures >= _BREAKER_THRESHOLD:
+            breaker.opened = utcnow()
+            _LOGGER.warning(
+                "E3DC failed to answer %s %s times in a row (%s), polling it only "
+                "every %s minutes from now on",
+                group,
+                breaker.failures,
+                error,
+                round(_BREAKER_PROBE_INTERVAL / 60),
+            )
+
+    def get_breaker_status(self) -> dict[str, Any]:
+        """Return the state of all breakers which are not closed for diagnostics."""
+        return {
+            group: {
+                "open": breaker.opened is not None,
+                "opened": breaker.opened,
+                "failures": breaker.failures,
+                "error": breaker.error,
+            }
+            for group, breaker in self._breakers.items()
+            if breaker.failures > 0
+        }
+
+
+class E3DCWriteFences:
+    """Keeps a version per data key written, so polls do not undo writes.
+
+    Every write and every poll take the current version when they start.
+    A key a write is in flight for, or which a write completed on after a
+    poll had started, is fenced: the value the poll read for it is dropped,
+    the value of the write stays. All other keys of the same poll group are
+    taken as usual, so polling can go on while writes are running.
+
+    The data read back along with a write counts as polled when the write
+    started, except for the keys written themselves, which are taken unless
+    a newer write to them started meanwhile.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the fences, no key is fenced yet."""
+        self._version: int = 0
+        self._started: dict[str, int] = {}
+        self._completed: dict[str, int] = {}
+        self._in_flight: Counter[str] = Counter()
+        self._dropped: Counter[str] = Counter()
+
+    @property
+    def version(self) -> int:
+        """Return the current version, taken by a poll when it starts."""
+        return self._version
+
+    @contextmanager
+    def write(self, keys: Collection[str]) -> Iterator[int]:
+        """Fence the given keys while writing them, yields the write's version."""
+        self._version += 1
+        version: int = self._version
+        for key in keys:
+            self._started[key] = version
+            self._in_flight[key] += 1
+        try:
+            yield version
+        finally:
+            self._version += 1
+            for key in keys:
+                self._completed[key] = self._version
+                self._in_flight[key] -= 1
+                if self._in_flight[key] <= 0:
+                    del self._in_flight[key]
+
+    def get_fenced_keys(self, version: int, written: Collection[str] = ()) -> set[str]:
+        """Return the keys whose values read at the given version are outdated.
+
+        The keys written by the write of that version are passed as written,
+        when processing its read back data.
+        """
+        fenced: set[str] = set(self._in_flight)
+        fenced.update(
+            key
+            for key, completed in self._completed.items()
+            if completed > version
+            and (key not in written or self._started[key] != version)
+        )
+        return fenced
+
+    def record_dropped(self, keys: Collection[str]) -> None:
+        """Count the polled values dropped for fenced keys."""
+        self._dropped.update(keys)
+
+    def get_status(self) -> dict[str, Any]:
+        """Return the fenced keys and the dropped values for diagnostics."""
+        return {
+            "version": self._version,
+            "in_flight": sorted(self._in_flight),
+            "dropped": dict(self._dropped),
+        }
+
+
+# Power settings written by setting or clearing the power limits.
+_POWER_LIMIT_KEYS: Final[tuple[str, ...]] = (
+    "pset-limit-charge",
+    "pset-limit-discharge",
+    "pset-limit-enabled",
+)
+
+
+def _merge_power_limits(
+    pending: tuple[int | None, int | None] | None,
+    limits: tuple[int | None, int | None] | None,
+) -> tuple[int | None, int | None] | None:
+    """Merge newer power limits into pending ones, an unset limit keeps the pending one.
+
+    Clearing the limits is requested as None instead of the limits, it replaces
+    whatever is pending, just as limits set after a pending clear do.
+    """
+    if pending is None or limits is None:
+        return limits
+    return (
+        pending[0] if limits[0] is None else limits[0],
+        pending[1] if limits[1] is None else limits[1],
+    )
+
+
+class E3DCCoordinator(DataUpdateCoordinator[Mapping[str, Any]]):
     """E3DC Coordinator, fetches all relevant data and provides proxies for all service calls."""
 
-    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
-        """Initialize E3DC Coordinator and connect."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        transport: E3DCTransport | None = None,
+    ) -> None:
+        """Initialize E3DC Coordinator and connect.
+
+        A transport may be given to talk to something else than the configured
+        E3DC, like an E3DCReplayTransport, it is passed on to the proxy.
+        """
         assert isinstance(config_entry.unique_id, str)
         self.uid: str = config_entry.unique_id
-        self.proxy = E3DCProxy(hass, config_entry)
+        self.proxy = E3DCProxy(hass, config_entry, transport)
         self._mydata: dict[str, Any] = {}
         self._sw_version: str = ""
-        self._update_guard_powersettings: bool = False
-        self._update_guard_wallboxsettings: bool = False
+        self._write_fences: E3DCWriteFences = E3DCWriteFences()
         self.config_entry: ConfigEntry = config_entry
         self._wallboxes: list[E3DCWallbox] = []
         self._sgready_available: bool = False
         self._timezone_offset: int = 0
-        self._next_stat_update: float = 0
+        self._poll_scheduler: E3DCPollScheduler = E3DCPollScheduler(_POLL_INTERVALS)
+        self._published_data: dict[str, Any] = {}
+        self._changed_keys: set[str] | None = None
         self._isFarmController: bool = config_entry.data.get("farmcontroller", False)
+        self._topology_cache = E3DCTopologyCache(hass, self.uid)
+        self._state_snapshot = E3DCStateSnapshot(hass, self.uid)
+        self._restored: dict[str, Any] = {}
+        self._restored_until: float = 0.0
+        self._topology: dict[str, Any] = {}
+        self._topology_from_cache: bool = False
+        self._identification: asyncio.Task[None] | None = None
+        self._identification_durations: dict[str, float] = {}
 
         # Initialize battery manager
         self.battery_manager = E3DCBatteryManager(
@@ -110,7 +387,14 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             ),
         )
 
-        self._stop_set_power_mode = None
+        self._power_mode_controller = E3DCPowerModeController(
+            hass=hass,
+            uid=self.uid,
+            proxy=self.proxy,
+            power_mode_callback=self._process_power_mode_readback,
+        )
+        self._setpoint_writers: dict[str, E3DCSetpointWriter] = {}
+        self._applied_options: dict[str, Any] = dict(config_entry.options)
         hass.bus.async_listen_once(
             EventType("homeassistant_stop"), self._shutdown_power_mode
         )
@@ -119,16 +403,32 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self._mydata["set-power-value"] = None
 
         super().__init__(
-            hass, _LOGGER, name=DOMAIN, update_interval=timedelta(seconds=10)
+            hass, _LOGGER, name=DOMAIN, update_interval=self._poll_scheduler.tick
         )
 
     async def async_connect(self):
-        """Establish connection to E3DC."""
-
-        # TODO: Beautify this, make the code flow with the connects/disconnects more natural.
-        # Have a call to autoconf, then connect with it.
-        await self.hass.async_add_executor_job(self.proxy.connect)
-        await self._async_connect_additional_powermeters()
+        """Establish connection to E3DC, using the cached topology if still valid."""
+
+        # The software version is part of the cache key, as a firmware update
+        # may change the capabilities of the device.
+        self._sw_version = await self.proxy.async_get_software_version()
+        cached_topology = await self._topology_cache.async_load(self._sw_version)
+
+        if cached_topology is not None and "powermeters" in cached_topology:
+            _LOGGER.debug("Using cached topology of software %s", self._sw_version)
+            self._topology = cached_topology
+            self._topology_from_cache = True
+            await self.proxy.async_add_executor_job(
+                self.proxy.connect,
+                {
+                    "powermeters": self._configure_powermeters(
+                        self._topology["powermeters"]
+                    )
+                },
+            )
+        else:
+            await self.proxy.async_add_executor_job(self.proxy.connect)
+            await self._async_connect_additional_powermeters()
 
         self._mydata["system-derate-percent"] = self.proxy.e3dc.deratePercent
         self._mydata["system-derate-power"] = self.proxy.e3dc.deratePower
@@ -152,12 +452,117 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             self.proxy.e3dc.startDischargeDefault
         )
 
-        # Idea: Maybe Port this to e3dc lib, it can query this in one go during startup.
-        self._sw_version = await self.hass.async_add_executor_job(
-            self.proxy.get_software_version
+        await self._load_timezone_settings()
+
+    async def async_config_entry_first_refresh(self) -> None:
+        """Refresh the data the core entities need, the slow groups follow.
+
+        Until they are polled, the values of the last run stand in for them,
+        flagged as stale.
+        """
+        self._restored = await self._state_snapshot.async_load()
+        self._restored_until = monotonic() + _RESTORED_LIFETIME
+        _LOGGER.debug("Restored %s values of the last run", len(self._restored))
+        for group in _DEFERRED_STARTUP_GROUPS:
+            self._poll_scheduler.defer(group)
+        await super().async_config_entry_first_refresh()
+
+    @callback
+    def async_start_identification(self) -> None:
+        """Identify the subsystems in the background, once the platforms are set up.
+
+        The platforms start with the core entities and add the entities of a
+        subsystem when it got identified, so that a slow or failing subsystem
+        does not hold back the others.
+        """
+        self._identification = self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_identify_subsystems(),
+            f"{DOMAIN} {self.uid} identification",
         )
 
-        await self._load_timezone_settings()
+    async def _async_identify_subsystems(self) -> None:
+        """Identify all subsystems concurrently, then store the topology."""
+        async with asyncio.TaskGroup() as group:
+            group.create_task(
+                self._async_identify_subsystem(
+                    "farm", self.async_identify_farm(self.hass)
+                )
+            )
+            group.create_task(
+                self._async_identify_subsystem(
+                    "SG Ready",
+                    self.async_identify_sgready(),
+                    SIGNAL_SGREADY_IDENTIFIED,
+                )
+            )
+            group.create_task(
+                self._async_identify_subsystem(
+                    "wallboxes",
+                    self.async_identify_wallboxes(self.hass),
+                    SIGNAL_WALLBOXES_IDENTIFIED,
+                )
+            )
+            group.create_task(
+                self._async_identify_subsystem(
+                    "batteries",
+                    self.async_identify_batteries(self.hass),
+                    SIGNAL_BATTERIES_IDENTIFIED,
+                )
+            )
+        await self.async_update_topology_cache()
+
+    async def _async_identify_subsystem(
+        self,
+        name: str,
+        identification: Coroutine[Any, Any, None],
+        signal: str | None = None,
+    ) -> None:
+        """Run the identification of a subsystem, announcing it to the platforms.
+
+        A failure is logged and leaves the subsystem without entities, the
+        other subsystems are not affected.
+        """
+        started: float = monotonic()
+        try:
+            await identification
+        except HomeAssistantError as ex:
+            _LOGGER.warning("Failed to identify %s, skipping them: %s", name, ex)
+            return
+        except Exception:
+            # Must not escape, the task group would cancel the others.
+            _LOGGER.exception("Unexpected error identifying %s, skipping them", name)
+            return
+
+        self._identification_durations[name] = round(monotonic() - started, 3)
+        _LOGGER.debug(
+            "Identified %s in %s s", name, self._identification_durations[name]
+        )
+        if signal is not None:
+            async_dispatcher_send(self.hass, signal.format(self.uid))
+
+    def get_identification_status(self) -> dict[str, Any]:
+        """Return the state of the background identification for diagnostics."""
+        return {
+            "done": self._identification is not None and self._identification.done(),
+            "durations": self._identification_durations,
+        }
+
+    async def async_shutdown(self) -> None:
+        """Stop polling and release the resources held for this E3DC.
+
+        Called by Home Assistant when the config entry is unloaded or its
+        setup failed.
+        """
+        await super().async_shutdown()
+        for writer in self._setpoint_writers.values():
+            await writer.async_close()
+        if self.data is not None:
+            await self._state_snapshot.async_save(self._mydata)
+        self._stop_power_mode()
+        await self.async_stop_capture()
+        await self.proxy.async_close()
+        self.proxy.shutdown_executor()
 
     async def async_identify_farm(self, hass: HomeAssistant):
         """Identify if device is part of a farm and initiate farm controller configuration if so."""
@@ -171,65 +576,99 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         )
 
     async def async_identify_wallboxes(self, hass: HomeAssistant):
-        """Identify availability of Wallboxes if get_wallbox_identification_data() returns meaningful data."""
+        """Identify availability of Wallboxes if async_get_wallbox_identification_data() returns meaningful data."""
         if self._isFarmController:
             """Farm Controller does not support wallboxes. They are handled by child."""
             return
 
-        for wallbox_index in range(0, MAX_WALLBOXES_POSSIBLE - 1):
-            try:
-                request_data: dict[str, Any] = await self.hass.async_add_executor_job(
-                    self.proxy.get_wallbox_identification_data, wallbox_index
-                )
-            except HomeAssistantError as ex:
+        wallboxes_data: list[dict[str, Any]] | None = self._topology.get("wallboxes")
+        if wallboxes_data is None:
+            wallboxes_data, complete = await self._async_discover_wallboxes()
+            if complete:
+                self._topology["wallboxes"] = wallboxes_data
+
+        for request_data in wallboxes_data:
+            self._add_wallbox(request_data)
+
+        if self.wallboxes:
+            # The wallbox groups were skipped so far, load them with the next tick.
+            self._poll_scheduler.request_poll(PollGroup.WALLBOX_DATA)
+            self._poll_scheduler.request_poll(PollGroup.WALLBOX_EMS_SETTINGS)
+
+    async def _async_discover_wallboxes(self) -> tuple[list[dict[str, Any]], bool]:
+        """Probe all wallbox indexes for connected wallboxes.
+
+        Returns the identification data of all wallboxes found and whether all
+        indexes could be probed.
+        """
+        wallboxes_data: list[dict[str, Any]] = []
+        try:
+            probes = await self.proxy.async_get_wallbox_identification_data(
+                range(MAX_WALLBOXES_POSSIBLE)
+            )
+        except HomeAssistantError as ex:
+            _LOGGER.warning("Failed to probe for wallboxes: %s", ex)
+            return wallboxes_data, False
+
+        complete: bool = True
+        for wallbox_index, request_data in probes.items():
+            if isinstance(request_data, HomeAssistantError):
                 _LOGGER.warning(
                     "Failed to load wallbox with index %s, not updating data: %s",
                     wallbox_index,
-                    ex,
+                    request_data,
                 )
-                return
-
-            if "macAddress" in request_data:
+                complete = False
+            elif "macAddress" in request_data:
                 _LOGGER.debug("Wallbox with index %s has been found", wallbox_index)
+                request_data["index"] = wallbox_index
+                wallboxes_data.append(request_data)
+            else:
+                _LOGGER.debug("No Wallbox with index %s has been found", wallbox_index)
 
-                unique_id = dr.format_mac(request_data["macAddress"])
-                wallboxType = request_data["wallboxType"]
-                model = f"Wallbox Type {wallboxType}"
-
-                deviceInfo = DeviceInfo(
-                    identifiers={(DOMAIN, unique_id)},
-                    via_device=(DOMAIN, self.uid),
-                    manufacturer="E3DC",
-                    name=request_data["deviceName"],
-                    model=model,
-                    sw_version=request_data["firmwareVersion"],
-                    serial_number=request_data["wallboxSerial"],
-                    connections={
-                        (
-                            dr.CONNECTION_NETWORK_MAC,
-                            dr.format_mac(request_data["macAddress"]),
-                        )
-                    },
-                    configuration_url="https://my.e3dc.com/",
+        return wallboxes_data, complete
+
+    def _add_wallbox(self, request_data: dict[str, Any]) -> None:
+        """Add a wallbox based on its identification data."""
+        wallbox_index: int = request_data["index"]
+        unique_id = dr.format_mac(request_data["macAddress"])
+        wallboxType = request_data["wallboxType"]
+        model = f"Wallbox Type {wallboxType}"
+
+        deviceInfo = DeviceInfo(
+            identifiers={(DOMAIN, unique_id)},
+            via_device=(DOMAIN, self.uid),
+            manufacturer="E3DC",
+            name=request_data["deviceName"],
+            model=model,
+            sw_version=request_data["firmwareVersion"],
+            serial_number=request_data["wallboxSerial"],
+            connections={
+                (
+                    dr.CONNECTION_NETWORK_MAC,
+                    dr.format_mac(request_data["macAddress"]),
                 )
+            },
+            configuration_url="https://my.e3dc.com/",
+        )
 
-                wallbox: E3DCWallbox = {
-                    "index": wallbox_index,
-                    "key": unique_id,
-                    "deviceInfo": deviceInfo,
-                    "lowerCurrentLimit": request_data["lowerCurrentLimit"],
-                    "upperCurrentLimit": request_data["upperCurrentLimit"],
-                }
-                self.wallboxes.append(wallbox)
-            else:
-                _LOGGER.debug("No Wallbox with index %s has been found", wallbox_index)
+        wallbox: E3DCWallbox = {
+            "index": wallbox_index,
+            "key": unique_id,
+            "deviceInfo": deviceInfo,
+            "lowerCurrentLimit": request_data["lowerCurrentLimit"],
+            "upperCurrentLimit": request_data["upperCurrentLimit"],
+        }
+        self.wallboxes.append(wallbox)
 
     async def async_identify_sgready(self) -> None:
         """Identify availability of SG Ready support."""
+        if "sgready_available" in self._topology:
+            self._sgready_available = self._topology["sgready_available"]
+            return
+
         try:
-            request_data: dict[str, Any] = await self.hass.async_add_executor_job(
-                self.proxy.get_sgready_state
-            )
+            self._sgready_available = await self._async_discover_sgready()
         except HomeAssistantError as ex:
             _LOGGER.warning(
                 "Failed to identify SG Ready capability, assuming disabled: %s", ex
@@ -237,12 +676,17 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             self._sgready_available = False
             return
 
-        self._sgready_available = bool(request_data.get("sgready-active"))
+        self._topology["sgready_available"] = self._sgready_available
         if self._sgready_available:
             _LOGGER.debug("SG Ready support detected")
         else:
             _LOGGER.debug("SG Ready support not active")
 
+    async def _async_discover_sgready(self) -> bool:
+        """Probe E3DC for active SG Ready support."""
+        request_data: dict[str, Any] = await self.proxy.async_get_sgready_state()
+        return bool(request_data.get("sgready-active"))
+
     # Getter for _wallboxes
     @property
     def wallboxes(self) -> list[E3DCWallbox]:
@@ -271,7 +715,111 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     async def async_identify_batteries(self, hass: HomeAssistant) -> None:
         """Identify installed battery modules if enabled via options (delegates to battery manager)."""
-        await self.battery_manager.async_identify_batteries()
+        # Options changed meanwhile are taken into account by this identification.
+        self._applied_options[CONF_CREATE_BATTERY_DEVICES] = self.create_battery_devices
+        cached_topology: list[dict[str, Any]] | None = self._topology.get("batteries")
+        topology = await self.battery_manager.async_identify_batteries(cached_topology)
+        if topology is None:
+            return
+
+        self._topology["batteries"] = topology
+        if cached_topology is not None:
+            # Identification did not load any data, poll it with the next tick.
+            self._poll_scheduler.request_poll(PollGroup.BATTERY_DATA)
+        else:
+            # Discovering the topology loaded the data along with it.
+            self._poll_scheduler.mark_polled(PollGroup.BATTERY_DATA)
+
+    async def async_apply_options(self) -> None:
+        """Apply changed options in place, keeping the connection and the topology.
+
+        Enabling the battery devices identifies them from the known topology
+        and adds their sensors, disabling removes them along with their
+        devices. All other entities stay available meanwhile.
+        """
+        if self._identification is not None:
+            # Do not identify the batteries twice while starting up.
+            await asyncio.wait([self._identification])
+
+        options: Mapping[str, Any] = self.config_entry.options
+        applied: dict[str, Any] = self._applied_options
+        self._applied_options = dict(options)
+
+        debounce: float = options.get(CONF_SETPOINT_DEBOUNCE, DEFAULT_SETPOINT_DEBOUNCE)
+        if debounce != applied.get(CONF_SETPOINT_DEBOUNCE, DEFAULT_SETPOINT_DEBOUNCE):
+            _LOGGER.debug("Changing the setpoint debounce time to %s s", debounce)
+            for writer in self._setpoint_writers.values():
+                writer.set_debounce(debounce)
+
+        if self.create_battery_devices == applied.get(
+            CONF_CREATE_BATTERY_DEVICES, DEFAULT_CREATE_BATTERY_DEVICES
+        ):
+            return
+
+        _LOGGER.debug(
+            "%s battery devices",
+            "Adding" if self.create_battery_devices else "Removing",
+        )
+        await self.async_identify_batteries(self.hass)
+        if self.create_battery_devices:
+            await self._topology_cache.async_save(self._sw_version, self._topology)
+            if self.batteries:
+                async_dispatcher_send(
+                    self.hass, SIGNAL_BATTERIES_IDENTIFIED.format(self.uid)
+                )
+
+    def get_topology_status(self) -> dict[str, Any]:
+        """Return the topology in use and whether it came from the cache."""
+        return {
+            "from_cache": self._topology_from_cache,
+            "sw_version": self._sw_version,
+            "topology": self._topology,
+        }
+
+    async def async_update_topology_cache(self) -> None:
+        """Store the topology in use, revalidate a cached one in the background.
+
+        The topology is stored even if it came from the cache, as parts of it
+        may have been discovered during this startup, e.g. the batteries after
+        enabling the battery devices.
+        """
+        await self._topology_cache.async_save(self._sw_version, self._topology)
+        if not self._topology_from_cache:
+            return
+
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_revalidate_topology(),
+            f"{DOMAIN} {self.uid} topology revalidation",
+        )
+
+    async def _async_revalidate_topology(self) -> None:
+        """Rediscover the cached topology, reload the entry if it is outdated."""
+        topology: dict[str, Any] = {}
+        try:
+            topology["powermeters"] = await self._async_discover_powermeters()
+            topology["timezone"] = await self.proxy.async_get_timezone()
+            topology["sgready_available"] = await self._async_discover_sgready()
+            if not self._isFarmController:
+                wallboxes_data, complete = await self._async_discover_wallboxes()
+                if complete:
+                    topology["wallboxes"] = wallboxes_data
+            if "batteries" in self._topology and self.create_battery_devices:
+                topology[
+                    "batteries"
+                ] = await self.battery_manager.async_discover_topology()
+        except HomeAssistantError as ex:
+            _LOGGER.debug("Failed to revalidate the cached topology: %s", ex)
+            return
+
+        if all(self._topology.get(key) == value for key, value in topology.items()):
+            _LOGGER.debug("Cached topology is up to date")
+            return
+
+        _LOGGER.info("Topology of E3DC %s has changed, reloading", self.uid)
+        self._topology.update(topology)
+        await self._topology_cache.async_save(self._sw_version, self._topology)
+        self.hass.config_entries.async_schedule_reload(self.config_entry.entry_id)
 
     # Setter for individual wallbox values
     def setWallboxValue(self, index: int, key: str, value: Any) -> None:
@@ -299,13 +847,27 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         raise ValueError(f"Wallbox with index {index} not found")
 
     async def _async_connect_additional_powermeters(self):
-        """Identify the installed powermeters and reconnect to E3DC with this config."""
-        # TODO: Restructure config so that we are indexed by powemeter ID.
-        self.proxy.e3dc_config["powermeters"] = await self.hass.async_add_executor_job(
-            self.proxy.get_powermeters
+        """Identify the installed powermeters and configure them, keeping the connection."""
+        self._topology["powermeters"] = await self._async_discover_powermeters()
+
+        self.proxy.configure(
+            {"powermeters": self._configure_powermeters(self._topology["powermeters"])}
         )
 
-        for powermeter in self.proxy.e3dc_config["powermeters"]:
+    async def _async_discover_powermeters(self) -> list[dict[str, Any]]:
+        """Load the installed powermeters from E3DC."""
+        return await self.proxy.async_add_executor_job(self.proxy.get_powermeters)
+
+    def _configure_powermeters(
+        self, powermeters_data: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Derive our powermeter configuration from the installed powermeters."""
+        # TODO: Restructure config so that we are indexed by powemeter ID.
+        powermeters: list[dict[str, Any]] = [
+            dict(powermeter) for powermeter in powermeters_data
+        ]
+
+        for powermeter in powermeters:
             if powermeter["type"] == PowermeterType.PM_TYPE_ROOT.value:
                 powermeter["name"] = "Root PM"
                 powermeter["key"] = "root-pm"
@@ -348,77 +910,301 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                         powermeter["total-state-class"] = SensorStateClass.TOTAL
                         powermeter["negate-measure"] = False
 
-        await self.hass.async_add_executor_job(self.proxy.disconnect)
-        await self.hass.async_add_executor_job(
-            self.proxy.connect,
-            self.proxy.e3dc_config,
-        )
+        return powermeters
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    async def _async_update_data(self) -> Mapping[str, Any]:
         """Update all data required by our entities in one go."""
 
+        # Notify everybody if we fail before the changed keys are known.
+        self._changed_keys = None
+
         # Now we've to update all dynamic values in self._mydata,
         # connect did already retrieve all static values.
+        # Every group has its own interval, all groups due now are requested
+        # within a single RSCP frame, saving one round trip per value. The
+        # battery data is loaded by the battery manager instead.
+        due: list[PollGroup] = self._poll_scheduler.get_due_groups()
+        groups: list[PollGroup] = []
+        skipped: list[PollGroup] = []
+        for group in due:
+            if group == PollGroup.BATTERY_DATA:
+                continue
+            if (
+                group in (PollGroup.WALLBOX_EMS_SETTINGS, PollGroup.WALLBOX_DATA)
+                and not self.wallboxes
+            ):
+                skipped.append(group)
+            else:
+                groups.append(group)
+
+        db_timestamp: int | None = None
+        if PollGroup.DB_DATA_TODAY in groups:
+            db_timestamp = self._get_db_data_day_timestamp()
+
+        if groups:
+            _LOGGER.debug("Polling %s", ", ".join(groups))
+            version: int = self._write_fences.version
+            try:
+                batch: dict[PollGroup, Any] = await self.proxy.async_poll_batch(
+                    groups,
+                    [wallbox["index"] for wallbox in self.wallboxes],
+                    db_timestamp,
+                    86400,
+                )
+            except HomeAssistantError as ex:
+                # Once the connection is considered lost, fail the update so
+                # that the entities become unavailable. The supervisor paces
+                # the reconnect attempts, the coordinator logs outage and
+                # recovery once.
+                if not self.proxy.connection_available:
+                    raise UpdateFailed(
+                        f"Connection to E3DC is {self.proxy.connection_state}: {ex}"
+                    ) from ex
+                _LOGGER.warning("Failed to poll, not updating data: %s", ex)
+            else:
+                # Groups E3DC could not answer wait for their next interval
+                # as well, retrying them every tick would not help.
+                skipped.extend(groups)
+                self._record_batch_outcome(batch, groups)
+                with self._fenced_update(version):
+                    self._process_batch(batch)
+
+        if PollGroup.BATTERY_DATA in due:
+            if self.create_battery_devices:
+                _LOGGER.debug("Polling battery data")
+                await self.battery_manager.async_load_and_process_battery_data()
+            skipped.append(PollGroup.BATTERY_DATA)
+
+        for group in skipped:
+            self._poll_scheduler.mark_polled(group)
+
+        self._process_call_statistics()
+        self._track_changed_keys()
+        self._state_snapshot.async_schedule_save(self._mydata)
+        if self._restored:
+            return ChainMap(self._mydata, self._restored)
+        return self._mydata
 
-        _LOGGER.debug("Polling general status information")
-        await self._load_and_process_poll()
+    def _track_changed_keys(self) -> None:
+        """Record the data keys which changed since the listeners were last notified.
 
-        _LOGGER.debug("Polling system status information")
-        await self._load_and_process_system_status()
+        After a failed update, every listener has to be notified, as the
+        availability of all entities changes. Restored values which got
+        polled meanwhile, or expired, count as changed, as they are no
+        longer stale.
+        """
+        refreshed: set[str] = (
+            set(self._restored)
+            if monotonic() >= self._restored_until
+            else self._restored.keys() & self._mydata.keys()
+        )
+        for key in refreshed:
+            del self._restored[key]
 
-        # TODO: Check if we need to replace this with a safe IPC sync
-        if self._update_guard_powersettings is False:
-            _LOGGER.debug("Poll power settings")
-            await self._load_and_process_power_settings()
+        if not self.last_update_success:
+            self._changed_keys = None
         else:
-            _LOGGER.debug("Not polling powersettings, they are updating right now")
+            published: dict[str, Any] = self._published_data
+            self._changed_keys = {
+                key
+                for key, value in self._mydata.items()
+                if key not in published or published[key] != value
+            }
+            self._changed_keys.update(refreshed)
+            _LOGGER.debug("%s data keys changed", len(self._changed_keys))
+        self._published_data = dict(self._mydata)
+
+    def is_stale(self, key: str) -> bool:
+        """Return True if the value of the key is restored from the last run."""
+        return key in self._restored and key not in self._mydata
+
+    def get_snapshot_status(self) -> dict[str, Any]:
+        """Return the restored values still in use for diagnostics."""
+        return {"stale_keys": sorted(self._restored)}
 
-        _LOGGER.debug("Polling manual charge information")
-        await self._load_and_process_manual_charge()
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, limited to the data keys given as context.
+
+        Entities pass the collection of data keys they depend on as their
+        coordinator context. They are only notified if one of these keys
+        changed, or if the availability of all entities changes. Listeners
+        without context are notified on every update.
+        """
+        if context is None:
+            return super().async_add_listener(update_callback, context)
 
-        _LOGGER.debug("Getting SG Ready status information")
-        await self._load_and_process_sgready_state()
+        keys: Collection[str] = context
 
-        _LOGGER.debug("Polling additional powermeters")
-        await self._load_and_process_powermeters_data()
+        @callback
+        def _async_update_if_changed() -> None:
+            if self._changed_keys is None or not self._changed_keys.isdisjoint(keys):
+                update_callback()
 
-        if self._update_guard_wallboxsettings is False:
-            if self.wallboxes:
-                _LOGGER.debug("Polling wallbox")
-                await self._load_and_process_wallbox_data()
-            else:
-                _LOGGER.debug("Skipping wallbox poll, no wallboxes configured")
-        else:
-            _LOGGER.debug("Not polling wallbox, they are updating right now")
+        return super().async_add_listener(_async_update_if_changed, context)
 
-        if self.create_battery_devices:
-            _LOGGER.debug("Polling battery data")
-            await self.battery_manager.async_load_and_process_battery_data()
-
-        # Only poll power statstics once per minute. E3DC updates it only once per 15
-        # minutes anyway, this should be a good compromise to get the metrics shortly
-        # before the end of the day.
-        if self._next_stat_update < time():
-            _LOGGER.debug("Polling today's power metrics")
-            await self._load_and_process_db_data_today()
-            self._next_stat_update = time() + _STAT_REFRESH_INTERVAL
-            # TODO: Reduce interval further, but take start_ts into account to get an
-            # end of day reading of the metric.
-        else:
-            _LOGGER.debug("Skipping power metrics poll.")
+    @callback
+    def _async_publish_readback(self, keys: Collection[str] = ()) -> None:
+        """Push the data read back after a write to the entities, without a refresh.
 
-        return self._mydata
+        Only entities of keys which changed are notified, along with those of
+        the given keys. The latter are the keys a write targeted, which have
+        to be pushed even if unchanged, so that an entity showing the write
+        optimistically reverts if E3DC did not apply it.
+        """
+        self._track_changed_keys()
+        if self._changed_keys is not None:
+            self._changed_keys.update(keys)
+        self.async_update_listeners()
 
-    async def _load_and_process_power_settings(self):
-        """Load and process power settings."""
-        try:
-            power_settings: dict[str, Any] = await self.hass.async_add_executor_job(
-                self.proxy.get_power_settings
+    def invalidate_key(self, key: str) -> None:
+        """Notify the listeners of a key with the next update, even if it did not change.
+
+        Used by entities that show a value optimistically, so that they get
+        back in sync with E3DC if the change did not go through.
+        """
+        self._published_data.pop(key, None)
+
+    def _process_batch(self, batch: dict[PollGroup, Any]) -> None:
+        """Process all data groups of a batched poll."""
+        if (poll_data := self._get_batch_result(batch, PollGroup.POLL)) is not None:
+            self._process_poll(poll_data)
+
+        if (
+            power_mode := self._get_batch_result(batch, PollGroup.POWER_MODE)
+        ) is not None:
+            self._process_power_mode(power_mode)
+
+        if (
+            system_status := self._get_batch_result(batch, PollGroup.SYSTEM_STATUS)
+        ) is not None:
+            self._process_system_status(system_status)
+
+        if (
+            power_settings := self._get_batch_result(batch, PollGroup.POWER_SETTINGS)
+        ) is not None:
+            self._process_power_settings(power_settings)
+
+        if (
+            manual_charge := self._get_batch_result(batch, PollGroup.MANUAL_CHARGE)
+        ) is not None:
+            self._process_manual_charge(manual_charge)
+
+        if (
+            sgready_state := self._get_batch_result(batch, PollGroup.SGREADY_STATE)
+        ) is not None:
+            self._process_sgready_state(sgready_state)
+
+        if (
+            powermeters_data := self._get_batch_result(
+                batch, PollGroup.POWERMETERS_DATA
+            )
+        ) is not None:
+            self._process_powermeters_data(powermeters_data)
+
+        if (
+            ems_wb_state := self._get_batch_result(
+                batch, PollGroup.WALLBOX_EMS_SETTINGS
+            )
+        ) is not None:
+            self._process_wallbox_ems_settings(ems_wb_state)
+
+        for wallbox in self.wallboxes:
+            self._process_wallbox_data(
+                wallbox, batch.get(PollGroup.WALLBOX_DATA, {}).get(wallbox["index"])
             )
-        except HomeAssistantError as ex:
-            _LOGGER.warning("Failed to load power settings, not updating data: %s", ex)
-            return
 
+        if (
+            db_data := self._get_batch_result(batch, PollGroup.DB_DATA_TODAY)
+        ) is not None:
+            self._process_db_data_today(db_data)
+
+    @contextmanager
+    def _fenced_update(
+        self, version: int, written: Collection[str] = ()
+    ) -> Iterator[None]:
+        """Process data read at the given version, keeping the values of fenced keys.
+
+        A write may have started or completed while the data was read, the
+        values it wrote must not be overwritten with the outdated readings.
+        """
+        fenced: set[str] = self._write_fences.get_fenced_keys(version, written)
+        kept: dict[str, Any] = {
+            key: self._mydata[key] for key in fenced if key in self._mydata
+        }
+        try:
+            yield
+        finally:
+            dropped: list[str] = []
+            for key in fenced:
+                if key in kept:
+                    if self._mydata[key] != kept[key]:
+                        dropped.append(key)
+                        self._mydata[key] = kept[key]
+                elif key in self._mydata:
+                    dropped.append(key)
+                    del self._mydata[key]
+            if dropped:
+                _LOGGER.debug("Dropped outdated values of %s", ", ".join(dropped))
+                self._write_fences.record_dropped(dropped)
+
+    def get_write_fence_status(self) -> dict[str, Any]:
+        """Return the write fences for diagnostics."""
+        return self._write_fences.get_status()
+
+    def _record_batch_outcome(
+        self, batch: dict[PollGroup, Any], groups: Collection[PollGroup]
+    ) -> None:
+        """Feed the answers of a batched poll into the circuit breakers."""
+        for group in groups:
+            data = batch.get(group)
+            if group == PollGroup.WALLBOX_DATA and isinstance(data, dict):
+                # Only trip if no wallbox could be polled at all.
+                errors = [
+                    result
+                    for result in data.values()
+                    if isinstance(result, HomeAssistantError)
+                ]
+                data = errors[0] if errors and len(errors) == len(data) else None
+            if isinstance(data, HomeAssistantError):
+                self._poll_scheduler.record_failure(group, str(data))
+            elif group in batch:
+                self._poll_scheduler.record_success(group)
+
+    def _get_batch_result(self, batch: dict[PollGroup, Any], group: PollGroup) -> Any:
+        """Return the data of a polled group, None if it is unavailable."""
+        data = batch.get(group)
+        if isinstance(data, HomeAssistantError):
+            # An open breaker has been logged once already.
+            log = (
+                _LOGGER.debug
+                if self._poll_scheduler.is_open(group)
+                else _LOGGER.warning
+            )
+            log("Failed to load %s, not updating data: %s", group, data)
+            return None
+        return data
+
+    def get_poll_status(self) -> dict[str, Any]:
+        """Return the circuit breakers of all failing poll groups."""
+        return self._poll_scheduler.get_breaker_status()
+
+    def _process_call_statistics(self) -> None:
+        """Publish latency and error statistics of the proxy calls for the diagnostic sensors."""
+        poll: dict[str, Any] = self.proxy.call_statistics.get_summary(
+            "async_poll_batch"
+        )
+        overall: dict[str, Any] = self.proxy.call_statistics.get_summary()
+        self._mydata["rscp-poll-duration-p50"] = poll["duration_ms"]["p50"]
+        self._mydata["rscp-poll-duration-p95"] = poll["duration_ms"]["p95"]
+        self._mydata["rscp-lock-wait-p95"] = overall["lock_wait_ms"]["p95"]
+        self._mydata["rscp-call-errors"] = overall["errors"]
+        self._mydata["rscp-reconnects"] = self.proxy.reconnects
+
+    def _process_power_settings(self, power_settings: dict[str, Any]) -> None:
+        """Process power settings."""
         self._mydata["pset-limit-charge"] = power_settings["maxChargePower"]
         self._mydata["pset-limit-discharge"] = power_settings["maxDischargePower"]
         self._mydata["pset-limit-discharge-minimum"] = power_settings[
@@ -430,16 +1216,8 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             "weatherRegulatedChargeEnabled"
         ]
 
-    async def _load_and_process_system_status(self) -> None:
-        """Load and process E3DC system status flags."""
-        try:
-            system_status: dict[str, Any] = await self.hass.async_add_executor_job(
-                self.proxy.get_system_status
-            )
-        except HomeAssistantError as ex:
-            _LOGGER.warning("Failed to load system status, not updating data: %s", ex)
-            return
-
+    def _process_system_status(self, system_status: dict[str, Any]) -> None:
+        """Process E3DC system status flags."""
         for flag, key in _SYSTEM_STATUS_FLAGS.items():
             if flag not in system_status:
                 _LOGGER.debug(
@@ -449,17 +1227,8 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
             self._mydata[key] = bool(system_status[flag])
 
-    async def _load_and_process_poll(self):
-        """Load and process standard poll data."""
-        try:
-            poll_data: dict[str, Any] = await self.hass.async_add_executor_job(
-                self.proxy.poll
-            )
-            power_mode_job = self.hass.async_add_executor_job(self.proxy.get_power_mode)
-        except HomeAssistantError as ex:
-            _LOGGER.warning("Failed to poll, not updating data: %s", ex)
-            return
-
+    def _process_poll(self, poll_data: dict[str, Any]) -> None:
+        """Process standard poll data."""
         self._mydata["additional-production"] = poll_data["production"]["add"]
         self._mydata["autarky"] = poll_data["autarky"]
         self._mydata["battery-charge"] = max(0, poll_data["consumption"]["battery"])
@@ -476,23 +1245,17 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self._mydata["solar-production"] = poll_data["production"]["solar"]
         self._mydata["wallbox-consumption"] = poll_data["consumption"]["wallbox"]
 
-        power_mode: str = str(await power_mode_job)
+    def _process_power_mode(self, power_mode_raw: int) -> None:
+        """Process the current power mode."""
+        power_mode: str = str(power_mode_raw)
         if PowerMode.has_value(power_mode):
             self._mydata["power-mode"] = power_mode
         else:
             _LOGGER.debug("Unknown power mode %s", power_mode)
             self._mydata["power-mode"] = f"Power mode {power_mode}"
 
-    async def _load_and_process_db_data_today(self) -> None:
-        """Load and process retrieved db data settings."""
-        try:
-            db_data: dict[str, Any] = await self.hass.async_add_executor_job(
-                self.proxy.get_db_data, self._get_db_data_day_timestamp(), 86400
-            )
-        except HomeAssistantError as ex:
-            _LOGGER.warning("Failed to load daily stats, not updating data: %s", ex)
-            return
-
+    def _process_db_data_today(self, db_data: dict[str, Any]) -> None:
+        """Process retrieved db data settings."""
         self._mydata["db-day-autarky"] = db_data["autarky"]
         self._mydata["db-day-battery-charge"] = db_data["bat_power_in"]
         self._mydata["db-day-battery-discharge"] = db_data["bat_power_out"]
@@ -503,44 +1266,18 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self._mydata["db-day-solar-production"] = db_data["solarProduction"]
         self._mydata["db-day-startts"] = db_data["startTimestamp"]
 
-    async def _load_and_process_manual_charge(self) -> None:
-        """Loand and process manual charge status."""
-        try:
-            request_data: dict[str, Any] = await self.hass.async_add_executor_job(
-                self.proxy.get_manual_charge
-            )
-        except HomeAssistantError as ex:
-            _LOGGER.warning(
-                "Failed to load manual charge state, not updating data: %s", ex
-            )
-            return
-
+    def _process_manual_charge(self, request_data: dict[str, Any]) -> None:
+        """Process manual charge status."""
         self._mydata["manual-charge-active"] = request_data["active"]
         self._mydata["manual-charge-energy"] = request_data["energy"]
 
-    async def _load_and_process_powermeters_data(self) -> None:
-        """Load and process additional sources to existing data."""
-        try:
-            request_data: dict[str, Any] = await self.hass.async_add_executor_job(
-                self.proxy.get_powermeters_data
-            )
-        except HomeAssistantError as ex:
-            _LOGGER.warning("Failed to load powermeters, not updating data: %s", ex)
-            return
-
+    def _process_powermeters_data(self, request_data: dict[str, Any]) -> None:
+        """Process additional sources to existing data."""
         for key, value in request_data.items():
             self._mydata[key] = value
 
-    async def _load_and_process_sgready_state(self) -> None:
-        """Loand and process SG Ready state."""
-        try:
-            request_data: dict[str, Any] = await self.hass.async_add_executor_job(
-                self.proxy.get_sgready_state
-            )
-        except HomeAssistantError as ex:
-            _LOGGER.warning("Failed to load SG Ready state, not updating data: %s", ex)
-            return
-
+    def _process_sgready_state(self, request_data: dict[str, Any]) -> None:
+        """Process SG Ready state."""
         sgready_state_map = {
             1: "locked",
             2: "normal",
@@ -561,23 +1298,13 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self._mydata["sgready-active"] = bool(request_data["sgready-active"])
         self._sgready_available = bool(request_data["sgready-active"])
 
-    async def _load_and_process_wallbox_ems_settings(self) -> None:
-        """Load and process EMS-level wallbox settings.
+    def _process_wallbox_ems_settings(self, ems_wb_state: dict[str, Any]) -> None:
+        """Process EMS-level wallbox settings.
 
         These are independent of the per-wallbox readings, so a failure here
         (e.g. firmware without support for these RSCP tags) must not prevent
         the regular wallbox polling.
         """
-        try:
-            ems_wb_state: dict[str, Any] = await self.hass.async_add_executor_job(
-                self.proxy.get_wallbox_ems_settings
-            )
-        except HomeAssistantError as ex:
-            _LOGGER.warning(
-                "Failed to load EMS wallbox settings, not updating them: %s", ex
-            )
-            return
-
         self._mydata["battery-before-car-mode"] = ems_wb_state[
             "battery-before-car-mode"
         ]
@@ -589,49 +1316,52 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             "wallbox-enforce-power-assignment"
         ]
 
-    async def _load_and_process_wallbox_data(self) -> None:
-        """Load and process wallbox data to existing data."""
-        await self._load_and_process_wallbox_ems_settings()
-
-        for wallbox in self.wallboxes:
-            try:
-                request_data: dict[str, Any] = await self.hass.async_add_executor_job(
-                    self.proxy.get_wallbox_data, wallbox["index"]
-                )
-            except HomeAssistantError as ex:
-                _LOGGER.warning(
-                    "Failed to load wallbox %s, not updating its data: %s",
-                    wallbox["index"],
-                    ex,
-                )
-                continue
+    def _process_wallbox_data(
+        self, wallbox: E3DCWallbox, request_data: dict[str, Any] | None
+    ) -> None:
+        """Process wallbox data to existing data."""
+        if request_data is None:
+            return
+        if isinstance(request_data, HomeAssistantError):
+            log = (
+                _LOGGER.debug
+                if self._poll_scheduler.is_open(PollGroup.WALLBOX_DATA)
+                else _LOGGER.warning
+            )
+            log(
+                "Failed to load wallbox %s, not updating its data: %s",
+                wallbox["index"],
+                request_data,
+            )
+            return
 
-            for key, value in request_data.items():
-                formatted_key = re.sub(
-                    r"(?<!^)(?=[A-Z])", "-", key
-                ).lower()  # RegEx to convert from CamelCase to kebab-case
-                if formatted_key == "plug-locked":
-                    formatted_key = "plug-lock"
-                    value = (
-                        not value
-                    )  # Inverse to match HA's Lock On/Off interpretation
-                if formatted_key == "plugged":
-                    formatted_key = "plug"
-                if formatted_key == "schuko-on":
-                    formatted_key = "schuko"
-                if formatted_key == "sun-mode-on":
-                    formatted_key = "sun-mode"
-                if formatted_key == "charging-active":
-                    formatted_key = "charging"
-                wallbox_key = wallbox["key"]
-                self._mydata[f"{wallbox_key}-{formatted_key}"] = value
+        for key, value in request_data.items():
+            formatted_key = re.sub(
+                r"(?<!^)(?=[A-Z])", "-", key
+            ).lower()  # RegEx to convert from CamelCase to kebab-case
+            if formatted_key == "plug-locked":
+                formatted_key = "plug-lock"
+                value = not value  # Inverse to match HA's Lock On/Off interpretation
+            if formatted_key == "plugged":
+                formatted_key = "plug"
+            if formatted_key == "schuko-on":
+                formatted_key = "schuko"
+            if formatted_key == "sun-mode-on":
+                formatted_key = "sun-mode"
+            if formatted_key == "charging-active":
+                formatted_key = "charging"
+            wallbox_key = wallbox["key"]
+            self._mydata[f"{wallbox_key}-{formatted_key}"] = value
 
     async def _load_timezone_settings(self):
         """Load the current timezone offset from the E3DC, using its local timezone data.
 
         Required to correctly retrieve power statistics for today.
         """
-        tz_name: str = await self.hass.async_add_executor_job(self.proxy.get_timezone)
+        tz_name: str | None = self._topology.get("timezone")
+        if tz_name is None:
+            tz_name = await self.proxy.async_get_timezone()
+            self._topology["timezone"] = tz_name
 
         tz_offset: int | None = None
         try:
@@ -647,8 +1377,8 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
         if tz_offset is None:
             # Fallback to compute the offset using current times from E3DC:
-            ts_local: int = await self.hass.async_add_executor_job(self.proxy.get_time)
-            ts_utc: int = await self.hass.async_add_executor_job(self.proxy.get_timeutc)
+            ts_local: int = await self.proxy.async_get_time()
+            ts_utc: int = await self.proxy.async_get_timeutc()
             delta: int = ts_local - ts_utc
             tz_offset = int(1800 * round(delta / 1800))
 
@@ -696,14 +1426,13 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """Enable or disable weather regulated charging."""
         _LOGGER.debug("Updating weather regulated chargsing to %s", enabled)
 
-        try:
-            self._update_guard_powersettings = True
-            await self.hass.async_add_executor_job(
-                self.proxy.set_weather_regulated_charge, enabled
-            )
+        keys: tuple[str, ...] = ("pset-weatherregulationenabled",)
+        with self._write_fences.write(keys) as version:
+            power_settings: (
+                dict[str, Any] | None
+            ) = await self.proxy.async_set_weather_regulated_charge(enabled)
             self._mydata["pset-weatherregulationenabled"] = enabled
-        finally:
-            self._update_guard_powersettings = False
+        self._process_power_settings_readback(power_settings, keys, version)
 
         _LOGGER.debug("Successfully updated weather regulated charging to %s", enabled)
         return True
@@ -712,12 +1441,13 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """Enable or disable SmartPower powersaving."""
         _LOGGER.debug("Updating powersaving to %s", enabled)
 
-        try:
-            self._update_guard_powersettings = True
-            await self.hass.async_add_executor_job(self.proxy.set_powersave, enabled)
+        keys: tuple[str, ...] = ("pset-powersaving-enabled",)
+        with self._write_fences.write(keys) as version:
+            power_settings: (
+                dict[str, Any] | None
+            ) = await self.proxy.async_set_powersave(enabled)
             self._mydata["pset-powersaving-enabled"] = enabled
-        finally:
-            self._update_guard_powersettings = False
+        self._process_power_settings_readback(power_settings, keys, version)
 
         _LOGGER.debug("Updated powersaving to %s", enabled)
         return True
@@ -726,14 +1456,13 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """Enable or disable battery charge before car mode."""
         _LOGGER.debug("Updating battery before car mode to %s", enabled)
 
-        try:
-            self._update_guard_wallboxsettings = True
-            await self.hass.async_add_executor_job(
-                self.proxy.set_battery_before_car_mode, enabled
-            )
+        keys: tuple[str, ...] = ("battery-before-car-mode",)
+        with self._write_fences.write(keys) as version:
+            ems_wb_state: (
+                dict[str, Any] | None
+            ) = await self.proxy.async_set_battery_before_car_mode(enabled)
             self._mydata["battery-before-car-mode"] = enabled
-        finally:
-            self._update_guard_wallboxsettings = False
+        self._process_wallbox_ems_settings_readback(ems_wb_state, keys, version)
 
         _LOGGER.debug("Successfully updated battery before car mode to %s", enabled)
         return True
@@ -742,14 +1471,13 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """Enable or disable battery charge car with battery mode."""
         _LOGGER.debug("Updating battery to car mode to %s", enabled)
 
-        try:
-            self._update_guard_wallboxsettings = True
-            await self.hass.async_add_executor_job(
-                self.proxy.set_battery_to_car_mode, enabled
-            )
+        keys: tuple[str, ...] = ("battery-to-car-mode",)
+        with self._write_fences.write(keys) as version:
+            ems_wb_state: (
+                dict[str, Any] | None
+            ) = await self.proxy.async_set_battery_to_car_mode(enabled)
             self._mydata["battery-to-car-mode"] = enabled
-        finally:
-            self._update_guard_wallboxsettings = False
+        self._process_wallbox_ems_settings_readback(ems_wb_state, keys, version)
 
         _LOGGER.debug("Successfully updated battery to car mode to %s", enabled)
         return True
@@ -758,32 +1486,38 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """Set the battery wallbox discharge limit (SoC limit)."""
         _LOGGER.debug("Updating battery wallbox discharge limit to %s%%", limit)
 
-        try:
-            self._update_guard_wallboxsettings = True
-            await self.hass.async_add_executor_job(
-                self.proxy.set_battery_wallbox_discharge_limit, limit
-            )
-            self._mydata["battery-wallbox-discharge-limit"] = limit
-        finally:
-            self._update_guard_wallboxsettings = False
+        applied: int = await self._get_setpoint_writer(
+            "battery-wallbox-discharge-limit",
+            self._async_write_battery_wallbox_discharge_limit,
+        ).async_write(limit)
 
         _LOGGER.debug(
-            "Successfully updated battery wallbox discharge limit to %s%%", limit
+            "Successfully updated battery wallbox discharge limit to %s%%", applied
         )
         return True
 
+    async def _async_write_battery_wallbox_discharge_limit(self, limit: int) -> int:
+        """Write the battery wallbox discharge limit, return the value E3DC reports."""
+        keys: tuple[str, ...] = ("battery-wallbox-discharge-limit",)
+        with self._write_fences.write(keys):
+            applied: int = await self.proxy.async_set_battery_wallbox_discharge_limit(
+                limit
+            )
+            self._mydata["battery-wallbox-discharge-limit"] = applied
+        self._async_publish_readback(keys)
+        return applied
+
     async def async_set_wallbox_enforce_power_assignment(self, enforce: bool) -> bool:
         """Enable or disable wallbox enforce power assignment mode."""
         _LOGGER.debug("Updating wallbox enforce power assignment to %s", enforce)
 
-        try:
-            self._update_guard_wallboxsettings = True
-            await self.hass.async_add_executor_job(
-                self.proxy.set_wallbox_enforce_power_assignment, enforce
-            )
+        keys: tuple[str, ...] = ("wallbox-enforce-power-assignment",)
+        with self._write_fences.write(keys) as version:
+            ems_wb_state: (
+                dict[str, Any] | None
+            ) = await self.proxy.async_set_wallbox_enforce_power_assignment(enforce)
             self._mydata["wallbox-enforce-power-assignment"] = enforce
-        finally:
-            self._update_guard_wallboxsettings = False
+        self._process_wallbox_ems_settings_readback(ems_wb_state, keys, version)
 
         _LOGGER.debug(
             "Successfully updated wallbox enforce power assignment to %s", enforce
@@ -796,17 +1530,17 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """Enable or disable wallbox sun mode."""
         _LOGGER.debug("Updating wallbox sun mode to %s", enabled)
 
+        keys: list[str] = self._get_wallbox_keys(wallbox_index, ("sun-mode",))
         try:
-            self._update_guard_wallboxsettings = True
-            await self.hass.async_add_executor_job(
-                self.proxy.set_wallbox_sun_mode, enabled, wallbox_index
-            )
+            with self._write_fences.write(keys) as version:
+                wallbox_data: (
+                    dict[str, Any] | None
+                ) = await self.proxy.async_set_wallbox_sun_mode(enabled, wallbox_index)
             self._mydata["wallbox-sun-mode"] = enabled
         except Exception as ex:
             _LOGGER.error("Failed to set wallbox sun mode to %s: %s", enabled, ex)
             return False
-        finally:
-            self._update_guard_wallboxsettings = False
+        self._process_wallbox_readback(wallbox_index, wallbox_data, keys, version)
 
         _LOGGER.debug("Successfully updated wallbox sun mode to %s", enabled)
         return True
@@ -815,17 +1549,17 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """Enable or disable wallbox schuko."""
         _LOGGER.debug("Updating wallbox schuko to %s", enabled)
 
+        keys: list[str] = self._get_wallbox_keys(wallbox_index, ("schuko",))
         try:
-            self._update_guard_wallboxsettings = True
-            await self.hass.async_add_executor_job(
-                self.proxy.set_wallbox_schuko, enabled, wallbox_index
-            )
+            with self._write_fences.write(keys) as version:
+                wallbox_data: (
+                    dict[str, Any] | None
+                ) = await self.proxy.async_set_wallbox_schuko(enabled, wallbox_index)
             self._mydata["wallbox-schuko"] = enabled
         except Exception as ex:
             _LOGGER.error("Failed to set wallbox schuko to %s: %s", enabled, ex)
             return False
-        finally:
-            self._update_guard_wallboxsettings = False
+        self._process_wallbox_readback(wallbox_index, wallbox_data, keys, version)
 
         _LOGGER.debug("Successfully updated wallbox schuko to %s", enabled)
         return True
@@ -834,13 +1568,16 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """Toggle the Wallbox Phases between 1 and 3."""
         _LOGGER.debug("Toggling the Wallbox Phases")
 
+        keys: list[str] = self._get_wallbox_keys(wallbox_index, ("phases",))
         try:
-            await self.hass.async_add_executor_job(
-                self.proxy.toggle_wallbox_phases, wallbox_index
-            )
+            with self._write_fences.write(keys) as version:
+                wallbox_data: (
+                    dict[str, Any] | None
+                ) = await self.proxy.async_toggle_wallbox_phases(wallbox_index)
         except Exception as ex:
             _LOGGER.error("Failed to toggle wallbox phases: %s", ex)
             return False
+        self._process_wallbox_readback(wallbox_index, wallbox_data, keys, version)
 
         _LOGGER.debug("Successfully toggled wallbox phases")
         return True
@@ -849,13 +1586,16 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """Toggle the Wallbox charging state."""
         _LOGGER.debug("Toggling the Wallbox charging state")
 
+        keys: list[str] = self._get_wallbox_keys(wallbox_index, ("charging",))
         try:
-            await self.hass.async_add_executor_job(
-                self.proxy.toggle_wallbox_charging, wallbox_index
-            )
+            with self._write_fences.write(keys) as version:
+                wallbox_data: (
+                    dict[str, Any] | None
+                ) = await self.proxy.async_toggle_wallbox_charging(wallbox_index)
         except Exception as ex:
             _LOGGER.error("Failed to toggle wallbox charging state: %s", ex)
             return False
+        self._process_wallbox_readback(wallbox_index, wallbox_data, keys, version)
 
         _LOGGER.debug("Successfully toggled wallbox charging state")
         return True
@@ -865,11 +1605,11 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
         _LOGGER.debug("Clearing any active power limit.")
 
-        # Call RSCP service.
-        # no update guard necessary, as we're called from a service, not an entity
-        await self.hass.async_add_executor_job(
-            self.proxy.set_power_limits, False, None, None
-        )
+        # Goes through the same writer, so that limits still held back are
+        # dropped instead of enabling the limits again after clearing them.
+        await self._get_setpoint_writer(
+            "power-limits", self._async_write_power_limits, _merge_power_limits
+        ).async_write(None)
 
         _LOGGER.debug("Successfully cleared the power limits")
 
@@ -911,11 +1651,52 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
         _LOGGER.debug("Setting wallbox max charge current to %s", current)
 
-        await self.hass.async_add_executor_job(
-            self.proxy.set_wallbox_max_charge_current, current, wallbox_index
+        applied: int = await self._get_setpoint_writer(
+            f"wallbox-{wallbox_index}-max-charge-current",
+            partial(self._async_write_wallbox_max_charge_current, wallbox_index),
+        ).async_write(current)
+
+        _LOGGER.debug("Successfully set the wallbox max charge current to %s", applied)
+
+    async def _async_write_wallbox_max_charge_current(
+        self, wallbox_index: int, current: int
+    ) -> int:
+        """Write the wallbox max charge current, returns the current it applied.
+
+        The wallbox may clip the current, the requested one is only returned
+        if it could not be read back.
+        """
+        keys: list[str] = self._get_wallbox_keys(wallbox_index, ("max-charge-current",))
+        with self._write_fences.write(keys) as version:
+            wallbox_data: (
+                dict[str, Any] | None
+            ) = await self.proxy.async_set_wallbox_max_charge_current(
+                current, wallbox_index
+            )
+        self._process_wallbox_readback(wallbox_index, wallbox_data, keys, version)
+        if wallbox_data is None:
+            return current
+        return wallbox_data.get("maxChargeCurrent", current)
+
+    def _get_wallbox(self, wallbox_index: int) -> E3DCWallbox | None:
+        """Return the wallbox of the given index, None if it is unknown."""
+        return next(
+            (
+                wallbox
+                for wallbox in self.wallboxes
+                if wallbox["index"] == wallbox_index
+            ),
+            None,
         )
 
-        _LOGGER.debug("Successfully set the wallbox max charge current to %s", current)
+    def _get_wallbox_keys(
+        self, wallbox_index: int, key_suffixes: Collection[str]
+    ) -> list[str]:
+        """Return the data keys of a wallbox with the given suffixes."""
+        wallbox: E3DCWallbox | None = self._get_wallbox(wallbox_index)
+        if wallbox is None:
+            return []
+        return [f"{wallbox['key']}-{suffix}" for suffix in key_suffixes]
 
     async def async_set_power_limits(
         self, max_charge: int | None, max_discharge: int | None
@@ -949,11 +1730,114 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             max_discharge,
         )
 
-        await self.hass.async_add_executor_job(
-            self.proxy.set_power_limits, True, max_charge, max_discharge
+        applied: tuple[int | None, int | None] | None = await self._get_setpoint_writer(
+            "power-limits", self._async_write_power_limits, _merge_power_limits
+        ).async_write((max_charge, max_discharge))
+
+        if applied is None:
+            _LOGGER.debug("The power limits were cleared by a later request")
+            return
+        _LOGGER.debug(
+            "Successfully set the power limits, max_charge: %s, max_discharge: %s",
+            *applied,
         )
 
-        _LOGGER.debug("Successfully set the power limits")
+    async def _async_write_power_limits(
+        self, limits: tuple[int | None, int | None] | None
+    ) -> tuple[int | None, int | None] | None:
+        """Write and enable the power limits, None clears them.
+
+        Returns the limits E3DC applied, as read back, or the requested ones if
+        they could not be read back.
+        """
+        with self._write_fences.write(_POWER_LIMIT_KEYS) as version:
+            power_settings: (
+                dict[str, Any] | None
+            ) = await self.proxy.async_set_power_limits(
+                limits is not None, *(limits or (None, None))
+            )
+        self._process_power_settings_readback(
+            power_settings, _POWER_LIMIT_KEYS, version
+        )
+        if limits is None or power_settings is None:
+            return limits
+        return (power_settings["maxChargePower"], power_settings["maxDischargePower"])
+
+    @callback
+    def _process_power_settings_readback(
+        self,
+        power_settings: dict[str, Any] | None,
+        keys: Collection[str],
+        version: int,
+    ) -> None:
+        """Take the power settings read back with a write, or poll them soon."""
+        if power_settings is None:
+            self._poll_scheduler.request_poll(PollGroup.POWER_SETTINGS)
+        else:
+            with self._fenced_update(version, keys):
+                self._process_power_settings(power_settings)
+            self._poll_scheduler.mark_polled(PollGroup.POWER_SETTINGS)
+        self._async_publish_readback(keys)
+
+    @callback
+    def _process_wallbox_ems_settings_readback(
+        self,
+        ems_wb_state: dict[str, Any] | None,
+        keys: Collection[str],
+        version: int,
+    ) -> None:
+        """Take the EMS wallbox settings read back with a write, or poll them soon."""
+        if ems_wb_state is None:
+            self._poll_scheduler.request_poll(PollGroup.WALLBOX_EMS_SETTINGS)
+        else:
+            with self._fenced_update(version, keys):
+                self._process_wallbox_ems_settings(ems_wb_state)
+            self._poll_scheduler.mark_polled(PollGroup.WALLBOX_EMS_SETTINGS)
+        self._async_publish_readback(keys)
+
+    def _process_wallbox_readback(
+        self,
+        wallbox_index: int,
+        wallbox_data: dict[str, Any] | None,
+        keys: Collection[str],
+        version: int,
+    ) -> None:
+        """Take the data of a wallbox read back with a write, or poll it soon."""
+        wallbox: E3DCWallbox | None = self._get_wallbox(wallbox_index)
+        if wallbox is None:
+            return
+        if wallbox_data is None:
+            self._poll_scheduler.request_poll(PollGroup.WALLBOX_DATA)
+        else:
+            with self._fenced_update(version, keys):
+                self._process_wallbox_data(wallbox, wallbox_data)
+        self._async_publish_readback(keys)
+
+    def _get_setpoint_writer(
+        self,
+        key: str,
+        write: Callable[[Any], Coroutine[Any, Any, Any]],
+        merge: Callable[[Any, Any], Any] | None = None,
+    ) -> E3DCSetpointWriter:
+        """Return the writer coalescing the writes of the given setpoint."""
+        writer: E3DCSetpointWriter | None = self._setpoint_writers.get(key)
+        if writer is None:
+            writer = self._setpoint_writers[key] = E3DCSetpointWriter(
+                self.hass,
+                f"{self.uid} {key}",
+                write,
+                self.config_entry.options.get(
+                    CONF_SETPOINT_DEBOUNCE, DEFAULT_SETPOINT_DEBOUNCE
+                ),
+                merge,
+            )
+        return writer
+
+    def get_setpoint_status(self) -> dict[str, Any]:
+        """Return the write statistics of all setpoints for diagnostics."""
+        return {
+            key: writer.get_status() for key, writer in self._setpoint_writers.items()
+        }
 
     async def async_manual_charge(self, charge_amount_wh: int) -> None:
         """Start manual charging the given amount, zero will stop charging."""
@@ -969,12 +1853,33 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
         # Call RSCP service.
         # no update guard necessary, as we're called from a service, not an entity
-        await self.hass.async_add_executor_job(
-            self.proxy.start_manual_charge, charge_amount_wh
-        )
+        await self.proxy.async_start_manual_charge(charge_amount_wh)
+        self._poll_scheduler.request_poll(PollGroup.MANUAL_CHARGE)
 
         _LOGGER.debug("Manual charging start command has been sent.")
 
+    async def async_start_capture(self, include_payloads: bool = False) -> str:
+        """Capture the RSCP traffic into a new file, return its path."""
+        path: str = self.hass.config.path(
+            DOMAIN, f"capture-{self.uid}-{utcnow().strftime('%Y%m%d-%H%M%S')}.jsonl"
+        )
+        await self.proxy.async_start_capture(path, include_payloads)
+        _LOGGER.info("Capturing RSCP traffic of E3DC %s into %s", self.uid, path)
+        return path
+
+    async def async_stop_capture(self) -> None:
+        """Stop capturing the RSCP traffic."""
+        status: dict[str, Any] | None = self.proxy.get_capture_status()
+        if status is None:
+            return
+        await self.proxy.async_stop_capture()
+        _LOGGER.info(
+            "Captured %s RSCP exchanges of E3DC %s into %s",
+            status["exchanges"],
+            self.uid,
+            status["path"],
+        )
+
     @callback
     def _shutdown_power_mode(self, _event: Event | None) -> None:
         """Handle shutdown event to stop power mode updates."""
@@ -983,54 +1888,31 @@ class E3DCCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     @callback
     def _stop_power_mode(self) -> None:
         """Stop the power mode updates."""
-        if self._stop_set_power_mode is not None:
-            _LOGGER.debug("Stopping power mode")
-            self._stop_set_power_mode()
-            self._stop_set_power_mode = None
+        self._power_mode_controller.stop()
         self._mydata["set-power-mode"] = SetPowerMode.NORMAL.value
         self._mydata["set-power-value"] = None
 
-    async def _async_set_power(self, keepAlive: bool = True) -> None:
-        """Set the power mode and value based on the current state."""
-        _LOGGER.debug(
-            "Setting power mode: %s at %s W",
-            SetPowerMode.get_enum(self._mydata["set-power-mode"]).name,
-            self._mydata["set-power-value"],
-        )
-
-        try:
-            await self.hass.async_add_executor_job(
-                self.proxy.set_power_mode,
-                int(self._mydata["set-power-mode"]),
-                self._mydata["set-power-value"],
-            )
-            power_mode_str: str = str(self.proxy.get_power_mode())
-            if PowerMode.has_value(str(power_mode_str)):
-                self._mydata["power-mode"] = power_mode_str
-            else:
-                _LOGGER.debug("Unknown power mode %s", power_mode_str)
-                self._mydata["power-mode"] = f"Power mode {power_mode_str}"
-        except HomeAssistantError as ex:
-            _LOGGER.warning("Failed set power mode: %s", ex)
+    @callback
+    def _process_power_mode_readback(self, power_mode_raw: int) -> None:
+        """Take the power mode read back with a power mode write."""
+        self._process_power_mode(power_mode_raw)
+        # Spares the regular poll, the keepalive reads it back often enough.
+        self._poll_scheduler.mark_polled(PollGroup.POWER_MODE)
+        self._async_publish_readback()
 
     async def async_set_power_mode(self, mode: SetPowerMode, value: int | None) -> None:
         """Set the power mode and value."""
         self._mydata["set-power-mode"] = mode.value
         self._mydata["set-power-value"] = value
 
-        if mode == SetPowerMode.NORMAL and self._stop_set_power_mode is not None:
+        if mode == SetPowerMode.NORMAL:
             self._stop_power_mode()
         else:
-            if mode != SetPowerMode.NORMAL:
-                _LOGGER.debug("Starting power mode")
-                await self._async_set_power()
-                if self._stop_set_power_mode is None:
-                    self._stop_set_power_mode = async_track_time_interval(
-                        self.hass,
-                        self._async_set_power,
-                        timedelta(seconds=10),
-                        cancel_on_shutdown=True,
-                    )
+            await self._power_mode_controller.async_set(mode, value)
+
+    def get_power_mode_status(self) -> dict[str, Any]:
+        """Return the state of the power mode control for diagnostics."""
+        return self._power_mode_controller.get_status()
 
     def is_farm_controller(self) -> bool:
         """Return whether the device is a farm controller."""
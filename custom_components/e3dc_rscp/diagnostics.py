@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 import logging
 import re
 from traceback import format_exception
@@ -29,7 +29,7 @@ async def async_get_config_entry_diagnostics(
     """Return diagnostics for our config entry."""
 
     dumper: _DiagnosticsDumper = _DiagnosticsDumper(hass, entry)
-    dumper.create_dump()
+    await dumper.async_create_dump()
     return dumper.get_dump()
 
 
@@ -45,9 +45,11 @@ class _DiagnosticsDumper:
         self.e3dc: E3DC = self.proxy.e3dc
         self.result: dict[str, Any] = {}
 
-    def create_dump(self):
+    async def async_create_dump(self):
         """Create the dump data and redact pricate data, central call-in point."""
-        self._collect_data()
+        # pye3dc blocks until the event loop did the request, keep it off the loop.
+        await self.proxy.async_add_executor_job(self._collect_data)
+        await self._async_collect_proxy_data()
         self._redact_private_information(self.result)
 
     def get_dump(self) -> dict[str, Any]:
@@ -62,6 +64,16 @@ class _DiagnosticsDumper:
             "get_system_status": self._query_data_for_dump(self.e3dc.get_system_status),
             "get_powermeters": self._query_data_for_dump(self.e3dc.get_powermeters),
             "e3dc_config": self.proxy.e3dc_config,
+            "connection": self.proxy.get_connection_status(),
+            "call_statistics": self.proxy.call_statistics.get_status(),
+            "capture": self.proxy.get_capture_status(),
+            "topology": self.coordinator.get_topology_status(),
+            "identification": self.coordinator.get_identification_status(),
+            "state_snapshot": self.coordinator.get_snapshot_status(),
+            "poll_breakers": self.coordinator.get_poll_status(),
+            "power_mode_control": self.coordinator.get_power_mode_status(),
+            "setpoint_writes": self.coordinator.get_setpoint_status(),
+            "write_fences": self.coordinator.get_write_fence_status(),
             "poll": self._query_data_for_dump(self.e3dc.poll),
             "switches": self._query_data_for_dump(self.e3dc.poll_switches),
             "get_pvis_data": self._query_data_for_dump(self.e3dc.get_pvis_data),
@@ -76,9 +88,6 @@ class _DiagnosticsDumper:
             "get_power_settings": self._query_data_for_dump(
                 self.e3dc.get_power_settings
             ),
-            "get_wallbox_ems_settings": self._query_data_for_dump(
-                self.proxy.get_wallbox_ems_settings
-            ),
             "is_farm_controller": self.coordinator.is_farm_controller(),
             "EMS_REQ_GET_MANUAL_CHARGE": self._query_data_for_dump(
                 lambda: self.e3dc.sendRequestTag(
@@ -107,11 +116,22 @@ class _DiagnosticsDumper:
                     keepAlive=True,
                 )
             ),
-            "EMS_REQ_IP_REMOTE_CONTROL": self._query_data_for_dump(
-                self.proxy.get_remote_control_ip
-            ),
         }
 
+    async def _async_collect_proxy_data(self):
+        """Collect the data the proxy queries natively on the event loop."""
+        self.result["get_batteries"] = await self._async_query_data_for_dump(
+            self.proxy.async_get_batteries
+        )
+        self.result["get_wallbox_ems_settings"] = await self._async_query_data_for_dump(
+            self.proxy.async_get_wallbox_ems_settings
+        )
+        self.result[
+            "EMS_REQ_IP_REMOTE_CONTROL"
+        ] = await self._async_query_data_for_dump(
+            self.proxy.async_get_remote_control_ip
+        )
+
     def _query_data_for_dump(self, call: Callable[[], Any]) -> Any:
         """Query an individual data point using a lambda, protect by exception handling."""
         try:
@@ -120,6 +140,15 @@ class _DiagnosticsDumper:
         except Exception as ex:  # pylint: disable=broad-exception-caught
             return {"exception": format_exception(ex)}
 
+    async def _async_query_data_for_dump(
+        self, call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Query an individual data point using a coroutine, protect by exception handling."""
+        try:
+            return await call()
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            return {"exception": format_exception(ex)}
+
     def _redact_private_information(self, data: Any):
         """Redact data recursively so that it can be shared."""
 
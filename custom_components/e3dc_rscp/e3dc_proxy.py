@@ -2,75 +2,2130 @@
 
 from __future__ import annotations
 
-from functools import wraps
+import asyncio
+import base64
+from collections import Counter, deque
+from collections.abc import Callable, Collection, Coroutine
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from functools import cache, partial, wraps
+import heapq
+import inspect
+from itertools import count
+import json
 import logging
-from typing import Any
-from threading import Lock
-
-from e3dc import E3DC, SendError, NotAvailableError, RSCPKeyError, AuthenticationError
-from e3dc._rscpLib import rscpFindTag, rscpFindTagIndex
-from e3dc._rscpTags import RscpTag, RscpType, PowermeterType
-from e3dc._e3dc_rscp_local import DEFAULT_PORT as RSCP_PORT
+import math
+import os
+import random
+import struct
+from time import monotonic
+from typing import Any, Final, TextIO
+from threading import Lock, get_ident
+
+from e3dc import (
+    E3DC,
+    RscpMessage,
+    SendError,
+    NotAvailableError,
+    RSCPKeyError,
+    AuthenticationError,
+)
+from e3dc._rscpLib import (
+    FrameError,
+    endianSwapUint16,
+    packFmtDict_FixedSize,
+    rscpDecode,
+    rscpEncode,
+    rscpFrame,
+    rscpFrameDecode,
+)
+from e3dc._rscpTags import RscpError, RscpTag, RscpType, PowermeterType
+from e3dc._e3dc_rscp_local import (
+    DEFAULT_PORT as RSCP_PORT,
+    CommunicationError,
+    RSCPAuthenticationError,
+    RSCPNotAvailableError,
+)
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME, CONF_PORT
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
 
-from .const import CONF_RSCPKEY
+from .const import CONF_RSCPKEY, ConnectionState, PollGroup, RequestPriority
+from .rscp_cipher import BLOCK_SIZE, RSCPCipher, numpy_available
 
 _LOGGER = logging.getLogger(__name__)
 
 FARM_PARAM_SERIALNO = "FARM_PARAM_SERIALNO"
 
+# Same timeout pye3dc uses for its socket.
+_CONNECT_TIMEOUT: Final[int] = 5
+_REQUEST_TIMEOUT: Final[int] = 5
+
+# Reconnect pacing once a connection is considered lost. The delay doubles with
+# every failed attempt and is randomized by the jitter factor.
+_BACKOFF_INITIAL: Final[float] = 5
+_BACKOFF_MAX: Final[float] = 300
+_BACKOFF_JITTER: Final[float] = 0.2
+_OFFLINE_AFTER_ATTEMPTS: Final[int] = 4
+
+# Number of most recent samples per operation the call percentiles are based on.
+_STATISTICS_SAMPLES: Final[int] = 500
+
+# Blocking calls of a device are serialized by its transport anyway, so they run
+# on a single worker. Calls beyond this number of pending ones are rejected
+# instead of piling up behind a slow or unreachable E3DC.
+_EXECUTOR_MAX_PENDING: Final[int] = 8
+
+# RSCP frame header: magic, ctrl, seconds (2x), nanoseconds, payload length.
+_FRAME_MAGIC: Final[int] = 0xE3DC
+_FRAME_HEADER_FORMAT: Final[str] = "<HHIIIH"
+_FRAME_HEADER_SIZE: Final[int] = struct.calcsize(_FRAME_HEADER_FORMAT)
+_FRAME_CRC_SIZE: Final[int] = 4
+_FRAME_CTRL_CRC: Final[int] = 0x10
+
+# RSCP message header: tag, type, value length.
+_MESSAGE_HEADER_SIZE: Final[int] = struct.calcsize("<IBH")
+_MESSAGE_LENGTH_OFFSET: Final[int] = struct.calcsize("<IB")
+
+# Requests making up E3DC.poll(), in the order _parse_poll expects them.
+_POLL_REQUEST_TAGS: Final[tuple[RscpTag, ...]] = (
+    RscpTag.INFO_REQ_UTC_TIME,
+    RscpTag.EMS_REQ_BAT_SOC,
+    RscpTag.EMS_REQ_POWER_PV,
+    RscpTag.EMS_REQ_POWER_ADD,
+    RscpTag.EMS_REQ_POWER_BAT,
+    RscpTag.EMS_REQ_POWER_HOME,
+    RscpTag.EMS_REQ_POWER_GRID,
+    RscpTag.EMS_REQ_POWER_WB_ALL,
+    RscpTag.EMS_REQ_SELF_CONSUMPTION,
+    RscpTag.EMS_REQ_AUTARKY,
+)
+
+# Requests making up the wallbox EMS settings, in the order
+# _parse_wallbox_ems_settings expects them.
+_WALLBOX_EMS_REQUEST_TAGS: Final[tuple[RscpTag, ...]] = (
+    RscpTag.EMS_REQ_BATTERY_BEFORE_CAR_MODE,
+    RscpTag.EMS_REQ_BATTERY_TO_CAR_MODE,
+    RscpTag.EMS_REQ_GET_WB_DISCHARGE_BAT_UNTIL,
+    RscpTag.EMS_REQ_GET_WALLBOX_ENFORCE_POWER_ASSIGNMENT,
+)
+
+# Maximum number of battery packs pye3dc probes for.
+_MAX_BATTERIES: Final[int] = 8
+
+# Readings of a battery pack, keyed like in E3DC.get_battery_data(). The device
+# state container is requested in addition and split up by the parser.
+_BATTERY_FIELDS: Final[dict[str, RscpTag]] = {
+    "asoc": RscpTag.BAT_ASOC,
+    "chargeCycles": RscpTag.BAT_CHARGE_CYCLES,
+    "current": RscpTag.BAT_CURRENT,
+    "dcbCount": RscpTag.BAT_DCB_COUNT,
+    "designCapacity": RscpTag.BAT_DESIGN_CAPACITY,
+    "deviceName": RscpTag.BAT_DEVICE_NAME,
+    "eodVoltage": RscpTag.BAT_EOD_VOLTAGE,
+    "errorCode": RscpTag.BAT_ERROR_CODE,
+    "fcc": RscpTag.BAT_FCC,
+    "maxBatVoltage": RscpTag.BAT_MAX_BAT_VOLTAGE,
+    "maxChargeCurrent": RscpTag.BAT_MAX_CHARGE_CURRENT,
+    "maxDischargeCurrent": RscpTag.BAT_MAX_DISCHARGE_CURRENT,
+    "maxDcbCellTemp": RscpTag.BAT_MAX_DCB_CELL_TEMPERATURE,
+    "minDcbCellTemp": RscpTag.BAT_MIN_DCB_CELL_TEMPERATURE,
+    "moduleVoltage": RscpTag.BAT_MODULE_VOLTAGE,
+    "rc": RscpTag.BAT_RC,
+    "readyForShutdown": RscpTag.BAT_READY_FOR_SHUTDOWN,
+    "rsoc": RscpTag.BAT_RSOC,
+    "rsocReal": RscpTag.BAT_RSOC_REAL,
+    "statusCode": RscpTag.BAT_STATUS_CODE,
+    "terminalVoltage": RscpTag.BAT_TERMINAL_VOLTAGE,
+    "totalUseTime": RscpTag.BAT_TOTAL_USE_TIME,
+    "totalDischargeTime": RscpTag.BAT_TOTAL_DISCHARGE_TIME,
+    "trainingMode": RscpTag.BAT_TRAINING_MODE,
+    "usuableCapacity": RscpTag.BAT_USABLE_CAPACITY,
+    "usuableRemainingCapacity": RscpTag.BAT_USABLE_REMAINING_CAPACITY,
+}
+
+# Requests making up the battery pack readings, taken from E3DC.get_battery_data().
+_BATTERY_REQUEST_TAGS: Final[tuple[RscpTag, ...]] = (
+    RscpTag.BAT_REQ_ASOC,
+    RscpTag.BAT_REQ_CHARGE_CYCLES,
+    RscpTag.BAT_REQ_CURRENT,
+    RscpTag.BAT_REQ_DCB_COUNT,
+    RscpTag.BAT_REQ_DESIGN_CAPACITY,
+    RscpTag.BAT_REQ_DEVICE_NAME,
+    RscpTag.BAT_REQ_DEVICE_STATE,
+    RscpTag.BAT_REQ_EOD_VOLTAGE,
+    RscpTag.BAT_REQ_ERROR_CODE,
+    RscpTag.BAT_REQ_FCC,
+    RscpTag.BAT_REQ_MAX_BAT_VOLTAGE,
+    RscpTag.BAT_REQ_MAX_CHARGE_CURRENT,
+    RscpTag.BAT_REQ_MAX_DISCHARGE_CURRENT,
+    RscpTag.BAT_REQ_MAX_DCB_CELL_TEMPERATURE,
+    RscpTag.BAT_REQ_MIN_DCB_CELL_TEMPERATURE,
+    RscpTag.BAT_REQ_INTERNALS,
+    RscpTag.BAT_REQ_MODULE_VOLTAGE,
+    RscpTag.BAT_REQ_RC,
+    RscpTag.BAT_REQ_READY_FOR_SHUTDOWN,
+    RscpTag.BAT_REQ_RSOC,
+    RscpTag.BAT_REQ_RSOC_REAL,
+    RscpTag.BAT_REQ_STATUS_CODE,
+    RscpTag.BAT_REQ_TERMINAL_VOLTAGE,
+    RscpTag.BAT_REQ_TOTAL_USE_TIME,
+    RscpTag.BAT_REQ_TOTAL_DISCHARGE_TIME,
+    RscpTag.BAT_REQ_TRAINING_MODE,
+    RscpTag.BAT_REQ_USABLE_CAPACITY,
+    RscpTag.BAT_REQ_USABLE_REMAINING_CAPACITY,
+)
+
+# Readings of a single battery module within BAT_DCB_INFO, keyed like in
+# E3DC.get_battery_data().
+_BATTERY_DCB_FIELDS: Final[dict[str, RscpTag]] = {
+    "current": RscpTag.BAT_DCB_CURRENT,
+    "currentAvg30s": RscpTag.BAT_DCB_CURRENT_AVG_30S,
+    "cycleCount": RscpTag.BAT_DCB_CYCLE_COUNT,
+    "designCapacity": RscpTag.BAT_DCB_DESIGN_CAPACITY,
+    "designVoltage": RscpTag.BAT_DCB_DESIGN_VOLTAGE,
+    "deviceName": RscpTag.BAT_DCB_DEVICE_NAME,
+    "endOfDischarge": RscpTag.BAT_DCB_END_OF_DISCHARGE,
+    "error": RscpTag.BAT_DCB_ERROR,
+    "fullChargeCapacity": RscpTag.BAT_DCB_FULL_CHARGE_CAPACITY,
+    "fwVersion": RscpTag.BAT_DCB_FW_VERSION,
+    "manufactureDate": RscpTag.BAT_DCB_MANUFACTURE_DATE,
+    "manufactureName": RscpTag.BAT_DCB_MANUFACTURE_NAME,
+    "maxChargeCurrent": RscpTag.BAT_DCB_MAX_CHARGE_CURRENT,
+    "maxChargeTemperature": RscpTag.BAT_DCB_CHARGE_HIGH_TEMPERATURE,
+    "maxChargeVoltage": RscpTag.BAT_DCB_MAX_CHARGE_VOLTAGE,
+    "maxDischargeCurrent": RscpTag.BAT_DCB_MAX_DISCHARGE_CURRENT,
+    "minChargeTemperature": RscpTag.BAT_DCB_CHARGE_LOW_TEMPERATURE,
+    "parallelCellCount": RscpTag.BAT_DCB_NR_PARALLEL_CELL,
+    "pcbVersion": RscpTag.BAT_DCB_PCB_VERSION,
+    "protocolVersion": RscpTag.BAT_DCB_PROTOCOL_VERSION,
+    "remainingCapacity": RscpTag.BAT_DCB_REMAINING_CAPACITY,
+    "serialCode": RscpTag.BAT_DCB_SERIALCODE,
+    "serialNo": RscpTag.BAT_DCB_SERIALNO,
+    "soc": RscpTag.BAT_DCB_SOC,
+    "soh": RscpTag.BAT_DCB_SOH,
+    "status": RscpTag.BAT_DCB_STATUS,
+    "voltage": RscpTag.BAT_DCB_VOLTAGE,
+    "voltageAvg30s": RscpTag.BAT_DCB_VOLTAGE_AVG_30S,
+    "warning": RscpTag.BAT_DCB_WARNING,
+}
+
+# Wallbox identification, in addition to its index. Only the fields the wallbox
+# answered are returned.
+_WALLBOX_IDENTIFICATION_FIELDS: Final[dict[str, RscpTag]] = {
+    "firmwareVersion": RscpTag.WB_FIRMWARE_VERSION,
+    "deviceName": RscpTag.WB_DEVICE_NAME,
+    "wallboxSerial": RscpTag.WB_SERIAL,
+    "macAddress": RscpTag.WB_MAC_ADDRESS,
+    "wallboxType": RscpTag.WB_WALLBOX_TYPE,
+    "lowerCurrentLimit": RscpTag.WB_LOWER_CURRENT_LIMIT,
+    "upperCurrentLimit": RscpTag.WB_UPPER_CURRENT_LIMIT,
+}
+
+# Bit positions within EMS_SYS_STATUS, taken from E3DC.get_system_status().
+_SYSTEM_STATUS_BITS: Final[dict[str, int]] = {
+    "dcdcAlive": 0,
+    "powerMeterAlive": 1,
+    "batteryModuleAlive": 2,
+    "pvModuleAlive": 3,
+    "pvInverterInited": 4,
+    "serverConnectionAlive": 5,
+    "pvDerated": 6,
+    "emsAlive": 7,
+    "acModeBlocked": 10,
+    "sysConfChecked": 11,
+    "emergencyPowerStarted": 12,
+    "emergencyPowerOverride": 13,
+    "wallBoxAlive": 14,
+    "powerSaveEnabled": 15,
+    "chargeIdlePeriodActive": 16,
+    "dischargeIdlePeriodActive": 17,
+    "waitForWeatherBreakthrough": 18,
+    "rescueBatteryEnabled": 19,
+    "emergencyReserveReached": 20,
+    "socSyncRequested": 21,
+}
+
+
+class E3DCConnectionSupervisor:
+    """Track the health of an E3DC connection and pace reconnect attempts.
+
+    Failing exchanges first degrade the connection. Once a request has used up
+    all its retries, the connection is considered lost: further requests fail
+    immediately until the backoff delay has passed, then a single request may
+    try to reconnect. The delay doubles with every failed attempt, and the
+    connection is reported offline after several of them. This way an outage
+    costs one reconnect attempt per backoff period instead of a failing
+    round of retries for every call.
+    """
+
+    def __init__(self, host: str) -> None:
+        """Initialize the supervisor, the connection is assumed to be healthy."""
+        self._host: str = host
+        self._state: ConnectionState = ConnectionState.CONNECTED
+        self._attempts: int = 0
+        self._retry_at: float = 0
+        self._last_error: str | None = None
+
+    @property
+    def state(self) -> ConnectionState:
+        """Return the current connection state."""
+        return self._state
+
+    @property
+    def available(self) -> bool:
+        """Return True unless the connection is considered lost."""
+        return self._state in (ConnectionState.CONNECTED, ConnectionState.DEGRADED)
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the next reconnect attempt is allowed."""
+        return max(0.0, self._retry_at - monotonic())
+
+    def attempt_allowed(self) -> bool:
+        """Return True if a request may talk to E3DC right now."""
+        return self.available or self.retry_in == 0
+
+    def record_success(self) -> None:
+        """Record a successful exchange."""
+        if not self.available:
+            _LOGGER.info(
+                "Connection to E3DC at %s restored after %s reconnect attempts",
+                self._host,
+                self._attempts,
+            )
+        self._state = ConnectionState.CONNECTED
+        self._attempts = 0
+        self._retry_at = 0
+        self._last_error = None
+
+    def record_failure(self, ex: Exception) -> None:
+        """Record a failed exchange which is going to be retried."""
+        self._last_error = repr(ex)
+        if self._state == ConnectionState.CONNECTED:
+            _LOGGER.debug("Connection to E3DC at %s degraded: %s", self._host, ex)
+            self._state = ConnectionState.DEGRADED
+
+    def record_connection_lost(self, ex: Exception) -> None:
+        """Record a request which failed for good and schedule the next attempt."""
+        self._last_error = repr(ex)
+        self._attempts += 1
+        delay: float = min(
+            _BACKOFF_MAX, _BACKOFF_INITIAL * 2 ** (self._attempts - 1)
+        ) * random.uniform(1 - _BACKOFF_JITTER, 1 + _BACKOFF_JITTER)
+        self._retry_at = monotonic() + delay
+
+        if self.available:
+            _LOGGER.warning(
+                "Lost connection to E3DC at %s, reconnecting in %.0f s: %s",
+                self._host,
+                delay,
+                self._last_error,
+            )
+            self._state = ConnectionState.RECONNECTING
+        elif (
+            self._state == ConnectionState.RECONNECTING
+            and self._attempts >= _OFFLINE_AFTER_ATTEMPTS
+        ):
+            _LOGGER.warning(
+                "E3DC at %s is offline after %s reconnect attempts, retrying every %.0f s",
+                self._host,
+                self._attempts,
+                delay,
+            )
+            self._state = ConnectionState.OFFLINE
+        else:
+            _LOGGER.debug(
+                "Reconnect attempt %s to E3DC at %s failed, retrying in %.0f s: %s",
+                self._attempts,
+                self._host,
+                delay,
+                ex,
+            )
+
+    def get_status(self) -> dict[str, Any]:
+        """Return the supervisor state for diagnostics."""
+        return {
+            "state": self._state,
+            "reconnect_attempts": self._attempts,
+            "retry_in": round(self.retry_in, 1),
+            "last_error": self._last_error,
+        }
+
+
+class _CallContext:
+    """State of a running proxy call, shared with the requests it issues."""
+
+    __slots__ = ("lock_wait", "operation")
+
+    def __init__(self, operation: str) -> None:
+        """Initialize the context of the given operation."""
+        self.operation: str = operation
+        self.lock_wait: float = 0
+
+
+# Set by e3dc_call for the duration of a proxy call. Requests issued through the
+# bridge run on the event loop, but share the context of the calling thread.
+_current_call: ContextVar[_CallContext | None] = ContextVar(
+    "e3dc_current_call", default=None
+)
+
+
+# Set by e3dc_call as well, nested calls are sent with the priority of the
+# outermost call, like a write reading back its result.
+_current_priority: ContextVar[RequestPriority | None] = ContextVar(
+    "e3dc_current_priority", default=None
+)
+
+
+@contextmanager
+def _request_priority(priority: RequestPriority):
+    """Send all requests of the block with the given priority, unless nested."""
+    parent = _current_priority.get()
+    token = _current_priority.set(priority if parent is None else parent)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def _record_lock_wait(duration: float) -> None:
+    """Add time spent waiting for a connection lock to the running call."""
+    call = _current_call.get()
+    if call is not None:
+        call.lock_wait += duration
+
+
+class _OperationStatistics:
+    """Counters and recent samples of a single proxy operation."""
+
+    __slots__ = ("calls", "durations", "errors", "lock_waits")
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.calls: int = 0
+        self.errors: Counter[str] = Counter()
+        self.durations: deque[float] = deque(maxlen=_STATISTICS_SAMPLES)
+        self.lock_waits: deque[float] = deque(maxlen=_STATISTICS_SAMPLES)
+
+
+def _percentiles(samples: Collection[float]) -> dict[str, float | None]:
+    """Return p50, p95, p99 and the maximum of the samples in milliseconds."""
+    if len(samples) == 0:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+
+    ordered = sorted(samples)
+
+    def _rank(percentile: int) -> float:
+        index = max(0, math.ceil(percentile / 100 * len(ordered)) - 1)
+        return round(ordered[index] * 1000, 1)
+
+    return {
+        "p50": _rank(50),
+        "p95": _rank(95),
+        "p99": _rank(99),
+        "max": round(ordered[-1] * 1000, 1),
+    }
+
+
+class E3DCCallStatistics:
+    """Collect latency and error statistics of all proxy calls.
+
+    Filled by the e3dc_call decorator: per operation, i.e. proxy method, it
+    counts calls and errors by exception class and keeps the most recent
+    durations, along with the part of each call spent waiting for a
+    connection lock. Calls are recorded from the event loop and executor
+    threads alike.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self._lock: Lock = Lock()
+        self._operations: dict[str, _OperationStatistics] = {}
+
+    def record_call(
+        self,
+        operation: str,
+        duration: float,
+        lock_wait: float,
+        error: BaseException | None = None,
+    ) -> None:
+        """Record a finished call of the given operation."""
+        with self._lock:
+            statistics = self._operations.get(operation)
+            if statistics is None:
+                statistics = self._operations[operation] = _OperationStatistics()
+            statistics.calls += 1
+            statistics.durations.append(duration)
+            statistics.lock_waits.append(lock_wait)
+            if error is not None:
+                statistics.errors[type(error).__name__] += 1
+
+    def get_summary(self, operation: str | None = None) -> dict[str, Any]:
+        """Return calls, errors and percentiles of one or all operations."""
+        with self._lock:
+            if operation is not None:
+                selected = [self._operations.get(operation, _OperationStatistics())]
+            else:
+                selected = list(self._operations.values())
+            return {
+                "calls": sum(statistics.calls for statistics in selected),
+                "errors": sum(statistics.errors.total() for statistics in selected),
+                "duration_ms": _percentiles(
+                    [sample for stats in selected for sample in stats.durations]
+                ),
+                "lock_wait_ms": _percentiles(
+                    [sample for stats in selected for sample in stats.lock_waits]
+                ),
+            }
+
+    def get_status(self) -> dict[str, Any]:
+        """Return the statistics of all operations for diagnostics."""
+        with self._lock:
+            return {
+                operation: {
+                    "calls": statistics.calls,
+                    "errors": dict(statistics.errors),
+                    "duration_ms": _percentiles(statistics.durations),
+                    "lock_wait_ms": _percentiles(statistics.lock_waits),
+                }
+                for operation, statistics in sorted(self._operations.items())
+            }
+
+
+class E3DCExecutor:
+    """Run the blocking proxy calls of a single E3DC on a dedicated worker.
+
+    Keeps calls waiting for a slow E3DC off Home Assistant's shared executor,
+    so they do not starve other integrations. The number of pending calls is
+    bounded, and the time calls spent queued for the worker is recorded.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize the executor, its worker thread is started on first use."""
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"e3dc_rscp_{name}"
+        )
+        self._lock: Lock = Lock()
+        self._pending: int = 0
+        self._max_pending: int = 0
+        self._submitted: int = 0
+        self._rejected: int = 0
+        self._queue_waits: deque[float] = deque(maxlen=_STATISTICS_SAMPLES)
+        self._closed: bool = False
+
+    async def async_run(self, target: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking call on the worker and return its result."""
+        with self._lock:
+            if self._closed:
+                raise HomeAssistantError("Communication Failure: Connection closed")
+            if self._pending >= _EXECUTOR_MAX_PENDING:
+                self._rejected += 1
+                raise HomeAssistantError(
+                    "Communication Failure: Too many pending calls to E3DC"
+                )
+            self._pending += 1
+            self._submitted += 1
+            self._max_pending = max(self._max_pending, self._pending)
+
+        future: Future = self._executor.submit(self._run, monotonic(), target, *args)
+        # Also called if the future is cancelled before it ran.
+        future.add_done_callback(self._done)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        """Reject further calls and drop those not yet started."""
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_status(self) -> dict[str, Any]:
+        """Return the queue depth and wait times for diagnostics."""
+        with self._lock:
+            return {
+                "pending": self._pending,
+                "max_pending": self._max_pending,
+                "submitted": self._submitted,
+                "rejected": self._rejected,
+                "queue_wait_ms": _percentiles(self._queue_waits),
+            }
+
+    def _run(self, queued: float, target: Callable[..., Any], *args: Any) -> Any:
+        """Record the queue wait and run the call, on the worker thread."""
+        with self._lock:
+            self._queue_waits.append(monotonic() - queued)
+        return target(*args)
+
+    def _done(self, _future: Future) -> None:
+        """Count a call as no longer pending."""
+        with self._lock:
+            self._pending -= 1
+
+
+class _Param:
+    """Placeholder for a value of a _RequestTemplate, filled in per request."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        """Initialize the placeholder of the given parameter."""
+        self.name: str = name
+
+
+class _EncodedRequest:
+    """Request already encoded by a _RequestTemplate.
+
+    The transport sends its payload as is, the decoded message is only built
+    for captures and replays.
+    """
+
+    __slots__ = ("_template", "_values", "payload")
+
+    def __init__(
+        self, template: _RequestTemplate, values: dict[str, Any], payload: bytes
+    ) -> None:
+        """Initialize the request."""
+        self._template: _RequestTemplate = template
+        self._values: dict[str, Any] = values
+        self.payload: bytes = payload
+
+    @property
+    def message(self) -> RscpMessage:
+        """Return the request as decoded RSCP message."""
+        return self._template.fill(self._values)
+
+
+# A request as passed to the transport.
+_Request = RscpMessage | _EncodedRequest
+
+
+class _RequestTemplate:
+    """RSCP request encoded once, only its parameters are filled in per call.
+
+    Tags and types are resolved and the static parts of the request encoded
+    when the template is created. Parameters are given as _Param placeholders,
+    they must be of a fixed size type, so that no container length depends on
+    them. A template without parameters always returns the same request.
+    """
+
+    __slots__ = ("_message", "_params", "_payload", "_static")
+
+    def __init__(self, message: RscpMessage) -> None:
+        """Compile the given message."""
+        self._message: RscpMessage = message
+        self._params: list[tuple[str, int, struct.Struct]] = []
+        payload = bytearray()
+        self._compile(message, payload)
+        self._payload: bytes = bytes(payload)
+        self._static: _EncodedRequest | None = (
+            None if self._params else _EncodedRequest(self, {}, self._payload)
+        )
+
+    def build(self, **values: Any) -> _EncodedRequest:
+        """Return the request with the given parameter values."""
+        if self._static is not None:
+            return self._static
+        payload = bytearray(self._payload)
+        for name, offset, packer in self._params:
+            packer.pack_into(payload, offset, values[name])
+        return _EncodedRequest(self, values, bytes(payload))
+
+    def fill(self, values: dict[str, Any]) -> RscpMessage:
+        """Return the decoded message with the given parameter values."""
+
+        def _fill(message: RscpMessage) -> RscpMessage:
+            tag, rscp_type, value = message
+            if isinstance(value, _Param):
+                return (tag, rscp_type, values[value.name])
+            if isinstance(value, list):
+                return (tag, rscp_type, [_fill(item) for item in value])
+            return message
+
+        return _fill(self._message)
+
+    def _compile(self, message: RscpMessage, payload: bytearray) -> None:
+        """Encode the message, recording the offsets of its parameters."""
+        tag, rscp_type, value = message
+        if isinstance(value, _Param):
+            fmt = packFmtDict_FixedSize.get(rscp_type)
+            if fmt is None:
+                raise ValueError(
+                    f"{tag} cannot be a parameter, {rscp_type} has no fixed size"
+                )
+            packer = struct.Struct("<" + fmt)
+            payload += rscpEncode(tag, rscp_type, 0)
+            self._params.append((value.name, len(payload) - packer.size, packer))
+        elif isinstance(value, list):
+            start = len(payload)
+            payload += rscpEncode(tag, rscp_type, [])
+            for item in value:
+                self._compile(item, payload)
+            struct.pack_into(
+                "<H",
+                payload,
+                start + _MESSAGE_LENGTH_OFFSET,
+                len(payload) - start - _MESSAGE_HEADER_SIZE,
+            )
+        else:
+            payload += rscpEncode(message)
+
+
+def _encode_request(request: _Request) -> bytes:
+    """Return the RSCP encoding of a request."""
+    if isinstance(request, _EncodedRequest):
+        return request.payload
+    return rscpEncode(request)
+
+
+def _decode_request(request: _Request) -> RscpMessage:
+    """Return a request as decoded RSCP message."""
+    if isinstance(request, _EncodedRequest):
+        return request.message
+    return request
+
+
+class _PriorityLock:
+    """Asyncio lock handed over to the waiter with the highest priority.
+
+    Waiters of the same priority are served in order of arrival. A waiter being
+    cancelled leaves the queue without affecting the others.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an unlocked lock."""
+        self._locked: bool = False
+        self._waiters: list[tuple[RequestPriority, int, asyncio.Future[None]]] = []
+        self._sequence = count()
+
+    def locked(self) -> bool:
+        """Return True if the lock is held."""
+        return self._locked
+
+    def get_waiting(self) -> dict[str, int]:
+        """Return the number of queued waiters per priority."""
+        return dict(
+            Counter(
+                priority.name.lower()
+                for priority, _, waiter in self._waiters
+                if not waiter.done()
+            )
+        )
+
+    async def acquire(self, priority: RequestPriority) -> None:
+        """Wait until the lock is handed to us."""
+        if not self._locked:
+            self._locked = True
+            return
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._sequence), waiter)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Cancelled right after the lock has been handed over.
+                self.release()
+            else:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            raise
+
+    def release(self) -> None:
+        """Hand the lock to the next waiter, or unlock it if there is none."""
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._locked = False
+
+
+class E3DCTransport:
+    """Asyncio based RSCP connection to a single E3DC.
+
+    Uses the frame encoding of pye3dc, but talks to E3DC via asyncio streams
+    instead of a blocking socket, so requests do not occupy an executor
+    thread. Frames are encrypted by RSCPCipher, which is byte compatible with
+    the cipher of pye3dc but several times faster. E3DC answers strictly in
+    order, thus all exchanges are serialized. Exchanges waiting for the
+    connection are served by the priority of the proxy call issuing them, see
+    RequestPriority.
+    """
+
+    def __init__(
+        self, host: str, port: int, username: str, password: str, key: str
+    ) -> None:
+        """Initialize the transport, the connection is established on demand."""
+        self._host: str = host
+        self._port: int = port
+        self._username: bytes = username.encode("utf-8")
+        self._password: bytes = password.encode("utf-8")
+        self._key: bytes = key.encode("utf-8")
+        self._lock: _PriorityLock = _PriorityLock()
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._encdec: RSCPCipher | None = None
+        self._supervisor: E3DCConnectionSupervisor = E3DCConnectionSupervisor(host)
+        self._statistics: E3DCCallStatistics = E3DCCallStatistics()
+        self._connection_id: int = 0
+        self._closed: bool = False
+        self.capture: E3DCTrafficCapture | None = None
+
+    @property
+    def connection_id(self) -> int:
+        """Return a counter increased with every established connection.
+
+        Allows callers to invalidate data cached for a previous connection.
+        """
+        return self._connection_id
+
+    @property
+    def reconnects(self) -> int:
+        """Return the number of connections established after the first one."""
+        return max(0, self._connection_id - 1)
+
+    @property
+    def connected(self) -> bool:
+        """Return True if an authenticated connection is open."""
+        return self._writer is not None
+
+    @property
+    def supervisor(self) -> E3DCConnectionSupervisor:
+        """Return the supervisor tracking the health of this connection."""
+        return self._supervisor
+
+    @property
+    def statistics(self) -> E3DCCallStatistics:
+        """Return the statistics of all calls using this connection."""
+        return self._statistics
+
+    def get_queue_status(self) -> dict[str, int]:
+        """Return the number of exchanges waiting for the connection per priority."""
+        return self._lock.get_waiting()
+
+    @asynccontextmanager
+    async def _async_hold_lock(self):
+        """Hold the connection, queued by the priority of the running call."""
+        started = monotonic()
+        priority = _current_priority.get()
+        await self._lock.acquire(RequestPriority.READ if priority is None else priority)
+        try:
+            _record_lock_wait(monotonic() - started)
+            yield
+        finally:
+            self._lock.release()
+
+    async def async_connect(self) -> None:
+        """Open and authenticate the connection, raises RSCP level exceptions."""
+        async with self._async_hold_lock():
+            if not self.connected:
+                self._check_attempt_allowed(RSCPNotAvailableError)
+                try:
+                    await self._async_connect()
+                except (RSCPAuthenticationError, RSCPKeyError):
+                    raise
+                except Exception as ex:
+                    self._supervisor.record_failure(ex)
+                    raise
+                self._supervisor.record_success()
+
+    async def async_disconnect(self) -> None:
+        """Close the connection if open, the next request reconnects."""
+        async with self._async_hold_lock():
+            self._close()
+
+    async def async_close(self) -> None:
+        """Close the connection for good, all further requests fail.
+
+        Waits for the exchange in flight, so it is not cut off halfway.
+        """
+        self._closed = True
+        async with self._async_hold_lock():
+            self._close()
+
+    async def async_exchange(self, requests: list[_Request]) -> list[RscpMessage]:
+        """Do a single exchange on the open connection, raises RSCP level exceptions."""
+        async with self._async_hold_lock():
+            self._check_attempt_allowed(RSCPNotAvailableError)
+            try:
+                responses = await self._async_exchange(requests)
+            except (RSCPAuthenticationError, RSCPKeyError):
+                raise
+            except Exception as ex:
+                self._supervisor.record_failure(ex)
+                raise
+            self._supervisor.record_success()
+            return responses
+
+    async def async_send_requests(
+        self, requests: list[_Request], retries: int = 3
+    ) -> list[RscpMessage]:
+        """Send all requests within a single RSCP frame.
+
+        Mirrors the retry and exception semantics of E3DC.sendRequest. Unlike
+        sendRequest, a message E3DC answers with an error does not fail the
+        whole request, it is returned in place so that callers can decide
+        per message. The responses are returned in request order.
+
+        While the supervisor considers the connection lost, requests fail
+        right away until the next reconnect attempt is due, which is then
+        made without further retries.
+        """
+        async with self._async_hold_lock():
+            self._check_attempt_allowed(NotAvailableError)
+            if not self._supervisor.available:
+                retries = 0
+
+            retry = 0
+            while True:
+                try:
+                    if not self.connected:
+                        await self._async_connect()
+                    responses = await self._async_exchange(requests)
+                except RSCPAuthenticationError as ex:
+                    raise AuthenticationError() from ex
+                except RSCPNotAvailableError as ex:
+                    raise NotAvailableError() from ex
+                except RSCPKeyError:
+                    raise
+                except Exception as ex:
+                    retry += 1
+                    if retry > retries:
+                        self._supervisor.record_connection_lost(ex)
+                        raise SendError("Max retries reached") from ex
+                    self._supervisor.record_failure(ex)
+                else:
+                    self._supervisor.record_success()
+                    return responses
+
+    async def async_send_request(
+        self, request: _Request, retries: int = 3
+    ) -> RscpMessage:
+        """Send a single request, an error answer raises like E3DC.sendRequest."""
+        response = (await self.async_send_requests([request], retries))[0]
+        if response[1] == RscpType.Error.name:
+            if response[2] == RscpError.RSCP_ERR_NOT_AVAILABLE.name:
+                raise NotAvailableError()
+            raise SendError(f"E3DC could not answer {response[0]}: {response[2]}")
+        return response
+
+    async def _async_connect(self) -> None:
+        """Open and authenticate the connection, the lock must be held."""
+        self._close()
+        try:
+            async with asyncio.timeout(_CONNECT_TIMEOUT):
+                self._reader, self._writer = await asyncio.open_connection(
+                    self._host, self._port
+                )
+        except (OSError, TimeoutError) as ex:
+            self._close()
+            raise CommunicationError from ex
+
+        self._encdec = RSCPCipher(self._key)
+        response = (
+            await self._async_exchange(
+                [
+                    (
+                        RscpTag.RSCP_REQ_AUTHENTICATION,
+                        RscpType.Container,
+                        [
+                            (
+                                RscpTag.RSCP_AUTHENTICATION_USER,
+                                RscpType.CString,
+                                self._username,
+                            ),
+                            (
+                                RscpTag.RSCP_AUTHENTICATION_PASSWORD,
+                                RscpType.CString,
+                                self._password,
+                            ),
+                        ],
+                    )
+                ],
+                authenticating=True,
+            )
+        )[0]
+        if response[1] == RscpType.Error.name:
+            self._close()
+            if response[2] == RscpError.RSCP_ERR_NOT_AVAILABLE.name:
+                raise RSCPNotAvailableError
+            raise CommunicationError(response[2])
+        self._connection_id += 1
+
+    async def _async_exchange(
+        self, requests: list[_Request], authenticating: bool = False
+    ) -> list[RscpMessage]:
+        """Send one frame and decode all answered messages, the lock must be held."""
+        capture = self.capture
+        if capture is None:
+            return await self._async_exchange_frame(requests, authenticating)
+
+        started = monotonic()
+        try:
+            responses = await self._async_exchange_frame(requests, authenticating)
+        except Exception as ex:
+            capture.record(requests, None, monotonic() - started, authenticating, ex)
+            raise
+        capture.record(requests, responses, monotonic() - started, authenticating)
+        return responses
+
+    async def _async_exchange_frame(
+        self, requests: list[_Request], authenticating: bool
+    ) -> list[RscpMessage]:
+        """Do the actual exchange of _async_exchange."""
+        reader, writer, encdec = self._reader, self._writer, self._encdec
+        if reader is None or writer is None or encdec is None:
+            raise CommunicationError("Not connected")
+
+        try:
+            async with asyncio.timeout(_REQUEST_TIMEOUT):
+                request_payload = b"".join(
+                    _encode_request(request) for request in requests
+                )
+                writer.write(encdec.encrypt(rscpFrame(request_payload)))
+                await writer.drain()
+                payload = await self._async_receive_frame(reader, encdec)
+
+            # The credentials are never written to a capture, not even raw.
+            if self.capture is not None and not authenticating:
+                self.capture.add_payloads(request_payload, payload)
+
+            responses: list[RscpMessage] = []
+            offset = 0
+            while offset < len(payload):
+                response, used = rscpDecode(payload[offset:])
+                responses.append(response)
+                offset += used
+        except asyncio.IncompleteReadError as ex:
+            # E3DC drops the connection if it cannot decrypt our credentials,
+            # pye3dc treats this as an invalid key as well.
+            self._close()
+            if authenticating and len(ex.partial) == 0:
+                raise RSCPKeyError from ex
+            raise CommunicationError from ex
+        except asyncio.CancelledError:
+            # The stream is in an undefined state if we stop halfway.
+            self._close()
+            raise
+        except Exception as ex:
+            self._close()
+            raise CommunicationError from ex
+
+        # An unauthenticated session gets every single request denied, single
+        # unavailable tags are up to the caller.
+        if responses and all(
+            response[1] == RscpType.Error.name
+            and response[2] == RscpError.RSCP_ERR_ACCESS_DENIED.name
+            for response in responses
+        ):
+            self._close()
+            raise RSCPAuthenticationError
+
+        return responses
+
+    async def _async_receive_frame(
+        self, reader: asyncio.StreamReader, encdec: RSCPCipher
+    ) -> bytes:
+        """Receive one complete RSCP frame and return its decrypted payload.
+
+        The first block carries the frame header, which tells how many further
+        blocks belong to this frame.
+        """
+        decrypted = encdec.decrypt(await reader.readexactly(BLOCK_SIZE))
+
+        magic, ctrl, _, _, _, length = struct.unpack(
+            _FRAME_HEADER_FORMAT, decrypted[:_FRAME_HEADER_SIZE]
+        )
+        if endianSwapUint16(magic) != _FRAME_MAGIC:
+            raise FrameError("Invalid RSCP frame magic")
+        frame_size = _FRAME_HEADER_SIZE + length
+        if endianSwapUint16(ctrl) & _FRAME_CTRL_CRC:
+            frame_size += _FRAME_CRC_SIZE
+
+        remaining = -(-frame_size // BLOCK_SIZE) * BLOCK_SIZE - BLOCK_SIZE
+        if remaining > 0:
+            decrypted += encdec.decrypt(await reader.readexactly(remaining))
+
+        return rscpFrameDecode(decrypted[:frame_size])[0]
+
+    def _check_attempt_allowed(self, error: type[Exception]) -> None:
+        """Raise the given error if the supervisor holds back all requests."""
+        if self._closed:
+            raise error("Connection to E3DC has been closed")
+        if not self._supervisor.attempt_allowed():
+            raise error(
+                f"Connection to E3DC is {self._supervisor.state}, "
+                f"next attempt in {self._supervisor.retry_in:.0f} s"
+            )
+
+    def _close(self) -> None:
+        """Drop the connection and its encryption state."""
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+        self._encdec = None
+
+
+# Format version of capture files, written into their header line.
+_CAPTURE_VERSION: Final[int] = 1
+
+# Request tags whose values never end up in a capture.
+_CAPTURE_REDACTED_TAGS: Final[frozenset[str]] = frozenset(
+    {
+        RscpTag.RSCP_AUTHENTICATION_USER.name,
+        RscpTag.RSCP_AUTHENTICATION_PASSWORD.name,
+    }
+)
+
+
+def _capture_message(message: RscpMessage, redact: bool = False) -> list[Any]:
+    """Convert a request or response into its JSON representation.
+
+    Tags and types are stored by name, containers as nested messages and binary
+    data as base64 encoded object, so that load_capture can restore them.
+    """
+    tag, rscp_type, value = message
+    tag = tag.name if isinstance(tag, RscpTag) else tag
+    rscp_type = rscp_type.name if isinstance(rscp_type, RscpType) else rscp_type
+
+    if redact and tag in _CAPTURE_REDACTED_TAGS:
+        value = "**REDACTED**"
+    elif isinstance(value, list):
+        value = [_capture_message(item, redact) for item in value]
+    elif isinstance(value, (bytes, bytearray)):
+        value = {"b64": base64.b64encode(value).decode("ascii")}
+    return [tag, rscp_type, value]
+
+
+def _restore_message(data: list[Any]) -> RscpMessage:
+    """Convert a captured message back into its decoded representation."""
+    tag, rscp_type, value = data
+    if isinstance(value, list):
+        value = [_restore_message(item) for item in value]
+    elif isinstance(value, dict):
+        value = base64.b64decode(value["b64"])
+    return (tag, rscp_type, value)
+
+
+def _request_shape(message: list[Any]) -> Any:
+    """Return the tag structure of a captured request, ignoring its values."""
+    tag, _, value = message
+    if isinstance(value, list):
+        return [tag, [_request_shape(item) for item in value]]
+    return tag
+
+
+class E3DCTrafficCapture:
+    """Append-only capture of all RSCP exchanges of a transport.
+
+    Every exchange becomes one JSON line holding its offset since the start of
+    the capture, its duration, the decoded requests and responses, and the raw
+    RSCP payloads if requested. Credentials are redacted, the authentication
+    is never captured raw.
+
+    The file is written by a dedicated thread, so that capturing never blocks
+    the event loop and lines keep the order of the exchanges.
+    """
+
+    def __init__(self, path: str, include_payloads: bool = False) -> None:
+        """Initialize the capture, async_open starts it."""
+        self._path: str = path
+        self._include_payloads: bool = include_payloads
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="e3dc_rscp_capture"
+        )
+        self._file: TextIO | None = None
+        self._started: float = monotonic()
+        self._exchanges: int = 0
+        self._pending_payloads: tuple[bytes, bytes] | None = None
+
+    @property
+    def path(self) -> str:
+        """Return the path of the capture file."""
+        return self._path
+
+    async def async_open(self) -> None:
+        """Open the capture file and write its header."""
+        await asyncio.wrap_future(self._executor.submit(self._open))
+        self._started = monotonic()
+
+    def add_payloads(self, request_payload: bytes, response_payload: bytes) -> None:
+        """Keep the raw payloads of the exchange to be recorded next."""
+        if self._include_payloads:
+            self._pending_payloads = (request_payload, response_payload)
+
+    def record(
+        self,
+        requests: list[_Request],
+        responses: list[RscpMessage] | None,
+        duration: float,
+        redact: bool = False,
+        error: Exception | None = None,
+    ) -> None:
+        """Append a single exchange, responses are None if it failed."""
+        entry: dict[str, Any] = {
+            "t": round(monotonic() - self._started - duration, 4),
+            "ms": round(duration * 1000, 2),
+            "req": [
+                _capture_message(_decode_request(request), redact)
+                for request in requests
+            ],
+        }
+        if responses is not None:
+            entry["res"] = [_capture_message(response) for response in responses]
+        if error is not None:
+            entry["err"] = type(error).__name__
+        if self._pending_payloads is not None:
+            entry["raw"] = [
+                base64.b64encode(payload).decode("ascii")
+                for payload in self._pending_payloads
+            ]
+            self._pending_payloads = None
+
+        self._exchanges += 1
+        self._executor.submit(self._write, json.dumps(entry, separators=(",", ":")))
+
+    async def async_close(self) -> None:
+        """Flush and close the capture file."""
+        await asyncio.wrap_future(self._executor.submit(self._close))
+        self._executor.shutdown(wait=False)
+
+    def get_status(self) -> dict[str, Any]:
+        """Return the state of the capture for diagnostics."""
+        return {
+            "path": self._path,
+            "include_payloads": self._include_payloads,
+            "exchanges": self._exchanges,
+            "running_for": round(monotonic() - self._started),
+        }
+
+    def _open(self) -> None:
+        """Open the file, runs in the capture thread."""
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        self._file = open(self._path, "a", encoding="utf-8")  # noqa: SIM115
+        self._write(
+            json.dumps(
+                {
+                    "capture": _CAPTURE_VERSION,
+                    "started": datetime.now(UTC).isoformat(),
+                },
+                separators=(",", ":"),
+            )
+        )
+
+    def _write(self, line: str) -> None:
+        """Append a line, runs in the capture thread."""
+        if self._file is not None:
+            self._file.write(line + "\n")
+
+    def _close(self) -> None:
+        """Close the file, runs in the capture thread."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def load_capture(path: str) -> list[dict[str, Any]]:
+    """Load the exchanges of a capture file, does blocking I/O.
+
+    A file may hold several captures appended to each other, their exchanges
+    are returned in file order. A line cut off by a crash is skipped.
+    """
+    exchanges: list[dict[str, Any]] = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                _LOGGER.debug("Skipping incomplete line of capture %s", path)
+                continue
+            if "req" in entry:
+                exchanges.append(entry)
+    return exchanges
+
+
+class E3DCReplayTransport(E3DCTransport):
+    """Transport answering from a capture instead of a real E3DC.
+
+    Each request is answered with the next captured response of an identical
+    request. Requests with parameters differing from the capture, like
+    timestamps, fall back to a capture with the same tag structure. Captured
+    answers are used round robin, so that a short capture can drive long
+    benchmarks. Each answer is delayed by its captured duration, divided by
+    the given speed, zero answers right away.
+    """
+
+    def __init__(self, exchanges: list[dict[str, Any]], speed: float = 1) -> None:
+        """Initialize the replay with the exchanges returned by load_capture."""
+        super().__init__("replay", RSCP_PORT, "", "", "")
+        self._speed: float = speed
+        self._connected: bool = False
+        self._exact: dict[str, list[dict[str, Any]]] = {}
+        self._shaped: dict[str, list[dict[str, Any]]] = {}
+        self._cursors: dict[str, int] = {}
+
+        for exchange in exchanges:
+            if exchange["req"][0][0] == RscpTag.RSCP_REQ_AUTHENTICATION.name:
+                continue
+            self._exact.setdefault(self._exact_key(exchange["req"]), []).append(
+                exchange
+            )
+            self._shaped.setdefault(self._shape_key(exchange["req"]), []).append(
+                exchange
+            )
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the replayed connection is open."""
+        return self._connected
+
+    async def _async_connect(self) -> None:
+        """Open the replayed connection, there is nothing to authenticate."""
+        self._connected = True
+        self._connection_id += 1
+
+    async def _async_exchange(
+        self, requests: list[_Request], authenticating: bool = False
+    ) -> list[RscpMessage]:
+        """Answer the requests from the capture."""
+        if not self._connected:
+            raise CommunicationError("Not connected")
+
+        captured = [_capture_message(_decode_request(request)) for request in requests]
+        exchange = self._next(self._exact, self._exact_key(captured))
+        if exchange is None:
+            exchange = self._next(self._shaped, self._shape_key(captured))
+        if exchange is None:
+            raise CommunicationError(
+                f"No captured answer for {[request[0] for request in captured]}"
+            )
+
+        if self._speed > 0:
+            await asyncio.sleep(exchange["ms"] / 1000 / self._speed)
+        if "res" not in exchange:
+            self._close()
+            raise CommunicationError(f"Captured failure: {exchange.get('err')}")
+        return [_restore_message(response) for response in exchange["res"]]
+
+    def _close(self) -> None:
+        """Close the replayed connection."""
+        self._connected = False
+
+    def _next(
+        self, index: dict[str, list[dict[str, Any]]], key: str
+    ) -> dict[str, Any] | None:
+        """Return the next captured exchange for the given key, round robin."""
+        candidates = index.get(key)
+        if not candidates:
+            return None
+        cursor = self._cursors.get(key, 0)
+        self._cursors[key] = cursor + 1
+        return candidates[cursor % len(candidates)]
+
+    @staticmethod
+    def _exact_key(requests: list[Any]) -> str:
+        return "=" + json.dumps(requests, separators=(",", ":"))
+
+    @staticmethod
+    def _shape_key(requests: list[Any]) -> str:
+        return "~" + json.dumps(
+            [_request_shape(request) for request in requests], separators=(",", ":")
+        )
+
+
+class _TransportBridge:
+    """Connection object for pye3dc, routing its requests through the transport.
+
+    pye3dc is synchronous, so its high level methods still have to run in the
+    executor. The bridge blocks the calling worker thread until the event loop
+    has done the actual exchange.
+    """
+
+    def __init__(self, hass: HomeAssistant, transport: E3DCTransport) -> None:
+        """Initialize the bridge."""
+        self._hass: HomeAssistant = hass
+        self._transport: E3DCTransport = transport
+
+    def _run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Run the coroutine on the event loop and wait for its result."""
+        if self._hass.loop_thread_id == get_ident():
+            coro.close()
+            raise RuntimeError("Blocking E3DC call from within the event loop")
+        return asyncio.run_coroutine_threadsafe(coro, self._hass.loop).result()
+
+    def connect(self) -> None:
+        """Establish the connection."""
+        self._run(self._transport.async_connect())
+
+    def disconnect(self) -> None:
+        """Close the connection."""
+        self._run(self._transport.async_disconnect())
+
+    def isConnected(self) -> bool:
+        """Return the connection status."""
+        return self._transport.connected
+
+    def sendRequest(self, plainMsg: RscpMessage) -> RscpMessage:
+        """Send a single request, raising on error answers like E3DC_RSCP_local."""
+        response = self._run(self._transport.async_exchange([plainMsg]))[0]
+        if response[1] == RscpType.Error.name:
+            if response[2] == RscpError.RSCP_ERR_ACCESS_DENIED.name:
+                raise RSCPAuthenticationError
+            if response[2] == RscpError.RSCP_ERR_NOT_AVAILABLE.name:
+                raise RSCPNotAvailableError
+            raise CommunicationError(response[2])
+        return response
+
+    def sendCommand(self, plainMsg: RscpMessage) -> None:
+        """Send a single request, ignoring its answer."""
+        self.sendRequest(plainMsg)
+
 
 class ThreadSafeE3DC(E3DC):
-    """Thread-safe version of E3DC."""
+    """Thread-safe version of E3DC, talking to E3DC through an E3DCTransport.
+
+    The transport serializes all exchanges, so pye3dc methods may be called
+    from several worker threads at once. A write thus does not have to wait
+    for a concurrent pye3dc read to complete, only for its current exchange.
+    """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, bridge: _TransportBridge, *args, **kwargs):
         """Initialize the thread-safe E3DC."""
-        self._lock = Lock()
+        self._bridge: _TransportBridge = bridge
         super().__init__(*args, **kwargs)
 
-    def sendRequest(self, *args, **kwargs):
-        """Thread-safe sendRequest."""
-        with self._lock:
-            return super().sendRequest(*args, **kwargs)
+    @property
+    def rscp(self) -> _TransportBridge:
+        """Return the connection used by all pye3dc requests."""
+        return self._bridge
+
+    @rscp.setter
+    def rscp(self, _value: Any) -> None:
+        """Ignore the socket based connection pye3dc sets up on its own."""
+
+
+class _RscpView:
+    """Index of a decoded RSCP message, giving constant time access by tag.
+
+    Resolves tags like rscpFindTag, the message itself and all nested messages
+    are searched depth first and the first occurrence of a tag wins. The
+    message is walked once, instead of once per looked up tag.
+    """
+
+    __slots__ = ("_index",)
+
+    def __init__(self, message: RscpMessage | None) -> None:
+        """Index the given message, None results in an empty view."""
+        self._index: dict[str, RscpMessage] = {}
+        if message is None:
+            return
+        index = self._index
+        stack: list[RscpMessage] = [message]
+        while stack:
+            current = stack.pop()
+            index.setdefault(current[0], current)
+            if isinstance(current[2], list):
+                stack.extend(reversed(current[2]))
+
+    def __contains__(self, tag: RscpTag) -> bool:
+        """Return True if a message with the given tag exists."""
+        return tag.name in self._index
+
+    def find(self, tag: RscpTag) -> RscpMessage | None:
+        """Return the message with the given tag, None if missing."""
+        return self._index.get(tag.name)
+
+    def get(self, tag: RscpTag, default: Any = None) -> Any:
+        """Return the value of the message with the given tag."""
+        message = self._index.get(tag.name)
+        return default if message is None else message[2]
+
+    def is_valid(self, tag: RscpTag) -> bool:
+        """Return True if the message with the given tag is no error answer."""
+        message = self._index.get(tag.name)
+        return (
+            message is not None
+            and len(message) == 3
+            and message[1] != RscpType.Error.name
+        )
+
+    def view(self, tag: RscpTag) -> _RscpView:
+        """Return a view limited to the message with the given tag."""
+        return _RscpView(self._index.get(tag.name))
+
+
+def _raise_on_error_responses(responses: list[RscpMessage]) -> None:
+    """Raise if E3DC answered any of the given messages with an error."""
+    for response in responses:
+        if response[1] == RscpType.Error.name:
+            raise HomeAssistantError(
+                f"E3DC could not answer {response[0]}: {response[2]}"
+            )
+
+
+def _parse_poll(responses: list[RscpMessage]) -> dict[str, Any]:
+    """Convert the poll responses into the structure of E3DC.poll()."""
+    _raise_on_error_responses(responses)
+    ts, soc, solar, add, bat, home, grid, wb, sc, autarky = (
+        response[2] for response in responses
+    )
+    return {
+        "autarky": autarky,
+        "consumption": {"battery": bat, "house": home, "wallbox": wb},
+        "production": {"solar": solar, "add": -add, "grid": grid},
+        "selfConsumption": sc,
+        "stateOfCharge": soc,
+        "time": datetime.fromtimestamp(ts, tz=UTC),
+    }
+
+
+def _parse_power_mode(responses: list[RscpMessage]) -> int:
+    """Extract the power mode from its response."""
+    _raise_on_error_responses(responses)
+    return responses[0][2]
+
+
+def _parse_set_power(responses: list[RscpMessage]) -> dict[str, Any]:
+    """Parse the accepted set power value and the read back EMS mode."""
+    _raise_on_error_responses(responses)
+    return {"set-power-value": responses[0][2], "power-mode": responses[1][2]}
+
+
+def _parse_car_mode_result(response: RscpMessage, setting: str) -> bool:
+    """Return the state E3DC reports after setting a battery car mode."""
+    if response[2] == 255:
+        raise HomeAssistantError(f"Failed to set {setting}, invalid operation.")
+    return response[2] != 0
+
+
+def _parse_system_status(responses: list[RscpMessage]) -> dict[str, bool]:
+    """Convert the status bitfield into the structure of E3DC.get_system_status()."""
+    _raise_on_error_responses(responses)
+    status: int = responses[0][2]
+    return {flag: bool(status >> bit & 1) for flag, bit in _SYSTEM_STATUS_BITS.items()}
+
+
+def _parse_power_settings(responses: list[RscpMessage]) -> dict[str, Any]:
+    """Convert the power settings into the structure of E3DC.get_power_settings()."""
+    _raise_on_error_responses(responses)
+    res = _RscpView(responses[0])
+    return {
+        "dischargeStartPower": res.get(RscpTag.EMS_DISCHARGE_START_POWER),
+        "maxChargePower": res.get(RscpTag.EMS_MAX_CHARGE_POWER),
+        "maxDischargePower": res.get(RscpTag.EMS_MAX_DISCHARGE_POWER),
+        "powerLimitsUsed": res.get(RscpTag.EMS_POWER_LIMITS_USED),
+        "powerSaveEnabled": res.get(RscpTag.EMS_POWERSAVE_ENABLED),
+        "weatherForecastMode": res.get(RscpTag.EMS_WEATHER_FORECAST_MODE),
+        "weatherRegulatedChargeEnabled": res.get(
+            RscpTag.EMS_WEATHER_REGULATED_CHARGE_ENABLED
+        ),
+    }
+
+
+def _parse_manual_charge(responses: list[RscpMessage]) -> dict[str, Any]:
+    """Convert the manual charge response into our manual charge state."""
+    _raise_on_error_responses(responses)
+    data = _RscpView(responses[0])
+
+    result: dict[str, Any] = {}
+    result["active"] = data.get(RscpTag.EMS_MANUAL_CHARGE_ACTIVE)
+
+    # These seem to be kAh per individual cell, so this is considered very strange.
+    # To get this working for a start, we assume 3,65 V per cell, taking my own unit
+    # as a base, but this obviously will need some real work to base this on
+    # current voltages.
+    # Round to Watts, this should prevent negative values in the magnitude of 10^-6,
+    # which are probably floating point errors.
+    tmp = data.get(RscpTag.EMS_MANUAL_CHARGE_ENERGY_COUNTER)
+    powerfactor = 3.65
+    result["energy"] = round(tmp * powerfactor, 3)
+
+    # The timestamp seem to correctly show the UTC Date when manual charging started
+    # Not yet enabled, just for reference.
+    # self._mydata["manual-charge-start"] = data.get(
+    #     RscpTag.EMS_MANUAL_CHARGE_LASTSTART
+    # )
+
+    return result
+
+
+def _parse_sgready_state(responses: list[RscpMessage]) -> dict[str, Any]:
+    """Convert the SG Ready response into our SG Ready state."""
+    _raise_on_error_responses(responses)
+    result_data = _RscpView(responses[0])
+
+    result: dict[str, Any] = {}
+    result["sgready-active"] = result_data.get(RscpTag.SGR_AKTIV)
+    sgready_state = result_data.get(RscpTag.SGR_STATE)
+    result["sgready-state"] = sgready_state
+    result["sgready-numeric-state"] = sgready_state
+
+    return result
+
+
+def _parse_powermeter_data(responses: list[RscpMessage]) -> dict[str, Any]:
+    """Convert a powermeter response into the relevant parts of E3DC.get_powermeter_data()."""
+    _raise_on_error_responses(responses)
+    res = _RscpView(responses[0])
+    return {
+        "index": res.get(RscpTag.PM_INDEX),
+        "type": res.get(RscpTag.PM_TYPE),
+        "power": {
+            "L1": res.get(RscpTag.PM_POWER_L1),
+            "L2": res.get(RscpTag.PM_POWER_L2),
+            "L3": res.get(RscpTag.PM_POWER_L3),
+        },
+        "energy": {
+            "L1": res.get(RscpTag.PM_ENERGY_L1),
+            "L2": res.get(RscpTag.PM_ENERGY_L2),
+            "L3": res.get(RscpTag.PM_ENERGY_L3),
+        },
+    }
+
+
+def _parse_wallbox_ems_settings(responses: list[RscpMessage]) -> dict[str, Any]:
+    """Convert the wallbox EMS responses into our wallbox EMS settings."""
+    _raise_on_error_responses(responses)
+    beforeCarMode, batToCarMode, batWBDischargeLimit, wbEnforcePowerAssignment = (
+        response[2] for response in responses
+    )
+
+    # An unparseable answer yields None, treat this as an error instead of
+    # silently reporting wrong states.
+    if beforeCarMode is None or batToCarMode is None:
+        raise HomeAssistantError(
+            "Failed to load wallbox EMS settings, got no data from E3DC"
+        )
+
+    result: dict[str, Any] = {}
+    result["battery-before-car-mode"] = beforeCarMode != 0
+    result["battery-to-car-mode"] = batToCarMode != 0
+    result["battery-wallbox-discharge-limit"] = batWBDischargeLimit
+    result["wallbox-enforce-power-assignment"] = bool(wbEnforcePowerAssignment)
+    return result
+
+
+def _parse_wallbox_data(responses: list[RscpMessage]) -> dict[str, Any]:
+    """Convert the wallbox responses into the structure of E3DC.get_wallbox_data()."""
+    _raise_on_error_responses(responses)
+    req = _RscpView(responses[0])
+
+    outObj: dict[str, Any] = {
+        "index": req.get(RscpTag.WB_INDEX),
+        "appSoftware": req.get(RscpTag.WB_APP_SOFTWARE),
+    }
+
+    if RscpTag.WB_EXTERN_DATA_ALG in req:
+        extern_data = req.view(RscpTag.WB_EXTERN_DATA_ALG).get(RscpTag.WB_EXTERN_DATA)
+        status_byte = extern_data[2]
+        outObj["sunModeOn"] = (status_byte & 128) != 0
+        outObj["chargingCanceled"] = (status_byte & 64) != 0
+        outObj["chargingActive"] = (status_byte & 32) != 0
+        outObj["plugLocked"] = (status_byte & 16) != 0
+        outObj["plugged"] = (status_byte & 8) != 0
+        outObj["soc"] = extern_data[0]
+        outObj["phases"] = extern_data[1]
+        outObj["maxChargeCurrent"] = extern_data[3]
+        outObj["schukoOn"] = extern_data[5] != 0
+
+    if RscpTag.WB_EXTERN_DATA_SUN in req:
+        extern_data = req.view(RscpTag.WB_EXTERN_DATA_SUN).get(RscpTag.WB_EXTERN_DATA)
+        outObj["consumptionSun"] = struct.unpack("h", extern_data[0:2])[0]
+        outObj["energySun"] = struct.unpack("i", extern_data[2:6])[0]
+
+    if RscpTag.WB_EXTERN_DATA_NET in req:
+        extern_data = req.view(RscpTag.WB_EXTERN_DATA_NET).get(RscpTag.WB_EXTERN_DATA)
+        outObj["consumptionNet"] = struct.unpack("h", extern_data[0:2])[0]
+        outObj["energyNet"] = struct.unpack("i", extern_data[2:6])[0]
+
+    if "energySun" in outObj and "energyNet" in outObj:
+        outObj["energyAll"] = outObj["energyNet"] + outObj["energySun"]
+
+    if RscpTag.WB_KEY_STATE in req:
+        outObj["keyState"] = req.get(RscpTag.WB_KEY_STATE)
+
+    battery_to_car = _RscpView(responses[1])
+    if RscpTag.EMS_BATTERY_TO_CAR_MODE in battery_to_car:
+        outObj["batteryToCar"] = battery_to_car.get(RscpTag.EMS_BATTERY_TO_CAR_MODE)
+
+    return dict(sorted(outObj.items()))
+
+
+def _parse_wallbox_identification(req: RscpMessage) -> dict[str, Any]:
+    """Convert the wallbox identification response into a structured dict."""
+    _raise_on_error_responses([req])
+    data = _RscpView(req)
+
+    outObj = {
+        "index": data.get(RscpTag.WB_INDEX),
+    }
+    for key, tag in _WALLBOX_IDENTIFICATION_FIELDS.items():
+        if tag in data:
+            outObj[key] = data.get(tag)
+
+    return outObj
+
+
+def _parse_db_data(
+    responses: list[RscpMessage], timestamp: int, timespan_seconds: int
+) -> dict[str, Any]:
+    """Convert the DB history response into the structure of E3DC.get_db_data_timestamp()."""
+    _raise_on_error_responses(responses)
+    data = _RscpView(responses[0][2][0])
+    return {
+        "autarky": data.get(RscpTag.DB_AUTARKY),
+        "bat_power_in": data.get(RscpTag.DB_BAT_POWER_IN),
+        "bat_power_out": data.get(RscpTag.DB_BAT_POWER_OUT),
+        "consumed_production": data.get(RscpTag.DB_CONSUMED_PRODUCTION),
+        "consumption": data.get(RscpTag.DB_CONSUMPTION),
+        "grid_power_in": data.get(RscpTag.DB_GRID_POWER_IN),
+        "grid_power_out": data.get(RscpTag.DB_GRID_POWER_OUT),
+        "startTimestamp": timestamp,
+        "stateOfCharge": data.get(RscpTag.DB_BAT_CHARGE_LEVEL),
+        "solarProduction": data.get(RscpTag.DB_DC_POWER),
+        "pm0Production": data.get(RscpTag.DB_PM_0_POWER),
+        "pm1Production": data.get(RscpTag.DB_PM_1_POWER),
+        "timespanSeconds": timespan_seconds,
+    }
+
+
+def _parse_battery_probe(response: RscpMessage) -> int | None:
+    """Return the module count of a probed battery pack, None if there is none."""
+    if response[1] == RscpType.Error.name:
+        return None
+    dcb_count = _RscpView(response).get(RscpTag.BAT_DCB_COUNT)
+    return dcb_count if isinstance(dcb_count, int) else None
+
+
+def _parse_battery_dcb(req: RscpMessage) -> dict[str, Any] | None:
+    """Convert a battery module response into the structure of E3DC.get_battery_data()."""
+    data = _RscpView(req)
+    # For some devices, no info for the DCBs exists. Skip those.
+    if not data.is_valid(RscpTag.BAT_DCB_INFO):
+        return None
+    info = data.view(RscpTag.BAT_DCB_INFO)
+
+    sensor_count = 0
+    temperatures: list[float] = []
+    if data.is_valid(RscpTag.BAT_DCB_ALL_CELL_TEMPERATURES):
+        temperatures_data = data.view(RscpTag.BAT_DCB_ALL_CELL_TEMPERATURES).get(
+            RscpTag.BAT_DATA
+        )
+        sensor_count = info.get(RscpTag.BAT_DCB_NR_SENSOR)
+        # The sensor count may exceed the actual temperatures, use the smaller one.
+        for sensor in range(0, min(sensor_count, len(temperatures_data))):
+            temperatures.append(temperatures_data[sensor][2])
+
+    voltages: list[float] = []
+    if data.is_valid(RscpTag.BAT_DCB_ALL_CELL_VOLTAGES):
+        voltages_data = data.view(RscpTag.BAT_DCB_ALL_CELL_VOLTAGES).get(
+            RscpTag.BAT_DATA
+        )
+        voltages.extend(cell_voltage[2] for cell_voltage in voltages_data)
+
+    dcb: dict[str, Any] = {
+        key: info.get(tag) for key, tag in _BATTERY_DCB_FIELDS.items()
+    }
+    dcb["sensorCount"] = sensor_count
+    # pye3dc never fills in the series cell count, keep its structure.
+    dcb["seriesCellCount"] = 0
+    dcb["temperatures"] = temperatures
+    dcb["voltages"] = voltages
+    return dict(sorted(dcb.items()))
+
+
+def _parse_battery_data(
+    responses: list[RscpMessage], battery_index: int
+) -> dict[str, Any]:
+    """Convert the battery pack responses into the structure of E3DC.get_battery_data()."""
+    req, *dcb_responses = responses
+    _raise_on_error_responses([req])
+    data = _RscpView(req)
+
+    outObj: dict[str, Any] = {
+        key: data.get(tag) for key, tag in _BATTERY_FIELDS.items()
+    }
+    device_state = data.view(RscpTag.BAT_DEVICE_STATE)
+    outObj["deviceConnected"] = device_state.get(RscpTag.BAT_DEVICE_CONNECTED)
+    outObj["deviceInService"] = device_state.get(RscpTag.BAT_DEVICE_IN_SERVICE)
+    outObj["deviceWorking"] = device_state.get(RscpTag.BAT_DEVICE_WORKING)
+    outObj["index"] = battery_index
+
+    outObj["dcbs"] = {}
+    for dcb_index, dcb_response in enumerate(dcb_responses):
+        if dcb_response[1] == RscpType.Error.name:
+            continue
+        dcb = _parse_battery_dcb(dcb_response)
+        if dcb is not None:
+            outObj["dcbs"][dcb_index] = dcb
+
+    return dict(sorted(outObj.items()))
+
+
+@cache
+def _tag_request(tag: RscpTag) -> _EncodedRequest:
+    """Return a plain request for a single tag."""
+    return _RequestTemplate((tag, RscpType.NoneType, None)).build()
+
+
+def _value_request(tag: RscpTag, rscp_type: RscpType, value: Any) -> _EncodedRequest:
+    """Return a request for a single tag with a fixed size value."""
+    return _value_template(tag, rscp_type).build(value=value)
+
+
+@cache
+def _value_template(tag: RscpTag, rscp_type: RscpType) -> _RequestTemplate:
+    """Return the template of a single tag request with a value."""
+    return _RequestTemplate((tag, rscp_type, _Param("value")))
+
+
+_SGREADY_STATE_REQUEST: Final[_RequestTemplate] = _RequestTemplate(
+    (
+        RscpTag.SGR_REQ_DATA,
+        RscpType.Container,
+        [
+            (RscpTag.SGR_INDEX, RscpType.Uint16, 0),
+            (RscpTag.SGR_REQ_STATE, RscpType.NoneType, None),
+        ],
+    )
+)
+
+_POWERMETER_DATA_REQUEST: Final[_RequestTemplate] = _RequestTemplate(
+    (
+        RscpTag.PM_REQ_DATA,
+        RscpType.Container,
+        [
+            (RscpTag.PM_INDEX, RscpType.Uint16, _Param("index")),
+            (RscpTag.PM_REQ_POWER_L1, RscpType.NoneType, None),
+            (RscpTag.PM_REQ_POWER_L2, RscpType.NoneType, None),
+            (RscpTag.PM_REQ_POWER_L3, RscpType.NoneType, None),
+            (RscpTag.PM_REQ_ENERGY_L1, RscpType.NoneType, None),
+            (RscpTag.PM_REQ_ENERGY_L2, RscpType.NoneType, None),
+            (RscpTag.PM_REQ_ENERGY_L3, RscpType.NoneType, None),
+            (RscpTag.PM_REQ_TYPE, RscpType.NoneType, None),
+        ],
+    )
+)
+
+_WALLBOX_DATA_REQUEST: Final[_RequestTemplate] = _RequestTemplate(
+    (
+        RscpTag.WB_REQ_DATA,
+        RscpType.Container,
+        [
+            (RscpTag.WB_INDEX, RscpType.UChar8, _Param("index")),
+            (RscpTag.WB_REQ_EXTERN_DATA_ALG, RscpType.NoneType, None),
+            (RscpTag.WB_REQ_EXTERN_DATA_SUN, RscpType.NoneType, None),
+            (RscpTag.WB_REQ_EXTERN_DATA_NET, RscpType.NoneType, None),
+            (RscpTag.WB_REQ_APP_SOFTWARE, RscpType.NoneType, None),
+            (RscpTag.WB_REQ_KEY_STATE, RscpType.NoneType, None),
+        ],
+    )
+)
+
+# Size of the WB_EXTERN_DATA written to a wallbox, see E3DC.sendWallboxRequest().
+_WALLBOX_EXTERN_DATA_LEN: Final[int] = 6
+
+# The tags a wallbox confirms its set requests with.
+_WALLBOX_SET_RESPONSE_TAGS: Final[dict[RscpTag, RscpTag]] = {
+    RscpTag.WB_REQ_SET_EXTERN: RscpTag.WB_SET_EXTERN,
+    RscpTag.WB_REQ_SET_PARAM_1: RscpTag.WB_SET_PARAM_1,
+}
+
+
+@cache
+def _wallbox_set_template(
+    request: RscpTag, data_index: int, value: int
+) -> _RequestTemplate:
+    """Return the template of a wallbox set request, see E3DC.sendWallboxRequest().
+
+    The WB_EXTERN_DATA byte array has no fixed size and cannot be a parameter,
+    so there is a template per written byte, leaving the wallbox index open.
+    """
+    data = bytearray(_WALLBOX_EXTERN_DATA_LEN)
+    data[data_index] = value
+    return _RequestTemplate(
+        (
+            RscpTag.WB_REQ_DATA,
+            RscpType.Container,
+            [
+                (RscpTag.WB_INDEX, RscpType.UChar8, _Param("index")),
+                (
+                    request,
+                    RscpType.Container,
+                    [
+                        (RscpTag.WB_EXTERN_DATA, RscpType.ByteArray, bytes(data)),
+                        (RscpTag.WB_EXTERN_DATA_LEN, RscpType.UChar8, len(data)),
+                    ],
+                ),
+            ],
+        )
+    )
+
+
+_WALLBOX_IDENTIFICATION_REQUEST: Final[_RequestTemplate] = _RequestTemplate(
+    (
+        RscpTag.WB_REQ_DATA,
+        RscpType.Container,
+        [
+            (RscpTag.WB_INDEX, RscpType.UChar8, _Param("index")),
+            (RscpTag.WB_REQ_FIRMWARE_VERSION, RscpType.NoneType, None),
+            (RscpTag.WB_REQ_MAC_ADDRESS, RscpType.NoneType, None),
+            (RscpTag.WB_REQ_DEVICE_NAME, RscpType.NoneType, None),
+            (RscpTag.WB_REQ_SERIAL, RscpType.NoneType, None),
+            (RscpTag.WB_REQ_WALLBOX_TYPE, RscpType.NoneType, None),
+            (RscpTag.WB_REQ_LOWER_CURRENT_LIMIT, RscpType.NoneType, None),
+            (RscpTag.WB_REQ_UPPER_CURRENT_LIMIT, RscpType.NoneType, None),
+        ],
+    )
+)
+
+_BATTERY_PROBE_REQUEST: Final[_RequestTemplate] = _RequestTemplate(
+    (
+        RscpTag.BAT_REQ_DATA,
+        RscpType.Container,
+        [
+            (RscpTag.BAT_INDEX, RscpType.Uint16, _Param("index")),
+            (RscpTag.BAT_REQ_DCB_COUNT, RscpType.NoneType, None),
+        ],
+    )
+)
+
+_BATTERY_DATA_REQUEST: Final[_RequestTemplate] = _RequestTemplate(
+    (
+        RscpTag.BAT_REQ_DATA,
+        RscpType.Container,
+        [
+            (RscpTag.BAT_INDEX, RscpType.Uint16, _Param("index")),
+            *((tag, RscpType.NoneType, None) for tag in _BATTERY_REQUEST_TAGS),
+        ],
+    )
+)
+
+_BATTERY_DCB_DATA_REQUEST: Final[_RequestTemplate] = _RequestTemplate(
+    (
+        RscpTag.BAT_REQ_DATA,
+        RscpType.Container,
+        [
+            (RscpTag.BAT_INDEX, RscpType.Uint16, _Param("index")),
+            (RscpTag.BAT_REQ_DCB_ALL_CELL_TEMPERATURES, RscpType.Uint16, _Param("dcb")),
+            (RscpTag.BAT_REQ_DCB_ALL_CELL_VOLTAGES, RscpType.Uint16, _Param("dcb")),
+            (RscpTag.BAT_REQ_DCB_INFO, RscpType.Uint16, _Param("dcb")),
+        ],
+    )
+)
+
+_DB_DATA_REQUEST: Final[_RequestTemplate] = _RequestTemplate(
+    (
+        RscpTag.DB_REQ_HISTORY_DATA_DAY,
+        RscpType.Container,
+        [
+            (RscpTag.DB_REQ_HISTORY_TIME_START, RscpType.Uint64, _Param("start")),
+            (RscpTag.DB_REQ_HISTORY_TIME_INTERVAL, RscpType.Uint64, _Param("span")),
+            (RscpTag.DB_REQ_HISTORY_TIME_SPAN, RscpType.Uint64, _Param("span")),
+        ],
+    )
+)
+
+_SET_POWER_REQUEST: Final[_RequestTemplate] = _RequestTemplate(
+    (
+        RscpTag.EMS_REQ_SET_POWER,
+        RscpType.Container,
+        [
+            (RscpTag.EMS_REQ_SET_POWER_MODE, RscpType.UChar8, _Param("mode")),
+            (RscpTag.EMS_REQ_SET_POWER_VALUE, RscpType.Int32, _Param("value")),
+        ],
+    )
+)
+
+
+@cache
+def _power_settings_template(*settings: tuple[RscpTag, RscpType]) -> _RequestTemplate:
+    """Return the template setting the given power settings, in that order."""
+    return _RequestTemplate(
+        (
+            RscpTag.EMS_REQ_SET_POWER_SETTINGS,
+            RscpType.Container,
+            [(tag, rscp_type, _Param(tag.name)) for tag, rscp_type in settings],
+        )
+    )
+
+
+def _manual_charge_requests() -> list[_Request]:
+    """Build the requests for the manual charge state."""
+    return [_tag_request(RscpTag.EMS_REQ_GET_MANUAL_CHARGE)]
+
+
+def _sgready_state_requests() -> list[_Request]:
+    """Build the requests for the SG Ready state."""
+    return [_SGREADY_STATE_REQUEST.build()]
+
+
+def _powermeter_data_requests(powermeter_index: int) -> list[_Request]:
+    """Build the requests for the readings of a single powermeter."""
+    return [_POWERMETER_DATA_REQUEST.build(index=powermeter_index)]
+
+
+def _wallbox_ems_settings_requests() -> list[_Request]:
+    """Build the requests for the wallbox EMS settings."""
+    return [_tag_request(tag) for tag in _WALLBOX_EMS_REQUEST_TAGS]
+
+
+def _wallbox_data_requests(wallbox_index: int) -> list[_Request]:
+    """Build the requests for the readings of a single wallbox."""
+    return [
+        _WALLBOX_DATA_REQUEST.build(index=wallbox_index),
+        _tag_request(RscpTag.EMS_REQ_BATTERY_TO_CAR_MODE),
+    ]
+
+
+def _wallbox_identification_request(wallbox_index: int) -> _Request:
+    """Build the identification request of a single wallbox."""
+    return _WALLBOX_IDENTIFICATION_REQUEST.build(index=wallbox_index)
+
+
+def _battery_probe_request(battery_index: int) -> _Request:
+    """Build the request checking for a battery pack at the given index."""
+    return _BATTERY_PROBE_REQUEST.build(index=battery_index)
+
+
+def _battery_data_requests(battery_index: int, dcb_count: int) -> list[_Request]:
+    """Build the requests for the readings of a battery pack and its modules."""
+    return [
+        _BATTERY_DATA_REQUEST.build(index=battery_index),
+        *(
+            _BATTERY_DCB_DATA_REQUEST.build(index=battery_index, dcb=dcb)
+            for dcb in range(dcb_count)
+        ),
+    ]
+
+
+def _db_data_requests(timestamp: int, timespan_seconds: int) -> list[_Request]:
+    """Build the requests for the DB history of the given timespan."""
+    return [_DB_DATA_REQUEST.build(start=timestamp, span=timespan_seconds)]
+
+
+# Request builders and parsers of the poll groups without parameters.
+_POLL_GROUPS: Final[
+    dict[
+        PollGroup,
+        tuple[
+            Callable[[], list[_Request]],
+            Callable[[list[RscpMessage]], Any],
+        ],
+    ]
+] = {
+    PollGroup.POLL: (
+        lambda: [_tag_request(tag) for tag in _POLL_REQUEST_TAGS],
+        _parse_poll,
+    ),
+    PollGroup.POWER_MODE: (
+        lambda: [_tag_request(RscpTag.EMS_REQ_MODE)],
+        _parse_power_mode,
+    ),
+    PollGroup.SYSTEM_STATUS: (
+        lambda: [_tag_request(RscpTag.EMS_REQ_SYS_STATUS)],
+        _parse_system_status,
+    ),
+    PollGroup.POWER_SETTINGS: (
+        lambda: [_tag_request(RscpTag.EMS_REQ_GET_POWER_SETTINGS)],
+        _parse_power_settings,
+    ),
+    PollGroup.MANUAL_CHARGE: (_manual_charge_requests, _parse_manual_charge),
+    PollGroup.SGREADY_STATE: (_sgready_state_requests, _parse_sgready_state),
+    PollGroup.WALLBOX_EMS_SETTINGS: (
+        _wallbox_ems_settings_requests,
+        _parse_wallbox_ems_settings,
+    ),
+}
+
+
+@contextmanager
+def _map_e3dc_exceptions():
+    """Map pye3dc exceptions onto their Home Assistant counterparts."""
+    try:
+        yield
+    except NotAvailableError as ex:
+        _LOGGER.debug("E3DC is unavailable: %s", ex, exc_info=True)
+        raise HomeAssistantError("Communication Failure: E3DC not available") from ex
+    except SendError as ex:
+        _LOGGER.debug("Communication error with E3DC: %s", ex, exc_info=True)
+        raise HomeAssistantError("Communication Failure: Failed to send data") from ex
+    except AuthenticationError as ex:
+        _LOGGER.debug("Failed to authenticate with E3DC: %s", ex, exc_info=True)
+        raise ConfigEntryAuthFailed("Failed to authenticate with E3DC") from ex
+    except RSCPKeyError as ex:
+        _LOGGER.debug("Encryption error with E3DC, key invalid: %s", ex, exc_info=True)
+        raise ConfigEntryAuthFailed("Encryption Error with E3DC, key invalid") from ex
+    except (HomeAssistantError, ConfigEntryAuthFailed):
+        raise
+    except Exception as ex:
+        _LOGGER.debug("Fatal error when talking to E3DC: %s", ex, exc_info=True)
+        raise HomeAssistantError("Fatal error when talking to E3DC") from ex
+
+
+@contextmanager
+def _record_call(proxy: Any, operation: str):
+    """Record duration, lock wait and outcome of a proxy call."""
+    statistics: E3DCCallStatistics | None = getattr(proxy, "call_statistics", None)
+    call = _CallContext(operation)
+    parent = _current_call.get()
+    token = _current_call.set(call)
+    started = monotonic()
+    error: BaseException | None = None
+    try:
+        yield
+    except Exception as ex:
+        # Count the pye3dc exception rather than the mapped one.
+        error = ex.__cause__ or ex
+        raise
+    finally:
+        _current_call.reset(token)
+        if parent is not None:
+            parent.lock_wait += call.lock_wait
+        if statistics is not None:
+            statistics.record_call(
+                operation, monotonic() - started, call.lock_wait, error
+            )
+
+
+def e3dc_call(func=None, *, priority: RequestPriority = RequestPriority.READ):
+    """Wrap e3dc call in boilerplate exception handling and call statistics.
+
+    Calls controlling E3DC use @e3dc_call(priority=RequestPriority.CONTROL), so
+    that their requests are sent ahead of queued reads.
+    """
+    if func is None:
+        return partial(e3dc_call, priority=priority)
+
+    if inspect.iscoroutinefunction(func):
 
+        @wraps(func)
+        async def async_wrapper_handle_e3dc_ex(*args, **kwargs) -> Any:
+            """Send a call to E3DC and do general exception handling."""
+            with (
+                _record_call(args[0], func.__name__),
+                _request_priority(priority),
+                _map_e3dc_exceptions(),
+            ):
+                return await func(*args, **kwargs)
 
-def e3dc_call(func):
-    """Wrap e3dc call in boilerplate exception handling."""
+        return async_wrapper_handle_e3dc_ex
 
     @wraps(func)
     def wrapper_handle_e3dc_ex(*args, **kwargs) -> Any:
         """Send a call to E3DC asynchronusly and do general exception handling."""
-        try:
+        with (
+            _record_call(args[0], func.__name__),
+            _request_priority(priority),
+            _map_e3dc_exceptions(),
+        ):
             return func(*args, **kwargs)
-        except NotAvailableError as ex:
-            _LOGGER.debug("E3DC is unavailable: %s", ex, exc_info=True)
-            raise HomeAssistantError(
-                "Communication Failure: E3DC not available"
-            ) from ex
-        except SendError as ex:
-            _LOGGER.debug("Communication error with E3DC: %s", ex, exc_info=True)
-            raise HomeAssistantError(
-                "Communication Failure: Failed to send data"
-            ) from ex
-        except AuthenticationError as ex:
-            _LOGGER.debug("Failed to authenticate with E3DC: %s", ex, exc_info=True)
-            raise ConfigEntryAuthFailed("Failed to authenticate with E3DC") from ex
-        except RSCPKeyError as ex:
-            _LOGGER.debug(
-                "Encryption error with E3DC, key invalid: %s", ex, exc_info=True
-            )
-            raise ConfigEntryAuthFailed(
-                "Encryption Error with E3DC, key invalid"
-            ) from ex
-        except (HomeAssistantError, ConfigEntryAuthFailed):
-            raise
-        except Exception as ex:
-            _LOGGER.debug("Fatal error when talking to E3DC: %s", ex, exc_info=True)
-            raise HomeAssistantError("Fatal error when talking to E3DC") from ex
 
     return wrapper_handle_e3dc_ex
 
@@ -79,9 +2134,16 @@ class E3DCProxy:
     """Proxies requests to pye3dc, takes care of error and async handling."""
 
     def __init__(
-        self, _hass: HomeAssistant, _config: ConfigEntry | dict[str, str | int]
+        self,
+        _hass: HomeAssistant,
+        _config: ConfigEntry | dict[str, str | int],
+        transport: E3DCTransport | None = None,
     ):
-        """Initialize E3DC Proxy and connect."""
+        """Initialize E3DC Proxy and connect.
+
+        A transport may be given to talk to something else than the configured
+        E3DC, like an E3DCReplayTransport.
+        """
         # TODO: move to readonly properties
         self.e3dc: E3DC = None
         self.e3dc_config: dict[str, Any] = {}
@@ -106,6 +2168,82 @@ class E3DCProxy:
             self._rscpkey = _config[CONF_RSCPKEY]
             self._port = _config.get(CONF_PORT, RSCP_PORT)
 
+        self._sw_version: str | None = None
+        self._battery_layout: list[dict[str, int]] | None = None
+        self._battery_layout_connection_id: int = 0
+
+        self._transport: E3DCTransport = transport or E3DCTransport(
+            self._host,
+            self._port or RSCP_PORT,
+            self._username,
+            self._password,
+            self._rscpkey,
+        )
+        self._executor: E3DCExecutor = E3DCExecutor(self._host)
+
+    @property
+    def connection_state(self) -> ConnectionState:
+        """Return the health of the connection to E3DC."""
+        return self._transport.supervisor.state
+
+    @property
+    def connection_available(self) -> bool:
+        """Return False while the connection to E3DC is considered lost."""
+        return self._transport.supervisor.available
+
+    def get_connection_status(self) -> dict[str, Any]:
+        """Return the connection supervisor state and request queue for diagnostics."""
+        return {
+            **self._transport.supervisor.get_status(),
+            "queued": self._transport.get_queue_status(),
+            "executor": self._executor.get_status(),
+            "cipher": "numpy" if numpy_available() else "python",
+            "connections": self._transport.connection_id,
+            "reconnects": self._transport.reconnects,
+        }
+
+    @property
+    def reconnects(self) -> int:
+        """Return how often the connection to E3DC had to be established again."""
+        return self._transport.reconnects
+
+    async def async_close(self):
+        """Close the connection to E3DC, once the proxy is no longer used."""
+        await self._transport.async_close()
+
+    async def async_add_executor_job(self, target: Callable[..., Any], *args: Any):
+        """Run a blocking proxy method on the executor of this E3DC."""
+        return await self._executor.async_run(target, *args)
+
+    def shutdown_executor(self):
+        """Stop the executor of this E3DC, once the proxy is no longer used."""
+        self._executor.shutdown()
+
+    @property
+    def call_statistics(self) -> E3DCCallStatistics:
+        """Return the latency and error statistics of all proxy calls."""
+        return self._transport.statistics
+
+    async def async_start_capture(self, path: str, include_payloads: bool = False):
+        """Capture all following RSCP exchanges into the given file."""
+        await self.async_stop_capture()
+        capture = E3DCTrafficCapture(path, include_payloads)
+        await capture.async_open()
+        self._transport.capture = capture
+
+    async def async_stop_capture(self):
+        """Stop a running capture, if any."""
+        capture = self._transport.capture
+        if capture is None:
+            return
+        self._transport.capture = None
+        await capture.async_close()
+
+    def get_capture_status(self) -> dict[str, Any] | None:
+        """Return the state of a running capture for diagnostics."""
+        capture = self._transport.capture
+        return None if capture is None else capture.get_status()
+
     @e3dc_call
     def connect(self, config: dict[str, Any] | None = None):
         """Connect to E3DC with an optional device setup."""
@@ -113,6 +2251,7 @@ class E3DCProxy:
             config = {}
 
         self.e3dc = ThreadSafeE3DC(
+            _TransportBridge(self._hass, self._transport),
             E3DC.CONNECT_LOCAL,
             username=self._username,
             password=self._password,
@@ -124,6 +2263,17 @@ class E3DCProxy:
 
         self.e3dc_config = config
 
+    def configure(self, config: dict[str, Any]):
+        """Change the device setup of a connected E3DC, keeping its connection.
+
+        Takes the same configuration as connect(), but does not set up pye3dc
+        again, which would reload the static system info.
+        """
+        for key in ("pvis", "powermeters", "batteries"):
+            if isinstance(config.get(key), list):
+                setattr(self.e3dc, key, config[key])
+        self.e3dc_config = config
+
     @e3dc_call
     def disconnect(self):
         """Disconnect from E3DC if connected."""
@@ -133,179 +2283,132 @@ class E3DCProxy:
             self.e3dc.disconnect()
         self.e3dc = None
 
-    @e3dc_call
-    def get_db_data(self, timestamp: int, timespan_seconds: int) -> dict[str, Any]:
-        """Return the statics data for the specified timespan."""
-        return self.e3dc.get_db_data_timestamp(timestamp, timespan_seconds, True)
-
-    @e3dc_call
-    def get_manual_charge(self) -> dict[str, Any]:
-        """Poll manual charging state."""
-        data = self.e3dc.sendRequest(
-            (RscpTag.EMS_REQ_GET_MANUAL_CHARGE, RscpType.NoneType, None),
-            keepAlive=True,
-        )
-
-        result: dict[str, Any] = {}
-        result["active"] = rscpFindTag(data, RscpTag.EMS_MANUAL_CHARGE_ACTIVE)[2]
-
-        # These seem to be kAh per individual cell, so this is considered very strange.
-        # To get this working for a start, we assume 3,65 V per cell, taking my own unit
-        # as a base, but this obviously will need some real work to base this on
-        # current voltages.
-        # Round to Watts, this should prevent negative values in the magnitude of 10^-6,
-        # which are probably floating point errors.
-        tmp = rscpFindTag(data, RscpTag.EMS_MANUAL_CHARGE_ENERGY_COUNTER)[2]
-        powerfactor = 3.65
-        result["energy"] = round(tmp * powerfactor, 3)
-
-        # The timestamp seem to correctly show the UTC Date when manual charging started
-        # Not yet enabled, just for reference.
-        # self._mydata["manual-charge-start"] = rscpFindTag(
-        #     request_data, "EMS_MANUAL_CHARGE_LASTSTART"
-        # )[2]
-
-        return result
-
-    @e3dc_call
-    def get_power_settings(self) -> dict[str, Any]:
-        """Retrieve current power settings."""
-        return self.e3dc.get_power_settings(keepAlive=True)
-
-    @e3dc_call
-    def get_system_status(self) -> dict[str, Any]:
-        """Load E3DC system status flags."""
-        return self.e3dc.get_system_status(keepAlive=True)
-
     @e3dc_call
     def get_powermeters(self) -> dict[str, Any]:
         """Load available powermeters from E3DC."""
         return self.e3dc.get_powermeters(keepAlive=True)
 
     @e3dc_call
-    def get_wallbox_ems_settings(self) -> dict[str, Any]:
+    async def async_get_wallbox_ems_settings(self) -> dict[str, Any]:
         """Load wallbox EMS settings."""
-        beforeCarMode: int = self.e3dc.sendRequestTag(
-            RscpTag.EMS_REQ_BATTERY_BEFORE_CAR_MODE, keepAlive=True
-        )
-        batToCarMode: int = self.e3dc.sendRequestTag(
-            RscpTag.EMS_REQ_BATTERY_TO_CAR_MODE, keepAlive=True
-        )
-        batWBDischargeLimit: int = self.e3dc.sendRequestTag(
-            RscpTag.EMS_REQ_GET_WB_DISCHARGE_BAT_UNTIL, keepAlive=True
-        )
-        wbEnforcePowerAssignment: bool = self.e3dc.sendRequestTag(
-            RscpTag.EMS_REQ_GET_WALLBOX_ENFORCE_POWER_ASSIGNMENT, keepAlive=True
+        return _parse_wallbox_ems_settings(
+            await self._transport.async_send_requests(_wallbox_ems_settings_requests())
         )
 
-        # sendRequestTag may return None if the response could not be parsed,
-        # treat this as an error instead of silently reporting wrong states.
-        if beforeCarMode is None or batToCarMode is None:
+    @e3dc_call
+    async def async_get_wallbox_identification_data(
+        self, wallbox_indexes: Collection[int]
+    ) -> dict[int, dict[str, Any] | HomeAssistantError]:
+        """Get identification data for the wallboxes with the given indexes.
+
+        All wallboxes are probed within a single RSCP frame. Every index is
+        parsed on its own, an index E3DC could not answer is returned as a
+        HomeAssistantError instead of its data, so that it does not hide the
+        other ones. Failures of the whole exchange raise as usual.
+        """
+        wallbox_indexes = list(wallbox_indexes)
+        if len(wallbox_indexes) == 0:
+            return {}
+
+        responses = await self._transport.async_send_requests(
+            [
+                _wallbox_identification_request(wallbox_index)
+                for wallbox_index in wallbox_indexes
+            ]
+        )
+        if len(responses) != len(wallbox_indexes):
             raise HomeAssistantError(
-                "Failed to load wallbox EMS settings, got no data from E3DC"
+                f"E3DC answered {len(responses)} of {len(wallbox_indexes)} wallbox probes"
             )
 
-        result: dict[str, Any] = {}
-        result["battery-before-car-mode"] = beforeCarMode != 0
-        result["battery-to-car-mode"] = batToCarMode != 0
-        result["battery-wallbox-discharge-limit"] = batWBDischargeLimit
-        result["wallbox-enforce-power-assignment"] = bool(wbEnforcePowerAssignment)
-        return result
+        result: dict[int, dict[str, Any] | HomeAssistantError] = {}
+        for wallbox_index, response in zip(wallbox_indexes, responses, strict=True):
+            try:
+                result[wallbox_index] = _parse_wallbox_identification(response)
+            except HomeAssistantError as ex:
+                result[wallbox_index] = ex
+            except Exception as ex:  # noqa: BLE001
+                _LOGGER.debug(
+                    "Failed to parse identification of wallbox %s: %s",
+                    wallbox_index,
+                    ex,
+                    exc_info=True,
+                )
+                result[wallbox_index] = HomeAssistantError(
+                    f"Failed to parse identification of wallbox {wallbox_index}"
+                )
 
-    @e3dc_call
-    def get_wallbox_data(self, wallbox_index: int) -> dict[str, Any]:
-        """Poll current wallbox readings."""
-        return self.e3dc.get_wallbox_data(wbIndex=wallbox_index, keepAlive=True)
+        return result
 
     @e3dc_call
-    def get_wallbox_identification_data(self, wallbox_index: int) -> dict[str, Any]:
-        """Get identification data for wallbox with given index."""
-        req = self.e3dc.sendRequest(
-            (
-                "WB_REQ_DATA",
-                "Container",
-                [
-                    ("WB_INDEX", "UChar8", wallbox_index),
-                    ("WB_REQ_FIRMWARE_VERSION", "None", None),
-                    ("WB_REQ_MAC_ADDRESS", "None", None),
-                    ("WB_REQ_DEVICE_NAME", "None", None),
-                    ("WB_REQ_SERIAL", "None", None),
-                    ("WB_REQ_WALLBOX_TYPE", "None", None),
-                    ("WB_REQ_LOWER_CURRENT_LIMIT", "None", None),
-                    ("WB_REQ_UPPER_CURRENT_LIMIT", "None", None),
-                ],
-            ),
-            keepAlive=True,
-        )
+    async def async_get_batteries(self) -> list[dict[str, Any]]:
+        """Return the installed battery packs and their module counts.
 
-        outObj = {
-            "index": rscpFindTagIndex(req, "WB_INDEX"),
-        }
-
-        firmware_version = rscpFindTag(req, "WB_FIRMWARE_VERSION")
-        if firmware_version is not None:
-            outObj["firmwareVersion"] = rscpFindTagIndex(
-                firmware_version, "WB_FIRMWARE_VERSION"
+        All pack indexes are probed within a single RSCP frame. The layout is
+        cached until E3DC reconnects or reports another software version, as
+        it does not change at runtime.
+        """
+        if (
+            self._battery_layout is None
+            or not self._transport.connected
+            or self._battery_layout_connection_id != self._transport.connection_id
+        ):
+            responses = await self._transport.async_send_requests(
+                [_battery_probe_request(index) for index in range(_MAX_BATTERIES)]
             )
+            layout: list[dict[str, int]] = []
+            for battery_index, response in enumerate(responses):
+                dcb_count = _parse_battery_probe(response)
+                if dcb_count is not None:
+                    layout.append({"index": battery_index, "dcbs": dcb_count})
+            self._battery_layout = layout
+            self._battery_layout_connection_id = self._transport.connection_id
+
+        return [dict(battery) for battery in self._battery_layout]
+
+    @e3dc_call(priority=RequestPriority.BACKGROUND)
+    async def async_get_battery_data(self) -> list[dict[str, Any]]:
+        """Return sensor data for all installed battery packs.
+
+        The data of all packs and their modules is requested within a single
+        RSCP frame, based on the cached battery layout.
+        """
+        batteries = await self.async_get_batteries()
+        if len(batteries) == 0:
+            return []
 
-        device_name = rscpFindTag(req, "WB_DEVICE_NAME")
-        if device_name is not None:
-            outObj["deviceName"] = rscpFindTagIndex(device_name, "WB_DEVICE_NAME")
-
-        wallbox_serial = rscpFindTag(req, "WB_SERIAL")
-        if wallbox_serial is not None:
-            outObj["wallboxSerial"] = rscpFindTagIndex(wallbox_serial, "WB_SERIAL")
-
-        mac_address = rscpFindTag(req, "WB_MAC_ADDRESS")
-        if mac_address is not None:
-            outObj["macAddress"] = rscpFindTagIndex(mac_address, "WB_MAC_ADDRESS")
-
-        wallbox_type = rscpFindTag(req, "WB_WALLBOX_TYPE")
-        if wallbox_type is not None:
-            outObj["wallboxType"] = rscpFindTagIndex(wallbox_type, "WB_WALLBOX_TYPE")
-
-        lower_current_limit = rscpFindTag(req, "WB_LOWER_CURRENT_LIMIT")
-        if lower_current_limit is not None:
-            outObj["lowerCurrentLimit"] = rscpFindTagIndex(
-                lower_current_limit, "WB_LOWER_CURRENT_LIMIT"
+        plan = [
+            (battery, _battery_data_requests(battery["index"], battery["dcbs"]))
+            for battery in batteries
+        ]
+        responses = await self._transport.async_send_requests(
+            [request for _, requests in plan for request in requests]
+        )
+        expected = sum(len(requests) for _, requests in plan)
+        if len(responses) != expected:
+            raise HomeAssistantError(
+                f"E3DC answered {len(responses)} of {expected} battery requests"
             )
 
-        upper_current_limit = rscpFindTag(req, "WB_UPPER_CURRENT_LIMIT")
-        if upper_current_limit is not None:
-            outObj["upperCurrentLimit"] = rscpFindTagIndex(
-                upper_current_limit, "WB_UPPER_CURRENT_LIMIT"
+        battery_data_list: list[dict[str, Any]] = []
+        offset = 0
+        for battery, requests in plan:
+            pack_data = _parse_battery_data(
+                responses[offset : offset + len(requests)], battery["index"]
             )
-
-        return outObj
-
-    @e3dc_call
-    def get_batteries(self) -> list[dict[str, Any]]:
-        """Return general information about installed batteries."""
-        return self.e3dc.get_batteries()
-
-    @e3dc_call
-    def get_battery_data(self) -> list[dict[str, Any]]:
-        """Return sensor data for all installed battery packs."""
-        # Get battery configuration to determine how many packs exist
-        batteries_config = self.e3dc.get_batteries()
-
-        if not isinstance(batteries_config, list) or len(batteries_config) == 0:
-            # No batteries configured, return empty list
-            return []
-
-        # Fetch data for each battery pack
-        battery_data_list = []
-        for battery_config in batteries_config:
-            pack_index = battery_config.get("index", 0)
-            pack_data = self.e3dc.get_battery_data(batIndex=pack_index)
+            offset += len(requests)
+            if pack_data["dcbCount"] != battery["dcbs"]:
+                _LOGGER.debug(
+                    "Module count of battery pack %s changed, rescanning batteries",
+                    battery["index"],
+                )
+                self._battery_layout = None
             battery_data_list.append(pack_data)
 
         return battery_data_list
 
-    @e3dc_call
-    def get_powermeters_data(self) -> dict[str, Any]:
-        """Poll all powermeters for their current readings."""
-        data = self.e3dc.get_powermeters_data(keepAlive=True)
+    def _aggregate_powermeters_data(self, data: list[dict[str, Any]]) -> dict[str, Any]:
+        """Aggregate the readings of the configured powermeters."""
         result: dict[str, Any] = {}
 
         # Process and aggregate the data for each found powermeter
@@ -337,361 +2440,508 @@ class E3DCProxy:
         return result
 
     @e3dc_call
-    def get_software_version(self) -> str:
+    async def async_get_software_version(self) -> str:
         """Return the current software version of the E3DC."""
-        return self.e3dc.sendRequestTag(RscpTag.INFO_REQ_SW_RELEASE, keepAlive=True)
+        sw_version: str = await self._async_send_request_tag(
+            RscpTag.INFO_REQ_SW_RELEASE
+        )
+        if sw_version != self._sw_version:
+            # A software update may change the installed hardware as well.
+            self._battery_layout = None
+            self._sw_version = sw_version
+        return sw_version
 
     @e3dc_call
-    def get_sgready_state(self) -> dict[str, Any]:
+    async def async_get_sgready_state(self) -> dict[str, Any]:
         """Return the current SG Ready state of the E3DC."""
-
-        result_data = self.e3dc.sendRequest(
-            (
-                "SGR_REQ_DATA",
-                "Container",
-                [
-                    ("SGR_INDEX", RscpType.Uint16, 0),
-                    ("SGR_REQ_STATE", RscpType.NoneType, None),
-                ],
-            ),
-            keepAlive=True,
+        return _parse_sgready_state(
+            await self._transport.async_send_requests(_sgready_state_requests())
         )
-        result: dict[str, Any] = {}
-        result["sgready-active"] = rscpFindTag(result_data, RscpTag.SGR_AKTIV)[2]
-        sgready_state = rscpFindTag(result_data, RscpTag.SGR_STATE)[2]
-        result["sgready-state"] = sgready_state
-        result["sgready-numeric-state"] = sgready_state
-
-        return result
 
     @e3dc_call
-    def get_time(self) -> int:
+    async def async_get_time(self) -> int:
         """Get current local timestamp."""
-        return self.e3dc.sendRequestTag(RscpTag.INFO_REQ_TIME, keepAlive=True)
+        return await self._async_send_request_tag(RscpTag.INFO_REQ_TIME)
 
     @e3dc_call
-    def get_timeutc(self) -> int:
+    async def async_get_timeutc(self) -> int:
         """Get current local timestamp."""
-        return self.e3dc.sendRequestTag(RscpTag.INFO_REQ_UTC_TIME, keepAlive=True)
+        return await self._async_send_request_tag(RscpTag.INFO_REQ_UTC_TIME)
 
     @e3dc_call
-    def get_timezone(self) -> str:
+    async def async_get_timezone(self) -> str:
         """Load the E3DC Timezone."""
-        return self.e3dc.sendRequestTag(RscpTag.INFO_REQ_TIME_ZONE, keepAlive=True)
+        return await self._async_send_request_tag(RscpTag.INFO_REQ_TIME_ZONE)
 
     @e3dc_call
-    def poll(self) -> dict[str, Any]:
-        """Poll E3DC current state."""
-        result: dict[str, Any] = self.e3dc.poll(keepAlive=True)
+    async def async_poll_batch(
+        self,
+        groups: Collection[PollGroup],
+        wallbox_indexes: Collection[int] = (),
+        db_timestamp: int | None = None,
+        db_timespan_seconds: int = 0,
+    ) -> dict[PollGroup, Any]:
+        """Poll the given data groups within a single RSCP frame.
+
+        Every group is parsed on its own, a group E3DC could not answer is
+        returned as a HomeAssistantError instead of its data, so that it does
+        not affect the rest of the cycle. Wallbox data is returned per wallbox
+        index in the same way. Failures of the whole exchange raise as usual.
+        """
+        plan = self._plan_poll_batch(
+            groups, wallbox_indexes, db_timestamp, db_timespan_seconds
+        )
+        if len(plan) == 0:
+            return {}
+
+        responses = await self._transport.async_send_requests(
+            [request for _, _, requests, _ in plan for request in requests]
+        )
+        expected = sum(len(requests) for _, _, requests, _ in plan)
+        if len(responses) != expected:
+            raise HomeAssistantError(
+                f"E3DC answered {len(responses)} of {expected} batched requests"
+            )
+
+        result: dict[PollGroup, Any] = {}
+        powermeters: list[dict[str, Any]] = []
+        offset = 0
+        for group, index, requests, parser in plan:
+            group_responses = responses[offset : offset + len(requests)]
+            offset += len(requests)
+            try:
+                data = parser(group_responses)
+            except HomeAssistantError as ex:
+                data = ex
+            except Exception as ex:  # noqa: BLE001
+                _LOGGER.debug(
+                    "Failed to parse batched %s data: %s", group, ex, exc_info=True
+                )
+                data = HomeAssistantError(f"Failed to parse {group} data")
+
+            if group == PollGroup.WALLBOX_DATA:
+                result.setdefault(group, {})[index] = data
+            elif group == PollGroup.POWERMETERS_DATA:
+                # A single failing powermeter fails the whole aggregate.
+                if isinstance(data, HomeAssistantError):
+                    result[group] = data
+                elif not isinstance(result.get(group), HomeAssistantError):
+                    powermeters.append(data)
+                    result[group] = powermeters
+            else:
+                result[group] = data
+
+        if isinstance(result.get(PollGroup.POWERMETERS_DATA), list):
+            result[PollGroup.POWERMETERS_DATA] = self._aggregate_powermeters_data(
+                powermeters
+            )
 
         return result
 
-    @e3dc_call
-    def start_manual_charge(self, charge_amount_wh: int) -> None:
+    def _plan_poll_batch(
+        self,
+        groups: Collection[PollGroup],
+        wallbox_indexes: Collection[int],
+        db_timestamp: int | None,
+        db_timespan_seconds: int,
+    ) -> list[
+        tuple[
+            PollGroup,
+            int | None,
+            list[_Request],
+            Callable[[list[RscpMessage]], Any],
+        ]
+    ]:
+        """Build requests and parsers for each group of a batched poll."""
+        plan = []
+        for group in groups:
+            if group == PollGroup.POWERMETERS_DATA:
+                plan.extend(
+                    (
+                        group,
+                        powermeter["index"],
+                        _powermeter_data_requests(powermeter["index"]),
+                        _parse_powermeter_data,
+                    )
+                    for powermeter in self.e3dc.powermeters
+                )
+            elif group == PollGroup.WALLBOX_DATA:
+                plan.extend(
+                    (
+                        group,
+                        wallbox_index,
+                        _wallbox_data_requests(wallbox_index),
+                        _parse_wallbox_data,
+                    )
+                    for wallbox_index in wallbox_indexes
+                )
+            elif group == PollGroup.DB_DATA_TODAY:
+                if db_timestamp is not None and db_timespan_seconds > 0:
+                    plan.append(
+                        (
+                            group,
+                            None,
+                            _db_data_requests(db_timestamp, db_timespan_seconds),
+                            partial(
+                                _parse_db_data,
+                                timestamp=db_timestamp,
+                                timespan_seconds=db_timespan_seconds,
+                            ),
+                        )
+                    )
+            else:
+                requests, parser = _POLL_GROUPS[group]
+                plan.append((group, None, requests(), parser))
+        return plan
+
+    @e3dc_call(priority=RequestPriority.CONTROL)
+    async def async_start_manual_charge(self, charge_amount_wh: int) -> None:
         """Initiate the manual charging process, zero will stop charging."""
-        result_data = self.e3dc.sendRequest(
-            (RscpTag.EMS_REQ_START_MANUAL_CHARGE, RscpType.Uint32, charge_amount_wh),
-            keepAlive=True,
+        result_data = await self._transport.async_send_request(
+            _value_request(
+                RscpTag.EMS_REQ_START_MANUAL_CHARGE, RscpType.Uint32, charge_amount_wh
+            )
         )
         result: bool = result_data[2]
 
         if not result:
             _LOGGER.warning("Manual charging could not be activated")
 
-    @e3dc_call
-    def set_wallbox_sun_mode(self, enabled: bool, wallbox_index: int):
+    @e3dc_call(priority=RequestPriority.CONTROL)
+    async def async_set_wallbox_sun_mode(
+        self, enabled: bool, wallbox_index: int
+    ) -> dict[str, Any] | None:
         """Set wallbox charging mode to sun mode on/off.
 
-        Args:
-            enabled(bool): the desired state True = sun mode enabled, False = sun mode disabled
-            wallbox_index (Optional[int]): index of the requested wallbox,
-
-        Returns:
-            nothing
-
+        Returns the read back data of the wallbox.
         """
-        result: bool = self.e3dc.set_wallbox_sunmode(
-            enable=enabled, wbIndex=wallbox_index, keepAlive=True
+        return await self._async_send_wallbox_write(
+            wallbox_index, RscpTag.WB_REQ_SET_EXTERN, 0, 1 if enabled else 2, "sun mode"
         )
-        if not result:
-            raise HomeAssistantError("Failed to set wallbox to sun mode %s", enabled)
 
-    @e3dc_call
-    def set_wallbox_schuko(self, enabled: bool, wallbox_index: int):
+    @e3dc_call(priority=RequestPriority.CONTROL)
+    async def async_set_wallbox_schuko(
+        self, enabled: bool, wallbox_index: int
+    ) -> dict[str, Any] | None:
         """Set wallbox power outlet (schuko) to on/off.
 
-        Args:
-            enabled(bool): the desired state True = on, False = off
-            wallbox_index (Optional[int]): index of the requested wallbox,
-
-        Returns:
-            nothing
-
+        Returns the read back data of the wallbox.
         """
-        result: bool = self.e3dc.set_wallbox_schuko(
-            enable=enabled, wbIndex=wallbox_index, keepAlive=True
+        return await self._async_send_wallbox_write(
+            wallbox_index, RscpTag.WB_REQ_SET_EXTERN, 5, 1 if enabled else 0, "schuko"
         )
-        if not result:
-            raise HomeAssistantError("Failed to set wallbox schuko to %s", enabled)
-
-    @e3dc_call
-    def toggle_wallbox_charging(self, wallbox_index: int):
-        """Toggle charging of the wallbox.
 
-        Args:
-            wallbox_index (Optional[int]): index of the requested wallbox,
-
-        Returns:
-            nothing
-
-        """
-        result: bool = self.e3dc.toggle_wallbox_charging(
-            wbIndex=wallbox_index, keepAlive=True
+    @e3dc_call(priority=RequestPriority.CONTROL)
+    async def async_toggle_wallbox_charging(
+        self, wallbox_index: int
+    ) -> dict[str, Any] | None:
+        """Toggle charging of the wallbox, returns its read back data."""
+        return await self._async_send_wallbox_write(
+            wallbox_index, RscpTag.WB_REQ_SET_EXTERN, 4, 1, "charging"
         )
-        if not result:
-            raise HomeAssistantError("Failed to toggle wallbox charging")
 
-    @e3dc_call
-    def toggle_wallbox_phases(self, wallbox_index: int):
+    @e3dc_call(priority=RequestPriority.CONTROL)
+    async def async_toggle_wallbox_phases(
+        self, wallbox_index: int
+    ) -> dict[str, Any] | None:
         """Toggle the phases of wallbox charging between 1 and 3 phases.
 
-           Only works if "Phasen" in the portal/device is not set to Auto.
-
-        Args:
-            wallbox_index (Optional[int]): index of the requested wallbox,
-
-        Returns:
-            nothing
-
+        Only works if "Phasen" in the portal/device is not set to Auto. Returns
+        the read back data of the wallbox.
         """
-        result: bool = self.e3dc.toggle_wallbox_phases(
-            wbIndex=wallbox_index, keepAlive=True
+        return await self._async_send_wallbox_write(
+            wallbox_index, RscpTag.WB_REQ_SET_EXTERN, 3, 1, "phases"
         )
-        if not result:
-            raise HomeAssistantError("Failed to toggle wallbox phases")
 
-    @e3dc_call
-    def set_wallbox_max_charge_current(
+    @e3dc_call(priority=RequestPriority.CONTROL)
+    async def async_set_wallbox_max_charge_current(
         self, max_charge_current: int, wallbox_index: int
-    ) -> bool:
-        """Set the maximum charge current of the wallbox via RSCP protocol locally.
-
-        Args:
-            max_charge_current (int): maximum allowed charge current in A
-            wallbox_index (Optional[int]): index of the requested wallbox
-
-        Returns:
-            True if success (wallbox has understood the request, but might have clipped the value)
-            False if error
+    ) -> dict[str, Any] | None:
+        """Set the maximum charge current of the wallbox in A.
 
+        The wallbox might clip the value, the returned read back data of the
+        wallbox tells the current it applied.
         """
         _LOGGER.debug(
             "Wallbox %s: Setting max_charge_current to %s",
             wallbox_index,
             max_charge_current,
         )
-
-        return self.e3dc.set_wallbox_max_charge_current(
-            max_charge_current=max_charge_current, wbIndex=wallbox_index, keepAlive=True
+        return await self._async_send_wallbox_write(
+            wallbox_index,
+            RscpTag.WB_REQ_SET_PARAM_1,
+            2,
+            max_charge_current,
+            "max charge current",
         )
 
-    @e3dc_call
-    def set_battery_before_car_mode(self, mode: bool) -> bool:
-        """Set the battery before car mode."""
+    @e3dc_call(priority=RequestPriority.CONTROL)
+    async def async_set_battery_before_car_mode(
+        self, mode: bool
+    ) -> dict[str, Any] | None:
+        """Set the battery before car mode, returns the read back EMS wallbox settings."""
         _LOGGER.debug("Setting battery before car mode to %s", mode)
         if mode:
             _LOGGER.debug(
                 "Charging priority is battery, so we need to disable battery to car mode."
             )
-            battocar = self.set_battery_to_car_mode(False)
+            battocar = _parse_car_mode_result(
+                await self._transport.async_send_request(
+                    _value_request(
+                        RscpTag.EMS_REQ_SET_BATTERY_TO_CAR_MODE, RscpType.UChar8, 0
+                    )
+                ),
+                "battery to car mode",
+            )
             if battocar is True:
                 raise HomeAssistantError(
                     "Failed to disable battery to car mode: Cannot set battery before car mode"
                 )
 
-        result = self.e3dc.sendRequest(
-            (
-                RscpTag.EMS_REQ_SET_BATTERY_BEFORE_CAR_MODE,
-                RscpType.UChar8,
-                1 if mode else 0,
-            ),
-            keepAlive=True,
+        responses, readback = await self._async_send_write(
+            [
+                _value_request(
+                    RscpTag.EMS_REQ_SET_BATTERY_BEFORE_CAR_MODE,
+                    RscpType.UChar8,
+                    1 if mode else 0,
+                )
+            ],
+            PollGroup.WALLBOX_EMS_SETTINGS,
         )
-        if result[2] == 255:
-            raise HomeAssistantError(
-                "Failed to set battery before car mode, invalid operation."
-            )
-        return False if result[2] == 0 else True
+        _parse_car_mode_result(responses[0], "battery before car mode")
+        return readback
 
-    @e3dc_call
-    def set_battery_to_car_mode(self, mode: bool) -> bool:
-        """Set the battery to car mode."""
+    @e3dc_call(priority=RequestPriority.CONTROL)
+    async def async_set_battery_to_car_mode(self, mode: bool) -> dict[str, Any] | None:
+        """Set the battery to car mode, returns the read back EMS wallbox settings."""
         _LOGGER.debug("Setting battery to car mode to %s", mode)
-        result = self.e3dc.sendRequest(
-            (
-                RscpTag.EMS_REQ_SET_BATTERY_TO_CAR_MODE,
-                RscpType.UChar8,
-                1 if mode else 0,
-            ),
-            keepAlive=True,
-        )
-        if result[2] == 255:
-            raise HomeAssistantError(
-                "Failed to set battery to car mode, invalid operation."
-            )
-        return False if result[2] == 0 else True
+        responses, readback = await self._async_send_write(
+            [
+                _value_request(
+                    RscpTag.EMS_REQ_SET_BATTERY_TO_CAR_MODE,
+                    RscpType.UChar8,
+                    1 if mode else 0,
+                )
+            ],
+            PollGroup.WALLBOX_EMS_SETTINGS,
+        )
+        _parse_car_mode_result(responses[0], "battery to car mode")
+        return readback
 
-    @e3dc_call
-    def set_battery_wallbox_discharge_limit(self, limit: int) -> int:
+    @e3dc_call(priority=RequestPriority.CONTROL)
+    async def async_set_battery_wallbox_discharge_limit(self, limit: int) -> int:
         """Set the battery wallbox discharge limit, returns the value E3DC reports back."""
         # We don't get a sensible result here, E3DC returns the value
         # EMS_SET_BATTERY_BEFORE_CAR_MODE instead, which does not help us.
-        # Thus, we need to query it afterwards.
+        # Thus, we need to query it afterwards, within the same frame.
         _LOGGER.debug("Setting battery wallbox discharge limit to %s", limit)
-        self.e3dc.sendRequest(
-            (RscpTag.EMS_REQ_SET_WB_DISCHARGE_BAT_UNTIL, RscpType.Uint32, limit),
-            keepAlive=True,
-        )
-        return self.e3dc.sendRequestTag(
-            RscpTag.EMS_REQ_GET_WB_DISCHARGE_BAT_UNTIL, keepAlive=True
+        responses = await self._transport.async_send_requests(
+            [
+                _value_request(
+                    RscpTag.EMS_REQ_SET_WB_DISCHARGE_BAT_UNTIL, RscpType.Uint32, limit
+                ),
+                _tag_request(RscpTag.EMS_REQ_GET_WB_DISCHARGE_BAT_UNTIL),
+            ]
         )
+        _raise_on_error_responses(responses)
+        return responses[1][2]
 
-    @e3dc_call
-    def set_wallbox_enforce_power_assignment(self, enforce: bool) -> bool:
-        """Set the wallbox enforce power assignment mode."""
+    @e3dc_call(priority=RequestPriority.CONTROL)
+    async def async_set_wallbox_enforce_power_assignment(
+        self, enforce: bool
+    ) -> dict[str, Any] | None:
+        """Set the wallbox enforce power assignment mode.
+
+        Returns the read back EMS wallbox settings.
+        """
         _LOGGER.debug("Setting wallbox enforce power assignment to %s", enforce)
-        result = self.e3dc.sendRequest(
-            (
-                RscpTag.EMS_REQ_SET_WALLBOX_ENFORCE_POWER_ASSIGNMENT,
-                RscpType.Bool,
-                enforce,
-            ),
-            keepAlive=True,
+        _, readback = await self._async_send_write(
+            [
+                _value_request(
+                    RscpTag.EMS_REQ_SET_WALLBOX_ENFORCE_POWER_ASSIGNMENT,
+                    RscpType.Bool,
+                    enforce,
+                )
+            ],
+            PollGroup.WALLBOX_EMS_SETTINGS,
         )
-        return result[2]
+        return readback
 
-    @e3dc_call
-    def set_power_limits(
+    @e3dc_call(priority=RequestPriority.CONTROL)
+    async def async_set_power_limits(
         self,
         enable: bool,
         max_charge: int | None = None,
         max_discharge: int | None = None,
-    ) -> None:
-        """Set or clear power limits."""
-        if not enable:
-            result: int = self.e3dc.set_power_limits(False, None, None, None, True)
-        else:
-            power_settings: list[tuple[RscpTag, RscpType, bool | int]] = [
-                (RscpTag.EMS_POWER_LIMITS_USED, RscpType.Bool, True)
-            ]
+    ) -> dict[str, Any] | None:
+        """Set or clear power limits, returns the read back power settings."""
+        settings: list[tuple[RscpTag, RscpType]] = [
+            (RscpTag.EMS_POWER_LIMITS_USED, RscpType.Bool)
+        ]
+        values: dict[str, bool | int] = {RscpTag.EMS_POWER_LIMITS_USED.name: enable}
+        if enable:
             if max_discharge is not None:
-                power_settings.append(
-                    (
-                        RscpTag.EMS_MAX_DISCHARGE_POWER,
-                        RscpType.Uint32,
-                        max_discharge,
-                    )
-                )
+                settings.append((RscpTag.EMS_MAX_DISCHARGE_POWER, RscpType.Uint32))
+                values[RscpTag.EMS_MAX_DISCHARGE_POWER.name] = max_discharge
             if max_charge is not None:
-                power_settings.append(
-                    (
-                        RscpTag.EMS_MAX_CHARGE_POWER,
-                        RscpType.Uint32,
-                        max_charge,
-                    )
-                )
+                settings.append((RscpTag.EMS_MAX_CHARGE_POWER, RscpType.Uint32))
+                values[RscpTag.EMS_MAX_CHARGE_POWER.name] = max_charge
 
-            res = self.e3dc.sendRequest(
-                (
-                    RscpTag.EMS_REQ_SET_POWER_SETTINGS,
-                    RscpType.Container,
-                    power_settings,
-                ),
-                keepAlive=True,
-            )
+        responses, readback = await self._async_send_write(
+            [_power_settings_template(*settings).build(**values)],
+            PollGroup.POWER_SETTINGS,
+        )
 
-            # Aggregate all return codes: -1 error, 1 nonoptimal, 0 success.
-            result = 0
-            for response_item in res[2]:
-                if response_item[2] == -1:
-                    result = -1
-                elif response_item[2] == 1 and result == 0:
-                    result = 1
+        # Aggregate all return codes: -1 error, 1 nonoptimal, 0 success.
+        result = 0
+        for response_item in responses[0][2]:
+            if response_item[2] == -1:
+                result = -1
+            elif response_item[2] == 1 and result == 0:
+                result = 1
 
         if result == -1:
             raise HomeAssistantError("Failed to clear power limits")
         if result == 1:
             _LOGGER.warning("The given power limits are not optimal, continuing anyway")
+        return readback
 
-    @e3dc_call
-    def set_powersave(self, enabled: bool):
-        """Set powersaving flag."""
+    @e3dc_call(priority=RequestPriority.CONTROL)
+    async def async_set_powersave(self, enabled: bool) -> dict[str, Any] | None:
+        """Set powersaving flag, returns the read back power settings."""
         # The call would normally return the new state, however, various e3dc's
         # react differently here, my E3DC does not work as the way e3dc lib is
-        # implemented, so so far we ignore the return value. If the change was
-        # unsuccessful, the next polling cycle will reset this to the actual
-        # value.
+        # implemented, so so far we ignore the return value. The power settings
+        # read back within the same frame tell whether the change went through.
         # TODO: Find a way to deal with the powersaving api
-        self.e3dc.set_powersave(enabled, True)
+        _, readback = await self._async_send_write(
+            [
+                _power_settings_template(
+                    (RscpTag.EMS_POWERSAVE_ENABLED, RscpType.UChar8)
+                ).build(EMS_POWERSAVE_ENABLED=int(enabled))
+            ],
+            PollGroup.POWER_SETTINGS,
+        )
+        return readback
 
-    @e3dc_call
-    def set_weather_regulated_charge(self, enabled: bool):
-        """Set weather regulated charging flag."""
+    @e3dc_call(priority=RequestPriority.CONTROL)
+    async def async_set_weather_regulated_charge(
+        self, enabled: bool
+    ) -> dict[str, Any] | None:
+        """Set weather regulated charging flag, returns the read back power settings."""
         # The call would normally return the new state, however, various e3dc's
         # react differently here, my E3DC does not work as the way e3dc lib is
-        # implemented, so so far we ignore the return value. If the change was
-        # unsuccessful, the next polling cycle will reset this to the actual
-        # value.
+        # implemented, so so far we ignore the return value. The power settings
+        # read back within the same frame tell whether the change went through.
         # TODO: Find a way to deal with the weather regulation api
-        self.e3dc.set_weather_regulated_charge(enabled, True)
+        _, readback = await self._async_send_write(
+            [
+                _power_settings_template(
+                    (RscpTag.EMS_WEATHER_REGULATED_CHARGE_ENABLED, RscpType.UChar8)
+                ).build(EMS_WEATHER_REGULATED_CHARGE_ENABLED=int(enabled))
+            ],
+            PollGroup.POWER_SETTINGS,
+        )
+        return readback
 
     @e3dc_call
-    def get_power_mode(self) -> int:
+    async def async_get_power_mode(self) -> int:
         """Load the E3DC power mode."""
-        data = self.e3dc.sendRequestTag(RscpTag.EMS_REQ_MODE, keepAlive=True)
-        return data
+        return await self._async_send_request_tag(RscpTag.EMS_REQ_MODE)
 
-    @e3dc_call
-    def set_power_mode(self, mode: int = 0, value: int = 0) -> int:
-        """Set the E3DC power mode and value."""
-        data = self.e3dc.sendRequest(
-            (
-                RscpTag.EMS_REQ_SET_POWER,
-                RscpType.Container,
-                [
-                    (
-                        RscpTag.EMS_REQ_SET_POWER_MODE,
-                        RscpType.UChar8,
-                        mode if mode is not None else 0,
-                    ),
-                    (
-                        RscpTag.EMS_REQ_SET_POWER_VALUE,
-                        RscpType.Int32,
-                        value if value is not None else 0,
-                    ),
-                ],
-            ),
-            keepAlive=True,
-        )
+    @e3dc_call(priority=RequestPriority.CONTROL)
+    async def async_set_power_mode(
+        self, mode: int = 0, value: int = 0
+    ) -> dict[str, Any]:
+        """Set the E3DC power mode and value, reading back the EMS mode.
 
-        return rscpFindTag(data, RscpTag.EMS_SET_POWER)[2]
+        The EMS mode is requested within the same frame, sparing the round
+        trip of a separate async_get_power_mode() call.
+        """
+        responses = await self._transport.async_send_requests(
+            [
+                _SET_POWER_REQUEST.build(
+                    mode=mode if mode is not None else 0,
+                    value=value if value is not None else 0,
+                ),
+                _tag_request(RscpTag.EMS_REQ_MODE),
+            ]
+        )
+        return _parse_set_power(responses)
 
     @e3dc_call
-    def get_remote_control_ip(self, keepAlive: bool = False) -> str | None:
+    async def async_get_remote_control_ip(self) -> str | None:
         """Get the E3DC remote control IP."""
-        data = self.e3dc.sendRequestTag(
-            RscpTag.EMS_REQ_IP_REMOTE_CONTROL,
-            keepAlive=keepAlive,
-        )
+        data = await self._async_send_request_tag(RscpTag.EMS_REQ_IP_REMOTE_CONTROL)
 
         return data if data != "" else None
 
     @e3dc_call
-    def get_ip_address(self, keepAlive: bool = False) -> str:
+    async def async_get_ip_address(self) -> str:
         """Get the E3DC IP address."""
-        data = self.e3dc.sendRequestTag(
-            RscpTag.INFO_REQ_IP_ADDRESS,
-            keepAlive=keepAlive,
+        data = await self._transport.async_send_request(
+            _tag_request(RscpTag.INFO_REQ_IP_ADDRESS)
         )
 
-        return rscpFindTag(data, RscpTag.INFO_IP_ADDRESS)[2]
+        return _RscpView(data).get(RscpTag.INFO_IP_ADDRESS)
+
+    async def _async_send_write(
+        self,
+        requests: list[_Request],
+        readback: PollGroup,
+        wallbox_index: int | None = None,
+    ) -> tuple[list[RscpMessage], Any]:
+        """Send write requests, reading back the affected group within the same frame.
+
+        Returns the responses to the write requests, which raise if E3DC
+        answered any of them with an error, and the parsed read back. The read
+        back is None if E3DC could not answer it, the write still went through.
+        Wallbox data is read back for the wallbox of the given index.
+        """
+        if readback == PollGroup.WALLBOX_DATA:
+            if wallbox_index is None:
+                raise ValueError("Reading back wallbox data requires a wallbox index")
+            readback_requests = _wallbox_data_requests(wallbox_index)
+            parser = _parse_wallbox_data
+        else:
+            build_requests, parser = _POLL_GROUPS[readback]
+            readback_requests = build_requests()
+        responses = await self._transport.async_send_requests(
+            [*requests, *readback_requests]
+        )
+        write_responses = responses[: len(requests)]
+        _raise_on_error_responses(write_responses)
+        try:
+            return write_responses, parser(responses[len(requests) :])
+        except HomeAssistantError as ex:
+            _LOGGER.debug("Failed to read back %s after writing: %s", readback, ex)
+            return write_responses, None
+
+    async def _async_send_wallbox_write(
+        self,
+        wallbox_index: int,
+        request: RscpTag,
+        data_index: int,
+        value: int,
+        setting: str,
+    ) -> dict[str, Any] | None:
+        """Write a byte of the WB_EXTERN_DATA of a wallbox, reading the wallbox back."""
+        responses, readback = await self._async_send_write(
+            [
+                _wallbox_set_template(request, data_index, value).build(
+                    index=wallbox_index
+                )
+            ],
+            PollGroup.WALLBOX_DATA,
+            wallbox_index,
+        )
+        # The wallbox answers within WB_DATA, E3DC itself reports success.
+        if not _RscpView(responses[0]).is_valid(_WALLBOX_SET_RESPONSE_TAGS[request]):
+            raise HomeAssistantError(
+                f"Failed to set {setting} of wallbox {wallbox_index}"
+            )
+        return readback
+
+    async def _async_send_request_tag(self, tag: RscpTag) -> Any:
+        """Request a single tag and return its value."""
+        return (await self._transport.async_send_request(_tag_request(tag)))[2]
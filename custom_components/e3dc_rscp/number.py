@@ -3,7 +3,7 @@
 from collections.abc import Callable, Coroutine
 from dataclasses import dataclass, replace
 import logging
-from typing import Any
+from typing import Any, Final
 
 from homeassistant.components.number import (
     NumberDeviceClass,
@@ -16,10 +16,10 @@ from homeassistant.const import EntityCategory
 
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_WALLBOXES_IDENTIFIED
 from .coordinator import E3DCCoordinator
+from .utils import E3DCEntity, async_add_entities_on_signal
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,47 +34,66 @@ class E3DCNumberEntityDescription(NumberEntityDescription):
     ) = None
 
 
+# All number entity descriptions (merge all here)
+NUMBER_DESCRIPTIONS: Final[tuple[E3DCNumberEntityDescription, ...]] = (
+    E3DCNumberEntityDescription(
+        key="battery-wallbox-discharge-limit",
+        translation_key="battery-wallbox-discharge-limit",
+        icon="mdi:battery-lock-open",
+        native_min_value=0,
+        native_max_value=100,
+        native_step=1,
+        device_class=NumberDeviceClass.BATTERY,
+        entity_category=EntityCategory.CONFIG,
+        native_unit_of_measurement="%",
+        enabling_depends_on_wallbox=True,
+        async_set_native_value_action=lambda coordinator, value: (
+            coordinator.async_set_battery_wallbox_discharge_limit(int(value))
+        ),
+    ),
+    # Wallbox-specific numbers are still added per wallbox below
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Initialize Number Platform."""
     assert isinstance(entry.unique_id, str)
     coordinator: E3DCCoordinator = hass.data[DOMAIN][entry.unique_id]
-    entities: list[E3DCNumber] = []
-    wallboxes_present = len(coordinator.wallboxes) > 0
+    entities: list[E3DCNumber] = [
+        E3DCNumber(coordinator, description, entry.unique_id)
+        for description in NUMBER_DESCRIPTIONS
+        if not description.enabling_depends_on_wallbox
+    ]
+    async_add_entities(entities)
 
-    # All number entity descriptions (merge all here)
-    NUMBER_DESCRIPTIONS: tuple[E3DCNumberEntityDescription, ...] = (
-        E3DCNumberEntityDescription(
-            key="battery-wallbox-discharge-limit",
-            translation_key="battery-wallbox-discharge-limit",
-            icon="mdi:battery-lock-open",
-            native_min_value=0,
-            native_max_value=100,
-            native_step=1,
-            device_class=NumberDeviceClass.BATTERY,
-            entity_category=EntityCategory.CONFIG,
-            native_unit_of_measurement="%",
-            enabling_depends_on_wallbox=True,
-            async_set_native_value_action=lambda coordinator, value: (
-                coordinator.async_set_battery_wallbox_discharge_limit(int(value))
-            ),
-        ),
-        # Wallbox-specific numbers are still added per wallbox below
+    async_add_entities_on_signal(
+        hass,
+        entry,
+        SIGNAL_WALLBOXES_IDENTIFIED,
+        async_add_entities,
+        lambda: _create_wallbox_entities(coordinator, entry.unique_id),
     )
 
+
+def _create_wallbox_entities(
+    coordinator: E3DCCoordinator, unique_id: str
+) -> list["E3DCNumber"]:
+    """Create the numbers depending on wallboxes, once they are identified."""
+    wallbox_entities: list[E3DCNumber] = []
+    wallboxes_present = len(coordinator.wallboxes) > 0
+
     for description in NUMBER_DESCRIPTIONS:
-        if getattr(description, "enabling_depends_on_wallbox", False):
+        if description.enabling_depends_on_wallbox:
             desc = replace(
                 description, entity_registry_enabled_default=wallboxes_present
             )
-            entities.append(E3DCNumber(coordinator, desc, entry.unique_id))
-        else:
-            entities.append(E3DCNumber(coordinator, description, entry.unique_id))
+            wallbox_entities.append(E3DCNumber(coordinator, desc, unique_id))
 
     # Add Number descriptions for wallboxes
     for wallbox in coordinator.wallboxes:
-        unique_id = list(wallbox["deviceInfo"]["identifiers"])[0][1]
+        wallbox_unique_id = list(wallbox["deviceInfo"]["identifiers"])[0][1]
         wallbox_key = wallbox["key"]
 
         wallbox_charge_current_limit_description = E3DCNumberEntityDescription(
@@ -92,19 +111,19 @@ async def async_setup_entry(
                 coordinator.async_set_wallbox_max_charge_current(int(value), index)
             ),
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCNumber(
                 coordinator,
                 wallbox_charge_current_limit_description,
-                unique_id,
+                wallbox_unique_id,
                 wallbox["deviceInfo"],
             )
         )
 
-    async_add_entities(entities)
+    return wallbox_entities
 
 
-class E3DCNumber(CoordinatorEntity, NumberEntity):
+class E3DCNumber(E3DCEntity, NumberEntity):
     """Custom E3DC Number Implementation."""
 
     _attr_has_entity_name = True
@@ -117,7 +136,7 @@ class E3DCNumber(CoordinatorEntity, NumberEntity):
         device_info: DeviceInfo | None = None,
     ) -> None:
         """Initialize the Number."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, (description.key,))
         self.coordinator: E3DCCoordinator = coordinator
         self.entity_description: E3DCNumberEntityDescription = description
         self._attr_value = self.coordinator.data.get(self.entity_description.key)
@@ -142,9 +161,10 @@ class E3DCNumber(CoordinatorEntity, NumberEntity):
         """Set the number value asynchronously."""
         if self.entity_description.async_set_native_value_action is not None:
             self._attr_value = value
-            self.async_write_ha_state()
-            await self.entity_description.async_set_native_value_action(
-                self.coordinator, value
+            await self._async_write_optimistically(
+                self.entity_description.async_set_native_value_action(
+                    self.coordinator, value
+                )
             )
 
     @property
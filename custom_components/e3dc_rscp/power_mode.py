@@ -0,0 +1,207 @@
+"""Power mode control for E3DC integration."""
+
+import asyncio
+from collections.abc import Callable
+import logging
+from time import monotonic
+from typing import Any, Final
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DOMAIN, PowerMode, SetPowerMode
+from .e3dc_proxy import E3DCProxy
+
+_LOGGER = logging.getLogger(__name__)
+
+# E3DC falls back to normal operation unless a set power mode is repeated.
+_KEEPALIVE_INTERVAL: Final[float] = 10
+
+# Delay before resending a setpoint E3DC did not follow, giving the EMS a
+# moment to settle first.
+_DRIFT_RESEND_DELAY: Final[float] = 2
+
+# A keepalive sent later than this after its deadline counts as missed.
+_DEADLINE_TOLERANCE: Final[float] = 1
+
+# EMS mode E3DC reports while following a set power mode.
+_EXPECTED_POWER_MODE: Final[dict[SetPowerMode, PowerMode]] = {
+    SetPowerMode.IDLE: PowerMode.IDLE,
+    SetPowerMode.DISCHARGE: PowerMode.DISCHARGE,
+    SetPowerMode.CHARGE: PowerMode.CHARGE,
+    SetPowerMode.CHARGE_GRID: PowerMode.CHARGE,
+}
+
+
+class E3DCPowerModeController:
+    """Keeps a set power mode active on E3DC with a dedicated control task.
+
+    The setpoint is resent once per keepalive interval, and early if E3DC
+    drifted off it. Every write reads back the EMS mode within the same RSCP
+    frame, which is passed on to the coordinator and used to detect the drift.
+    A setpoint E3DC keeps ignoring, e.g. charging a full battery, is only
+    resent early once, then again with the keepalive.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        uid: str,
+        proxy: E3DCProxy,
+        power_mode_callback: Callable[[int], None],
+    ) -> None:
+        """Initialize the controller, it is idle until a power mode is set."""
+        self._hass: HomeAssistant = hass
+        self._uid: str = uid
+        self._proxy: E3DCProxy = proxy
+        self._power_mode_callback: Callable[[int], None] = power_mode_callback
+
+        self._mode: SetPowerMode = SetPowerMode.NORMAL
+        self._value: int | None = None
+        self._task: asyncio.Task | None = None
+        self._send_lock: asyncio.Lock = asyncio.Lock()
+        self._reschedule: asyncio.Event = asyncio.Event()
+        self._deadline: float = 0.0
+        self._drift_resent: bool = False
+
+        self._sends: int = 0
+        self._drift_resends: int = 0
+        self._failures: int = 0
+        self._missed_deadlines: int = 0
+        self._jitter_last: float | None = None
+        self._jitter_max: float = 0.0
+        self._jitter_total: float = 0.0
+        self._keepalives: int = 0
+        self._accepted_value: int | None = None
+        self._power_mode: int | None = None
+
+    @property
+    def active(self) -> bool:
+        """Return True while a power mode other than normal is kept active."""
+        return self._task is not None
+
+    async def async_set(self, mode: SetPowerMode, value: int | None) -> None:
+        """Apply a new setpoint right away and keep it active from then on."""
+        self._mode = mode
+        self._value = value
+
+        if mode == SetPowerMode.NORMAL:
+            self.stop()
+            return
+
+        _LOGGER.debug("Starting power mode")
+        self._drift_resent = False
+        await self._async_send()
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_run(), f"{DOMAIN} {self._uid} power mode control"
+            )
+        self._reschedule.set()
+
+    @callback
+    def stop(self) -> None:
+        """Stop keeping the power mode active, E3DC returns to normal operation.
+
+        The control task is not cancelled, as this would abort a write in
+        flight along with the connection. It ends on its own instead.
+        """
+        self._mode = SetPowerMode.NORMAL
+        self._value = None
+        if self._task is not None:
+            _LOGGER.debug("Stopping power mode")
+            self._task = None
+            self._reschedule.set()
+
+    def get_status(self) -> dict[str, Any]:
+        """Return the setpoint and keepalive metrics for diagnostics."""
+        return {
+            "active": self.active,
+            "mode": self._mode.name,
+            "value": self._value,
+            "accepted_value": self._accepted_value,
+            "power_mode": self._power_mode,
+            "sends": self._sends,
+            "keepalives": self._keepalives,
+            "drift_resends": self._drift_resends,
+            "failures": self._failures,
+            "missed_deadlines": self._missed_deadlines,
+            "jitter_ms": {
+                "last": _to_ms(self._jitter_last),
+                "max": _to_ms(self._jitter_max) if self._keepalives else None,
+                "mean": _to_ms(self._jitter_total / self._keepalives)
+                if self._keepalives
+                else None,
+            },
+        }
+
+    async def _async_run(self) -> None:
+        """Resend the setpoint whenever its deadline has passed."""
+        while self._task is asyncio.current_task():
+            delay: float = self._deadline - monotonic()
+            if delay > 0:
+                self._reschedule.clear()
+                try:
+                    async with asyncio.timeout(delay):
+                        await self._reschedule.wait()
+                except TimeoutError:
+                    pass
+                continue
+
+            jitter: float = -delay
+            self._keepalives += 1
+            self._jitter_last = jitter
+            self._jitter_max = max(self._jitter_max, jitter)
+            self._jitter_total += jitter
+            if jitter > _DEADLINE_TOLERANCE:
+                self._missed_deadlines += 1
+            if not await self._async_send() and jitter <= _DEADLINE_TOLERANCE:
+                self._missed_deadlines += 1
+
+    async def _async_send(self) -> bool:
+        """Send the current setpoint and check the read back EMS mode."""
+        async with self._send_lock:
+            mode: SetPowerMode = self._mode
+            if mode == SetPowerMode.NORMAL:
+                return True
+
+            _LOGGER.debug("Setting power mode: %s at %s W", mode.name, self._value)
+            self._sends += 1
+            self._deadline = monotonic() + _KEEPALIVE_INTERVAL
+            try:
+                result: dict[str, Any] = await self._proxy.async_set_power_mode(
+                    int(mode.value), self._value
+                )
+            except HomeAssistantError as ex:
+                self._failures += 1
+                _LOGGER.warning("Failed set power mode: %s", ex)
+                return False
+
+        self._accepted_value = result["set-power-value"]
+        self._power_mode = result["power-mode"]
+        if self._power_mode is not None:
+            self._power_mode_callback(self._power_mode)
+        self._check_drift(mode)
+        return True
+
+    def _check_drift(self, mode: SetPowerMode) -> None:
+        """Resend the setpoint early once if E3DC does not follow it."""
+        if str(self._power_mode) == _EXPECTED_POWER_MODE[mode].value:
+            self._drift_resent = False
+            return
+        if self._drift_resent:
+            return
+
+        _LOGGER.debug(
+            "E3DC reports power mode %s instead of %s, resending the setpoint",
+            self._power_mode,
+            _EXPECTED_POWER_MODE[mode].name,
+        )
+        self._drift_resent = True
+        self._drift_resends += 1
+        self._deadline = monotonic() + _DRIFT_RESEND_DELAY
+        self._reschedule.set()
+
+
+def _to_ms(seconds: float | None) -> float | None:
+    """Convert seconds to rounded milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 1)
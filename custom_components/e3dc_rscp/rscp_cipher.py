@@ -0,0 +1,522 @@
+"""Rijndael-256 cipher of RSCP frames for E3DC integration."""
+
+from collections.abc import Sequence
+from functools import cache
+import struct
+from typing import Any, Final
+
+# Typed loosely, so that the optional import does not make every use optional.
+np: Any
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# RSCP uses Rijndael with 256 bit blocks and keys, thus 14 rounds.
+BLOCK_SIZE: Final[int] = 32
+KEY_SIZE: Final[int] = 32
+_WORDS: Final[int] = BLOCK_SIZE // 4
+_ROUNDS: Final[int] = 14
+
+# Row shifts of a block of eight columns, for encryption and decryption.
+_ENCRYPT_SHIFTS: Final[tuple[int, int, int]] = (1, 3, 4)
+_DECRYPT_SHIFTS: Final[tuple[int, int, int]] = (7, 5, 4)
+
+# Frames of at least this many blocks are decrypted with NumPy, all blocks at
+# once. Below, the overhead of the array operations outweighs their gain.
+_NUMPY_MIN_BLOCKS: Final[int] = 8
+
+_WORDS_FORMAT: Final[str] = f">{_WORDS}I"
+
+
+def _build_tables() -> tuple[Any, ...]:
+    """Compute the S-boxes and the round tables of Rijndael."""
+
+    def mul(a: int, b: int) -> int:
+        result: int = 0
+        while b:
+            if b & 1:
+                result ^= a
+            a = ((a << 1) ^ 0x11B) if a & 0x80 else a << 1
+            b >>= 1
+        return result
+
+    inverse: list[int] = [0] * 256
+    for a in range(1, 256):
+        for b in range(1, 256):
+            if mul(a, b) == 1:
+                inverse[a] = b
+                break
+
+    sbox: list[int] = [0] * 256
+    for x in range(256):
+        b = inverse[x]
+        s = b
+        for _ in range(4):
+            b = ((b << 1) | (b >> 7)) & 0xFF
+            s ^= b
+        sbox[x] = s ^ 0x63
+    sbox_inv: list[int] = [0] * 256
+    for x, s in enumerate(sbox):
+        sbox_inv[s] = x
+
+    def column(c0: int, c1: int, c2: int, c3: int) -> int:
+        return (c0 << 24) | (c1 << 16) | (c2 << 8) | c3
+
+    def rotations(table: list[int]) -> tuple[tuple[int, ...], ...]:
+        return tuple(
+            tuple(((t >> (8 * r)) | (t << (32 - 8 * r))) & 0xFFFFFFFF for t in table)
+            for r in range(4)
+        )
+
+    encrypt_table: list[int] = [column(mul(s, 2), s, s, mul(s, 3)) for s in sbox]
+    decrypt_table: list[int] = [
+        column(mul(s, 14), mul(s, 9), mul(s, 13), mul(s, 11)) for s in sbox_inv
+    ]
+    # Inverse MixColumn of the plain byte, used for the decryption key schedule.
+    mix_inv_table: list[int] = [
+        column(mul(x, 14), mul(x, 9), mul(x, 13), mul(x, 11)) for x in range(256)
+    ]
+    return (
+        tuple(sbox),
+        tuple(sbox_inv),
+        rotations(encrypt_table),
+        rotations(decrypt_table),
+        rotations(mix_inv_table),
+    )
+
+
+_SBOX, _SBOX_INV, _T_ENCRYPT, _T_DECRYPT, _U_MIX_INV = _build_tables()
+
+
+@cache
+def _key_schedule(
+    key: bytes,
+) -> tuple[tuple[tuple[int, ...], ...], tuple[tuple[int, ...], ...]]:
+    """Expand the key into the round keys for encryption and decryption.
+
+    Cached, as a connection keeps its key and every reconnect reuses it.
+    """
+    sbox = _SBOX
+    words: list[int] = list(struct.unpack(_WORDS_FORMAT, key))
+    rcon: int = 1
+    while len(words) < (_ROUNDS + 1) * _WORDS:
+        i: int = len(words)
+        t: int = words[-1]
+        if i % _WORDS == 0:
+            t = (
+                (sbox[(t >> 16) & 0xFF] << 24)
+                | (sbox[(t >> 8) & 0xFF] << 16)
+                | (sbox[t & 0xFF] << 8)
+                | sbox[t >> 24]
+            ) ^ (rcon << 24)
+            rcon = ((rcon << 1) ^ 0x11B) if rcon & 0x80 else rcon << 1
+        elif i % _WORDS == 4:
+            t = (
+                (sbox[t >> 24] << 24)
+                | (sbox[(t >> 16) & 0xFF] << 16)
+                | (sbox[(t >> 8) & 0xFF] << 8)
+                | sbox[t & 0xFF]
+            )
+        words.append(words[i - _WORDS] ^ t)
+
+    encrypt_keys = tuple(
+        tuple(words[r * _WORDS : (r + 1) * _WORDS]) for r in range(_ROUNDS + 1)
+    )
+    u0, u1, u2, u3 = _U_MIX_INV
+    decrypt_keys = tuple(
+        encrypt_keys[_ROUNDS - r]
+        if r in (0, _ROUNDS)
+        else tuple(
+            u0[t >> 24] ^ u1[(t >> 16) & 0xFF] ^ u2[(t >> 8) & 0xFF] ^ u3[t & 0xFF]
+            for t in encrypt_keys[_ROUNDS - r]
+        )
+        for r in range(_ROUNDS + 1)
+    )
+    return encrypt_keys, decrypt_keys
+
+
+def _column_sources(shifts: tuple[int, int, int]) -> tuple[tuple[int, ...], ...]:
+    """Return the source column of every row for each output column."""
+    return tuple(
+        (
+            i,
+            (i + shifts[0]) % _WORDS,
+            (i + shifts[1]) % _WORDS,
+            (i + shifts[2]) % _WORDS,
+        )
+        for i in range(_WORDS)
+    )
+
+
+_DECRYPT_COLUMNS: Final = _column_sources(_DECRYPT_SHIFTS)
+
+
+# The rounds are unrolled per column, as Python spends most of the time on
+# loop and index overhead otherwise. Columns are picked as in _column_sources().
+def _encrypt_block(
+    state: Sequence[int],
+    round_keys: tuple[tuple[int, ...], ...],
+    tables: tuple[tuple[int, ...], ...],
+    sbox: tuple[int, ...],
+) -> list[int]:
+    """Encrypt a single block given as words, using T-tables."""
+    t0, t1, t2, t3 = tables
+    k = round_keys[0]
+    s0, s1, s2, s3, s4, s5, s6, s7 = (
+        state[0] ^ k[0],
+        state[1] ^ k[1],
+        state[2] ^ k[2],
+        state[3] ^ k[3],
+        state[4] ^ k[4],
+        state[5] ^ k[5],
+        state[6] ^ k[6],
+        state[7] ^ k[7],
+    )
+    for k in round_keys[1:_ROUNDS]:
+        s0, s1, s2, s3, s4, s5, s6, s7 = (
+            t0[s0 >> 24]
+            ^ t1[(s1 >> 16) & 0xFF]
+            ^ t2[(s3 >> 8) & 0xFF]
+            ^ t3[s4 & 0xFF]
+            ^ k[0],
+            t0[s1 >> 24]
+            ^ t1[(s2 >> 16) & 0xFF]
+            ^ t2[(s4 >> 8) & 0xFF]
+            ^ t3[s5 & 0xFF]
+            ^ k[1],
+            t0[s2 >> 24]
+            ^ t1[(s3 >> 16) & 0xFF]
+            ^ t2[(s5 >> 8) & 0xFF]
+            ^ t3[s6 & 0xFF]
+            ^ k[2],
+            t0[s3 >> 24]
+            ^ t1[(s4 >> 16) & 0xFF]
+            ^ t2[(s6 >> 8) & 0xFF]
+            ^ t3[s7 & 0xFF]
+            ^ k[3],
+            t0[s4 >> 24]
+            ^ t1[(s5 >> 16) & 0xFF]
+            ^ t2[(s7 >> 8) & 0xFF]
+            ^ t3[s0 & 0xFF]
+            ^ k[4],
+            t0[s5 >> 24]
+            ^ t1[(s6 >> 16) & 0xFF]
+            ^ t2[(s0 >> 8) & 0xFF]
+            ^ t3[s1 & 0xFF]
+            ^ k[5],
+            t0[s6 >> 24]
+            ^ t1[(s7 >> 16) & 0xFF]
+            ^ t2[(s1 >> 8) & 0xFF]
+            ^ t3[s2 & 0xFF]
+            ^ k[6],
+            t0[s7 >> 24]
+            ^ t1[(s0 >> 16) & 0xFF]
+            ^ t2[(s2 >> 8) & 0xFF]
+            ^ t3[s3 & 0xFF]
+            ^ k[7],
+        )
+    k = round_keys[_ROUNDS]
+    return [
+        (
+            (sbox[s0 >> 24] << 24)
+            | (sbox[(s1 >> 16) & 0xFF] << 16)
+            | (sbox[(s3 >> 8) & 0xFF] << 8)
+            | sbox[s4 & 0xFF]
+        )
+        ^ k[0],
+        (
+            (sbox[s1 >> 24] << 24)
+            | (sbox[(s2 >> 16) & 0xFF] << 16)
+            | (sbox[(s4 >> 8) & 0xFF] << 8)
+            | sbox[s5 & 0xFF]
+        )
+        ^ k[1],
+        (
+            (sbox[s2 >> 24] << 24)
+            | (sbox[(s3 >> 16) & 0xFF] << 16)
+            | (sbox[(s5 >> 8) & 0xFF] << 8)
+            | sbox[s6 & 0xFF]
+        )
+        ^ k[2],
+        (
+            (sbox[s3 >> 24] << 24)
+            | (sbox[(s4 >> 16) & 0xFF] << 16)
+            | (sbox[(s6 >> 8) & 0xFF] << 8)
+            | sbox[s7 & 0xFF]
+        )
+        ^ k[3],
+        (
+            (sbox[s4 >> 24] << 24)
+            | (sbox[(s5 >> 16) & 0xFF] << 16)
+            | (sbox[(s7 >> 8) & 0xFF] << 8)
+            | sbox[s0 & 0xFF]
+        )
+        ^ k[4],
+        (
+            (sbox[s5 >> 24] << 24)
+            | (sbox[(s6 >> 16) & 0xFF] << 16)
+            | (sbox[(s0 >> 8) & 0xFF] << 8)
+            | sbox[s1 & 0xFF]
+        )
+        ^ k[5],
+        (
+            (sbox[s6 >> 24] << 24)
+            | (sbox[(s7 >> 16) & 0xFF] << 16)
+            | (sbox[(s1 >> 8) & 0xFF] << 8)
+            | sbox[s2 & 0xFF]
+        )
+        ^ k[6],
+        (
+            (sbox[s7 >> 24] << 24)
+            | (sbox[(s0 >> 16) & 0xFF] << 16)
+            | (sbox[(s2 >> 8) & 0xFF] << 8)
+            | sbox[s3 & 0xFF]
+        )
+        ^ k[7],
+    ]
+
+
+def _decrypt_block(
+    state: Sequence[int],
+    round_keys: tuple[tuple[int, ...], ...],
+    tables: tuple[tuple[int, ...], ...],
+    sbox: tuple[int, ...],
+) -> list[int]:
+    """Decrypt a single block given as words, using T-tables."""
+    t0, t1, t2, t3 = tables
+    k = round_keys[0]
+    s0, s1, s2, s3, s4, s5, s6, s7 = (
+        state[0] ^ k[0],
+        state[1] ^ k[1],
+        state[2] ^ k[2],
+        state[3] ^ k[3],
+        state[4] ^ k[4],
+        state[5] ^ k[5],
+        state[6] ^ k[6],
+        state[7] ^ k[7],
+    )
+    for k in round_keys[1:_ROUNDS]:
+        s0, s1, s2, s3, s4, s5, s6, s7 = (
+            t0[s0 >> 24]
+            ^ t1[(s7 >> 16) & 0xFF]
+            ^ t2[(s5 >> 8) & 0xFF]
+            ^ t3[s4 & 0xFF]
+            ^ k[0],
+            t0[s1 >> 24]
+            ^ t1[(s0 >> 16) & 0xFF]
+            ^ t2[(s6 >> 8) & 0xFF]
+            ^ t3[s5 & 0xFF]
+            ^ k[1],
+            t0[s2 >> 24]
+            ^ t1[(s1 >> 16) & 0xFF]
+            ^ t2[(s7 >> 8) & 0xFF]
+            ^ t3[s6 & 0xFF]
+            ^ k[2],
+            t0[s3 >> 24]
+            ^ t1[(s2 >> 16) & 0xFF]
+            ^ t2[(s0 >> 8) & 0xFF]
+            ^ t3[s7 & 0xFF]
+            ^ k[3],
+            t0[s4 >> 24]
+            ^ t1[(s3 >> 16) & 0xFF]
+            ^ t2[(s1 >> 8) & 0xFF]
+            ^ t3[s0 & 0xFF]
+            ^ k[4],
+            t0[s5 >> 24]
+            ^ t1[(s4 >> 16) & 0xFF]
+            ^ t2[(s2 >> 8) & 0xFF]
+            ^ t3[s1 & 0xFF]
+            ^ k[5],
+            t0[s6 >> 24]
+            ^ t1[(s5 >> 16) & 0xFF]
+            ^ t2[(s3 >> 8) & 0xFF]
+            ^ t3[s2 & 0xFF]
+            ^ k[6],
+            t0[s7 >> 24]
+            ^ t1[(s6 >> 16) & 0xFF]
+            ^ t2[(s4 >> 8) & 0xFF]
+            ^ t3[s3 & 0xFF]
+            ^ k[7],
+        )
+    k = round_keys[_ROUNDS]
+    return [
+        (
+            (sbox[s0 >> 24] << 24)
+            | (sbox[(s7 >> 16) & 0xFF] << 16)
+            | (sbox[(s5 >> 8) & 0xFF] << 8)
+            | sbox[s4 & 0xFF]
+        )
+        ^ k[0],
+        (
+            (sbox[s1 >> 24] << 24)
+            | (sbox[(s0 >> 16) & 0xFF] << 16)
+            | (sbox[(s6 >> 8) & 0xFF] << 8)
+            | sbox[s5 & 0xFF]
+        )
+        ^ k[1],
+        (
+            (sbox[s2 >> 24] << 24)
+            | (sbox[(s1 >> 16) & 0xFF] << 16)
+            | (sbox[(s7 >> 8) & 0xFF] << 8)
+            | sbox[s6 & 0xFF]
+        )
+        ^ k[2],
+        (
+            (sbox[s3 >> 24] << 24)
+            | (sbox[(s2 >> 16) & 0xFF] << 16)
+            | (sbox[(s0 >> 8) & 0xFF] << 8)
+            | sbox[s7 & 0xFF]
+        )
+        ^ k[3],
+        (
+            (sbox[s4 >> 24] << 24)
+            | (sbox[(s3 >> 16) & 0xFF] << 16)
+            | (sbox[(s1 >> 8) & 0xFF] << 8)
+            | sbox[s0 & 0xFF]
+        )
+        ^ k[4],
+        (
+            (sbox[s5 >> 24] << 24)
+            | (sbox[(s4 >> 16) & 0xFF] << 16)
+            | (sbox[(s2 >> 8) & 0xFF] << 8)
+            | sbox[s1 & 0xFF]
+        )
+        ^ k[5],
+        (
+            (sbox[s6 >> 24] << 24)
+            | (sbox[(s5 >> 16) & 0xFF] << 16)
+            | (sbox[(s3 >> 8) & 0xFF] << 8)
+            | sbox[s2 & 0xFF]
+        )
+        ^ k[6],
+        (
+            (sbox[s7 >> 24] << 24)
+            | (sbox[(s6 >> 16) & 0xFF] << 16)
+            | (sbox[(s4 >> 8) & 0xFF] << 8)
+            | sbox[s3 & 0xFF]
+        )
+        ^ k[7],
+    ]
+
+
+class _NumpyDecryptor:
+    """Decrypts all blocks of a frame at once, as CBC decryption allows it."""
+
+    def __init__(self, round_keys: tuple[tuple[int, ...], ...]) -> None:
+        """Convert the round keys and tables to arrays."""
+        self._round_keys = np.array(round_keys, dtype=np.uint32)
+        self._tables = np.array(_T_DECRYPT, dtype=np.uint32)
+        self._sbox = np.array(_SBOX_INV, dtype=np.uint32)
+        self._columns = np.array(_DECRYPT_COLUMNS, dtype=np.intp).T
+
+    def decrypt(self, encrypted: bytes) -> Any:
+        """Return the decrypted blocks as an array of words, without CBC chaining."""
+        state = np.frombuffer(encrypted, dtype=">u4").reshape(-1, _WORDS)
+        state = state.astype(np.uint32) ^ self._round_keys[0]
+        t0, t1, t2, t3 = self._tables
+        a, b, c, d = self._columns
+        for r in range(1, _ROUNDS):
+            state = (
+                t0[state[:, a] >> 24]
+                ^ t1[(state[:, b] >> 16) & 0xFF]
+                ^ t2[(state[:, c] >> 8) & 0xFF]
+                ^ t3[state[:, d] & 0xFF]
+                ^ self._round_keys[r]
+            )
+        sbox = self._sbox
+        return (
+            (sbox[state[:, a] >> 24] << 24)
+            | (sbox[(state[:, b] >> 16) & 0xFF] << 16)
+            | (sbox[(state[:, c] >> 8) & 0xFF] << 8)
+            | sbox[state[:, d] & 0xFF]
+        ) ^ self._round_keys[_ROUNDS]
+
+
+class RSCPCipher:
+    """Rijndael-256 in CBC mode with zero padding, as RSCP frames are encrypted.
+
+    Byte compatible with the cipher of pye3dc, but expands the key only once
+    and uses precomputed round tables. Both directions keep their own CBC
+    state across calls, so consecutive frames and the chunks of a frame are
+    chained as E3DC expects. Multi-block chunks are decrypted with NumPy if
+    it is installed.
+    """
+
+    def __init__(self, key: bytes) -> None:
+        """Initialize the cipher, the key is padded with 0xff like pye3dc does."""
+        if len(key) > KEY_SIZE:
+            raise ValueError(f"RSCP key must not be longer than {KEY_SIZE} bytes")
+        self._encrypt_keys, self._decrypt_keys = _key_schedule(
+            key.ljust(KEY_SIZE, b"\xff")
+        )
+        self._encrypt_iv: list[int] = [0xFFFFFFFF] * _WORDS
+        self._decrypt_iv: list[int] = [0xFFFFFFFF] * _WORDS
+        self._numpy: _NumpyDecryptor | None = (
+            None if np is None else _NumpyDecryptor(self._decrypt_keys)
+        )
+
+    def encrypt(self, plain: bytes) -> bytes:
+        """Encrypt the data, zero padded to full blocks."""
+        if remainder := len(plain) % BLOCK_SIZE:
+            plain += b"\x00" * (BLOCK_SIZE - remainder)
+        words: tuple[int, ...] = struct.unpack(f">{len(plain) // 4}I", plain)
+        keys = self._encrypt_keys
+        state: list[int] = self._encrypt_iv
+        encrypted: list[int] = []
+        for offset in range(0, len(words), _WORDS):
+            state = _encrypt_block(
+                [
+                    word ^ iv
+                    for word, iv in zip(
+                        words[offset : offset + _WORDS], state, strict=True
+                    )
+                ],
+                keys,
+                _T_ENCRYPT,
+                _SBOX,
+            )
+            encrypted.extend(state)
+        self._encrypt_iv = state
+        return struct.pack(f">{len(encrypted)}I", *encrypted)
+
+    def decrypt(self, encrypted: bytes) -> bytes:
+        """Decrypt full blocks, padding is kept as the frame header tells its size."""
+        if len(encrypted) % BLOCK_SIZE:
+            raise ValueError("Encrypted data must consist of full blocks")
+        if not encrypted:
+            return b""
+
+        blocks: int = len(encrypted) // BLOCK_SIZE
+        previous: bytes = struct.pack(_WORDS_FORMAT, *self._decrypt_iv)
+        self._decrypt_iv = list(struct.unpack(_WORDS_FORMAT, encrypted[-BLOCK_SIZE:]))
+
+        if self._numpy is not None and blocks >= _NUMPY_MIN_BLOCKS:
+            chained = np.frombuffer(
+                previous + encrypted[:-BLOCK_SIZE], dtype=">u4"
+            ).reshape(-1, _WORDS)
+            return (self._numpy.decrypt(encrypted) ^ chained).astype(">u4").tobytes()
+
+        words: tuple[int, ...] = struct.unpack(f">{blocks * _WORDS}I", encrypted)
+        chain: tuple[int, ...] = struct.unpack(
+            f">{blocks * _WORDS}I", previous + encrypted[:-BLOCK_SIZE]
+        )
+        keys = self._decrypt_keys
+        decrypted: list[int] = []
+        for offset in range(0, len(words), _WORDS):
+            decrypted.extend(
+                word ^ iv
+                for word, iv in zip(
+                    _decrypt_block(
+                        words[offset : offset + _WORDS], keys, _T_DECRYPT, _SBOX_INV
+                    ),
+                    chain[offset : offset + _WORDS],
+                    strict=True,
+                )
+            )
+        return struct.pack(f">{len(decrypted)}I", *decrypted)
+
+
+def numpy_available() -> bool:
+    """Return True if multi-block frames are decrypted with NumPy."""
+    return np is not None
@@ -21,12 +21,12 @@ from homeassistant.const import (
     UnitOfEnergy,
     UnitOfPower,
     UnitOfTemperature,
+    UnitOfTime,
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     BATTERY_MODULE_RAW_SENSORS,
@@ -34,8 +34,12 @@ from .const import (
     BATTERY_PACK_RAW_SENSORS,
     BATTERY_PACK_CALCULATED_SENSORS,
     DOMAIN,
+    SIGNAL_BATTERIES_IDENTIFIED,
+    SIGNAL_SGREADY_IDENTIFIED,
+    SIGNAL_WALLBOXES_IDENTIFIED,
 )
 from .coordinator import E3DCCoordinator
+from .utils import E3DCEntity, async_add_entities_on_signal
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -411,6 +415,55 @@ SENSOR_DESCRIPTIONS: Final[tuple[E3DCSensorEntityDescription, ...]] = (
         native_unit_of_measurement="W",
         entity_registry_enabled_default=True,
     ),
+    E3DCSensorEntityDescription(
+        key="rscp-poll-duration-p50",
+        translation_key="rscp-poll-duration-p50",
+        icon="mdi:timer-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    E3DCSensorEntityDescription(
+        key="rscp-poll-duration-p95",
+        translation_key="rscp-poll-duration-p95",
+        icon="mdi:timer-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    E3DCSensorEntityDescription(
+        key="rscp-lock-wait-p95",
+        translation_key="rscp-lock-wait-p95",
+        icon="mdi:timer-lock-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    E3DCSensorEntityDescription(
+        key="rscp-call-errors",
+        translation_key="rscp-call-errors",
+        icon="mdi:alert-circle-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+    ),
+    E3DCSensorEntityDescription(
+        key="rscp-reconnects",
+        translation_key="rscp-reconnects",
+        icon="mdi:connection",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+    ),
 )
 
 BATTERY_SENSOR_DESCRIPTION_TEMPLATES: dict[str, dict[str, Any]] = {
@@ -860,29 +913,6 @@ async def async_setup_entry(
         for description in SENSOR_DESCRIPTIONS
     ]
 
-    # Add SG Ready sensors if SG Ready is enabled
-    if coordinator.sgready_available:
-        sgready_state_description = E3DCSensorEntityDescription(
-            key="sgready-state",
-            translation_key="sgready-state",
-            icon="mdi:heat-pump",
-            device_class=SensorDeviceClass.ENUM,
-            options=["locked", "normal", "released", "start_up"],
-        )
-        entities.append(
-            E3DCSensor(coordinator, sgready_state_description, entry.unique_id)
-        )
-
-        sgready_numeric_description = E3DCSensorEntityDescription(
-            key="sgready-numeric-state",
-            translation_key="sgready-numeric-state",
-            icon="mdi:heat-pump",
-            entity_registry_enabled_default=False,
-        )
-        entities.append(
-            E3DCSensor(coordinator, sgready_numeric_description, entry.unique_id)
-        )
-
     # Add Sensor descriptions for additional powermeters, skip root PM
     for powermeter_config in coordinator.proxy.e3dc_config["powermeters"]:
         if powermeter_config["type"] == PowermeterType.PM_TYPE_ROOT.value:
@@ -916,108 +946,70 @@ async def async_setup_entry(
         )
         entities.append(E3DCSensor(coordinator, power_description, entry.unique_id))
 
-    # Create battery pack sensors first, before module sensors
-    # This ensures pack devices are registered before modules reference them via via_device
-    if coordinator.create_battery_devices:
-        for pack in coordinator.battery_packs:
-            pack_unique_id = pack.get("uniqueId", entry.unique_id)
-            pack_device_info = pack.get("deviceInfo")
+    async_add_entities(entities)
 
-            # Add raw sensors
-            for _, slug in BATTERY_PACK_RAW_SENSORS:
-                template = BATTERY_PACK_SENSOR_DESCRIPTION_TEMPLATES.get(slug)
-                if template is None:
-                    continue
+    async_add_entities_on_signal(
+        hass,
+        entry,
+        SIGNAL_SGREADY_IDENTIFIED,
+        async_add_entities,
+        lambda: _create_sgready_entities(coordinator, entry.unique_id),
+    )
+    async_add_entities_on_signal(
+        hass,
+        entry,
+        SIGNAL_WALLBOXES_IDENTIFIED,
+        async_add_entities,
+        lambda: _create_wallbox_entities(coordinator, entry.unique_id),
+    )
+    async_add_entities_on_signal(
+        hass,
+        entry,
+        SIGNAL_BATTERIES_IDENTIFIED,
+        async_add_entities,
+        lambda: _create_battery_entities(coordinator, entry.unique_id),
+    )
 
-                description = E3DCSensorEntityDescription(
-                    has_entity_name=True,
-                    key=f"{pack['key']}-{slug}",
-                    **template,
-                )
-                entities.append(
-                    E3DCSensor(
-                        coordinator,
-                        description,
-                        pack_unique_id,
-                        pack_device_info,
-                    )
-                )
 
-            # Add calculated sensors
-            for slug in BATTERY_PACK_CALCULATED_SENSORS:
-                template = BATTERY_PACK_SENSOR_DESCRIPTION_TEMPLATES.get(slug)
-                if template is None:
-                    continue
+def _create_sgready_entities(
+    coordinator: E3DCCoordinator, unique_id: str
+) -> list["E3DCSensor"]:
+    """Create the SG Ready sensors if SG Ready is enabled."""
+    sgready_entities: list[E3DCSensor] = []
+    if coordinator.sgready_available:
+        sgready_state_description = E3DCSensorEntityDescription(
+            key="sgready-state",
+            translation_key="sgready-state",
+            icon="mdi:heat-pump",
+            device_class=SensorDeviceClass.ENUM,
+            options=["locked", "normal", "released", "start_up"],
+        )
+        sgready_entities.append(
+            E3DCSensor(coordinator, sgready_state_description, unique_id)
+        )
 
-                description = E3DCSensorEntityDescription(
-                    has_entity_name=True,
-                    key=f"{pack['key']}-{slug}",
-                    **template,
-                )
-                entities.append(
-                    E3DCSensor(
-                        coordinator,
-                        description,
-                        pack_unique_id,
-                        pack_device_info,
-                    )
-                )
+        sgready_numeric_description = E3DCSensorEntityDescription(
+            key="sgready-numeric-state",
+            translation_key="sgready-numeric-state",
+            icon="mdi:heat-pump",
+            entity_registry_enabled_default=False,
+        )
+        sgready_entities.append(
+            E3DCSensor(coordinator, sgready_numeric_description, unique_id)
+        )
 
-    # Create battery module sensors after pack sensors
-    # This ensures pack devices exist before modules reference them via via_device
-    for battery in coordinator.batteries:
-        unique_id = list(battery["deviceInfo"]["identifiers"])[0][1]
-        battery_key = battery["key"]
+    return sgready_entities
 
-        # Create raw sensors
-        for _, slug in BATTERY_MODULE_RAW_SENSORS:
-            # Skip soh-reported sensor if device doesn't provide it
-            if slug == "soh-reported" and not battery.get(
-                "hasDeviceReportedSoh", False
-            ):
-                continue
 
-            template = BATTERY_SENSOR_DESCRIPTION_TEMPLATES.get(slug)
-            if template is None:
-                continue
-
-            description = E3DCSensorEntityDescription(
-                has_entity_name=True,
-                key=f"{battery_key}-{slug}",
-                **template,
-            )
-            entities.append(
-                E3DCSensor(
-                    coordinator,
-                    description,
-                    unique_id,
-                    battery["deviceInfo"],
-                )
-            )
-
-        # Create calculated sensors
-        for slug in BATTERY_MODULE_CALCULATED_SENSORS:
-            template = BATTERY_SENSOR_DESCRIPTION_TEMPLATES.get(slug)
-            if template is None:
-                continue
-
-            description = E3DCSensorEntityDescription(
-                has_entity_name=True,
-                key=f"{battery_key}-{slug}",
-                **template,
-            )
-            entities.append(
-                E3DCSensor(
-                    coordinator,
-                    description,
-                    unique_id,
-                    battery["deviceInfo"],
-                )
-            )
+def _create_wallbox_entities(
+    coordinator: E3DCCoordinator, unique_id: str
+) -> list["E3DCSensor"]:
+    """Create the sensors of all identified wallboxes."""
+    wallbox_entities: list[E3DCSensor] = []
 
     for wallbox in coordinator.wallboxes:
         # Get the UID & Key for the given wallbox
-        unique_id = list(wallbox["deviceInfo"]["identifiers"])[0][1]
+        wallbox_unique_id = list(wallbox["deviceInfo"]["identifiers"])[0][1]
         wallbox_key = wallbox["key"]
 
         wallbox_app_software_description = E3DCSensorEntityDescription(
@@ -1028,11 +1020,11 @@ async def async_setup_entry(
             entity_registry_enabled_default=False,
             entity_category=EntityCategory.DIAGNOSTIC,
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCSensor(
                 coordinator,
                 wallbox_app_software_description,
-                unique_id,
+                wallbox_unique_id,
                 wallbox["deviceInfo"],
             )
         )
@@ -1046,11 +1038,11 @@ async def async_setup_entry(
             device_class=SensorDeviceClass.POWER,
             state_class=SensorStateClass.MEASUREMENT,
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCSensor(
                 coordinator,
                 wallbox_consumption_net_description,
-                unique_id,
+                wallbox_unique_id,
                 wallbox["deviceInfo"],
             )
         )
@@ -1064,11 +1056,11 @@ async def async_setup_entry(
             device_class=SensorDeviceClass.POWER,
             state_class=SensorStateClass.MEASUREMENT,
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCSensor(
                 coordinator,
                 wallbox_consumption_sun_description,
-                unique_id,
+                wallbox_unique_id,
                 wallbox["deviceInfo"],
             )
         )
@@ -1083,11 +1075,11 @@ async def async_setup_entry(
             device_class=SensorDeviceClass.ENERGY,
             state_class=SensorStateClass.TOTAL_INCREASING,
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCSensor(
                 coordinator,
                 wallbox_energy_all_description,
-                unique_id,
+                wallbox_unique_id,
                 wallbox["deviceInfo"],
             )
         )
@@ -1102,11 +1094,11 @@ async def async_setup_entry(
             device_class=SensorDeviceClass.ENERGY,
             state_class=SensorStateClass.TOTAL_INCREASING,
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCSensor(
                 coordinator,
                 wallbox_energy_net_description,
-                unique_id,
+                wallbox_unique_id,
                 wallbox["deviceInfo"],
             )
         )
@@ -1121,11 +1113,11 @@ async def async_setup_entry(
             device_class=SensorDeviceClass.ENERGY,
             state_class=SensorStateClass.TOTAL_INCREASING,
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCSensor(
                 coordinator,
                 wallbox_energy_sun_description,
-                unique_id,
+                wallbox_unique_id,
                 wallbox["deviceInfo"],
             )
         )
@@ -1138,9 +1130,12 @@ async def async_setup_entry(
             entity_registry_enabled_default=False,
             entity_category=EntityCategory.DIAGNOSTIC,
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCSensor(
-                coordinator, wallbox_index_description, unique_id, wallbox["deviceInfo"]
+                coordinator,
+                wallbox_index_description,
+                wallbox_unique_id,
+                wallbox["deviceInfo"],
             )
         )
 
@@ -1152,11 +1147,11 @@ async def async_setup_entry(
             device_class=SensorDeviceClass.CURRENT,
             state_class=SensorStateClass.MEASUREMENT,
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCSensor(
                 coordinator,
                 wallbox_max_charge_current_description,
-                unique_id,
+                wallbox_unique_id,
                 wallbox["deviceInfo"],
             )
         )
@@ -1167,11 +1162,11 @@ async def async_setup_entry(
             icon="mdi:sine-wave",
             device_class=None,
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCSensor(
                 coordinator,
                 wallbox_phases_description,
-                unique_id,
+                wallbox_unique_id,
                 wallbox["deviceInfo"],
             )
         )
@@ -1186,9 +1181,12 @@ async def async_setup_entry(
             state_class=SensorStateClass.MEASUREMENT,
             entity_registry_enabled_default=False,
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCSensor(
-                coordinator, wallbox_soc_description, unique_id, wallbox["deviceInfo"]
+                coordinator,
+                wallbox_soc_description,
+                wallbox_unique_id,
+                wallbox["deviceInfo"],
             )
         )
 
@@ -1203,14 +1201,122 @@ async def async_setup_entry(
             device_class=SensorDeviceClass.POWER,
             state_class=SensorStateClass.MEASUREMENT,
         )
-        entities.append(
-            E3DCSensor(coordinator, wallbox_consumption_description, entry.unique_id)
+        wallbox_entities.append(
+            E3DCSensor(coordinator, wallbox_consumption_description, unique_id)
         )
 
-    async_add_entities(entities)
+    return wallbox_entities
+
+
+def _create_battery_entities(
+    coordinator: E3DCCoordinator, unique_id: str
+) -> list["E3DCSensor"]:
+    """Create the sensors of all identified battery packs and modules."""
+    battery_entities: list[E3DCSensor] = []
+
+    # Create battery pack sensors first, before module sensors
+    # This ensures pack devices are registered before modules reference them via via_device
+    if coordinator.create_battery_devices:
+        for pack in coordinator.battery_packs:
+            pack_unique_id = pack.get("uniqueId", unique_id)
+            pack_device_info = pack.get("deviceInfo")
+
+            # Add raw sensors
+            for _, slug in BATTERY_PACK_RAW_SENSORS:
+                template = BATTERY_PACK_SENSOR_DESCRIPTION_TEMPLATES.get(slug)
+                if template is None:
+                    continue
+
+                description = E3DCSensorEntityDescription(
+                    has_entity_name=True,
+                    key=f"{pack['key']}-{slug}",
+                    **template,
+                )
+                battery_entities.append(
+                    E3DCSensor(
+                        coordinator,
+                        description,
+                        pack_unique_id,
+                        pack_device_info,
+                    )
+                )
+
+            # Add calculated sensors
+            for slug in BATTERY_PACK_CALCULATED_SENSORS:
+                template = BATTERY_PACK_SENSOR_DESCRIPTION_TEMPLATES.get(slug)
+                if template is None:
+                    continue
+
+                description = E3DCSensorEntityDescription(
+                    has_entity_name=True,
+                    key=f"{pack['key']}-{slug}",
+                    **template,
+                )
+                battery_entities.append(
+                    E3DCSensor(
+                        coordinator,
+                        description,
+                        pack_unique_id,
+                        pack_device_info,
+                    )
+                )
+
+    # Create battery module sensors after pack sensors
+    # This ensures pack devices exist before modules reference them via via_device
+    for battery in coordinator.batteries:
+        module_unique_id = list(battery["deviceInfo"]["identifiers"])[0][1]
+        battery_key = battery["key"]
+
+        # Create raw sensors
+        for _, slug in BATTERY_MODULE_RAW_SENSORS:
+            # Skip soh-reported sensor if device doesn't provide it
+            if slug == "soh-reported" and not battery.get(
+                "hasDeviceReportedSoh", False
+            ):
+                continue
+
+            template = BATTERY_SENSOR_DESCRIPTION_TEMPLATES.get(slug)
+            if template is None:
+                continue
+
+            description = E3DCSensorEntityDescription(
+                has_entity_name=True,
+                key=f"{battery_key}-{slug}",
+                **template,
+            )
+            battery_entities.append(
+                E3DCSensor(
+                    coordinator,
+                    description,
+                    module_unique_id,
+                    battery["deviceInfo"],
+                )
+            )
+
+        # Create calculated sensors
+        for slug in BATTERY_MODULE_CALCULATED_SENSORS:
+            template = BATTERY_SENSOR_DESCRIPTION_TEMPLATES.get(slug)
+            if template is None:
+                continue
+
+            description = E3DCSensorEntityDescription(
+                has_entity_name=True,
+                key=f"{battery_key}-{slug}",
+                **template,
+            )
+            battery_entities.append(
+                E3DCSensor(
+                    coordinator,
+                    description,
+                    module_unique_id,
+                    battery["deviceInfo"],
+                )
+            )
+
+    return battery_entities
 
 
-class E3DCSensor(CoordinatorEntity, SensorEntity):
+class E3DCSensor(E3DCEntity, SensorEntity):
     """Custom E3DC Sensor implementation."""
 
     _attr_has_entity_name = True
@@ -1223,7 +1329,7 @@ class E3DCSensor(CoordinatorEntity, SensorEntity):
         device_info: DeviceInfo | None = None,
     ) -> None:
         """Initialize the Sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, (description.key,))
         self.coordinator: E3DCCoordinator = coordinator
         self.entity_description: E3DCSensorEntityDescription = description
         self._attr_unique_id = f"{uid}_{description.key}"
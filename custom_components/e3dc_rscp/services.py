@@ -18,6 +18,8 @@ from .const import (
     SERVICE_MANUAL_CHARGE,
     SERVICE_SET_WALLBOX_MAX_CHARGE_CURRENT,
     SERVICE_SET_POWER_MODE,
+    SERVICE_START_CAPTURE,
+    SERVICE_STOP_CAPTURE,
     SetPowerMode,
 )
 from .coordinator import E3DCCoordinator
@@ -32,6 +34,7 @@ ATTR_CHARGE_AMOUNT = "charge_amount"
 ATTR_MAX_CHARGE_CURRENT = "max_charge_current"
 ATTR_POWER_MODE = "power_mode"
 ATTR_POWER_VALUE = "power_value"
+ATTR_INCLUDE_PAYLOADS = "include_payloads"
 
 SCHEMA_CLEAR_POWER_LIMITS = vol.Schema(
     {
@@ -70,6 +73,19 @@ SCHEMA_SET_POWER_MODE = vol.Schema(
     }
 )
 
+SCHEMA_START_CAPTURE = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICEID): str,
+        vol.Optional(ATTR_INCLUDE_PAYLOADS, default=False): bool,
+    }
+)
+
+SCHEMA_STOP_CAPTURE = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICEID): str,
+    }
+)
+
 
 async def async_setup_services(hass: HomeAssistant) -> None:
     """Central hook to register all services, called by component setup."""
@@ -126,6 +142,26 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         schema=SCHEMA_SET_POWER_MODE,
     )
 
+    async def async_call_start_capture(call: ServiceCall) -> None:
+        await _async_start_capture(hass, call)
+
+    hass.services.async_register(
+        domain=DOMAIN,
+        service=SERVICE_START_CAPTURE,
+        service_func=async_call_start_capture,
+        schema=SCHEMA_START_CAPTURE,
+    )
+
+    async def async_call_stop_capture(call: ServiceCall) -> None:
+        await _async_stop_capture(hass, call)
+
+    hass.services.async_register(
+        domain=DOMAIN,
+        service=SERVICE_STOP_CAPTURE,
+        service_func=async_call_stop_capture,
+        schema=SCHEMA_STOP_CAPTURE,
+    )
+
 
 def _resolve_device_id(hass: HomeAssistant, devid: str) -> E3DCCoordinator:
     """Resolve a device ID to its coordinator with caching."""
@@ -279,3 +315,21 @@ async def _async_set_power_mode(hass: HomeAssistant, call: ServiceCall) -> None:
         power_value = None
 
     await coordinator.async_set_power_mode(mode=power_mode_enum, value=power_value)
+
+
+async def _async_start_capture(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Extract service information and relay to coordinator."""
+    coordinator: E3DCCoordinator = _resolve_device_id(
+        hass, call.data.get(ATTR_DEVICEID)
+    )
+    await coordinator.async_start_capture(
+        include_payloads=call.data.get(ATTR_INCLUDE_PAYLOADS, False)
+    )
+
+
+async def _async_stop_capture(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Extract service information and relay to coordinator."""
+    coordinator: E3DCCoordinator = _resolve_device_id(
+        hass, call.data.get(ATTR_DEVICEID)
+    )
+    await coordinator.async_stop_capture()
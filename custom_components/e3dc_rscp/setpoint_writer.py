@@ -0,0 +1,150 @@
+"""Coalescing writes of setpoints for E3DC integration."""
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from contextlib import suppress
+import logging
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class E3DCSetpointWriter:
+    """Writes a single setpoint to E3DC, coalescing bursts to the latest value.
+
+    A write is sent right away if the setpoint is idle. Writes requested while
+    one is in flight or within the debounce time after it are held back and
+    merged, only the resulting value is written once the debounce time has
+    passed. Every caller gets the value finally applied by the write which
+    covered its request.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        write: Callable[[Any], Coroutine[Any, Any, Any]],
+        debounce: float,
+        merge: Callable[[Any, Any], Any] | None = None,
+    ) -> None:
+        """Initialize the writer.
+
+        The write coroutine returns the applied value. By default, a newer
+        value replaces a pending one, merge allows combining both instead.
+        """
+        self._hass: HomeAssistant = hass
+        self._name: str = name
+        self._write: Callable[[Any], Coroutine[Any, Any, Any]] = write
+        self._debounce: float = debounce
+        self._merge: Callable[[Any, Any], Any] | None = merge
+
+        self._pending: Any = None
+        self._future: asyncio.Future | None = None
+        self._task: asyncio.Task | None = None
+        self._last_write: float | None = None
+
+        self._requested: int = 0
+        self._written: int = 0
+        self._coalesced: int = 0
+        self._failures: int = 0
+        self._last_applied: Any = None
+
+    def set_debounce(self, debounce: float) -> None:
+        """Change the debounce time, a write held back right now keeps its delay."""
+        self._debounce = debounce
+
+    async def async_write(self, value: Any) -> Any:
+        """Request writing the value, returns the value finally applied."""
+        self._requested += 1
+        if self._future is None:
+            self._future = self._hass.loop.create_future()
+            # Keeps a failure from being logged as unretrieved if all callers
+            # were cancelled meanwhile.
+            self._future.add_done_callback(_consume_exception)
+            self._pending = value
+        else:
+            self._coalesced += 1
+            self._pending = (
+                value if self._merge is None else self._merge(self._pending, value)
+            )
+            _LOGGER.debug("Coalescing write of %s: %s", self._name, self._pending)
+
+        future: asyncio.Future = self._future
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_run(), f"{DOMAIN} {self._name} setpoint writer"
+            )
+        return await asyncio.shield(future)
+
+    async def async_close(self) -> None:
+        """Cancel the write in flight and drop the held back one.
+
+        Callers still waiting for their write are cancelled.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        # A task cancelled before it started did not clean up itself.
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+        self._pending = None
+        self._task = None
+
+    def get_status(self) -> dict[str, Any]:
+        """Return the write statistics for diagnostics."""
+        return {
+            "requested": self._requested,
+            "written": self._written,
+            "coalesced": self._coalesced,
+            "failures": self._failures,
+            "pending": self._future is not None,
+            "last_applied": self._last_applied,
+        }
+
+    async def _async_run(self) -> None:
+        """Write pending values until there are no more."""
+        try:
+            while self._future is not None:
+                if self._last_write is not None:
+                    delay: float = self._last_write + self._debounce - monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                value: Any = self._pending
+                future: asyncio.Future = self._future
+                self._pending = None
+                self._future = None
+                try:
+                    applied: Any = await self._write(value)
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except Exception as ex:
+                    self._failures += 1
+                    future.set_exception(ex)
+                else:
+                    self._written += 1
+                    self._last_applied = applied
+                    future.set_result(applied)
+                finally:
+                    self._last_write = monotonic()
+        except asyncio.CancelledError:
+            if self._future is not None:
+                self._future.cancel()
+                self._future = None
+            raise
+        finally:
+            self._task = None
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    """Mark the exception of a future as retrieved."""
+    if not future.cancelled():
+        future.exception()
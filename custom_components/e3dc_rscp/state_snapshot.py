@@ -0,0 +1,96 @@
+"""Persistent snapshot of the last known E3DC data."""
+
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+import logging
+from time import monotonic
+from typing import Any, Final
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util.dt import parse_datetime, start_of_local_day, utcnow
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# The snapshot is written at most this often while polling, and on shutdown.
+_SAVE_INTERVAL: Final[float] = 300
+
+# Older snapshots are rather misleading than helpful and are not restored.
+_MAX_AGE: Final[timedelta] = timedelta(days=1)
+
+# Values of these types are kept, everything else is derived or not JSON safe.
+_SCALAR_TYPES: Final[tuple[type, ...]] = (str, int, float, bool)
+
+# The statistics of the current day, reset by E3DC at midnight.
+_DAILY_KEY_PREFIX: Final[str] = "db-day-"
+
+
+class E3DCStateSnapshot:
+    """Keeps the last known data of an E3DC across restarts and reloads.
+
+    Only plain scalar values are kept, so the snapshot stays compact. A
+    snapshot taken before today does not restore the daily statistics.
+    """
+
+    def __init__(self, hass: HomeAssistant, uid: str) -> None:
+        """Initialize the snapshot for the E3DC with the given unique id."""
+        self._uid: str = uid
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{uid}.state"
+        )
+        self._next_save: float = monotonic() + _SAVE_INTERVAL
+
+    async def async_load(self) -> dict[str, Any]:
+        """Return the last known data, empty if there is none or it is too old."""
+        stored: dict[str, Any] | None = await self._store.async_load()
+        if stored is None or stored.get("serial") != self._uid:
+            _LOGGER.debug("No state snapshot for %s", self._uid)
+            return {}
+
+        saved: datetime | None = parse_datetime(stored.get("saved", ""))
+        if saved is None or utcnow() - saved > _MAX_AGE:
+            _LOGGER.debug("State snapshot for %s from %s is too old", self._uid, saved)
+            return {}
+
+        data: dict[str, Any] = stored.get("data", {})
+        if saved < start_of_local_day():
+            data = {
+                key: value
+                for key, value in data.items()
+                if not key.startswith(_DAILY_KEY_PREFIX)
+            }
+        return data
+
+    @callback
+    def async_schedule_save(self, data: Mapping[str, Any]) -> None:
+        """Write the data once the save interval has passed since the last write."""
+        if monotonic() < self._next_save:
+            return
+
+        self._next_save = monotonic() + _SAVE_INTERVAL
+        self._store.async_delay_save(lambda: self._compact(data))
+
+    async def async_save(self, data: Mapping[str, Any]) -> None:
+        """Write the data right away."""
+        self._next_save = monotonic() + _SAVE_INTERVAL
+        await self._store.async_save(self._compact(data))
+
+    async def async_remove(self) -> None:
+        """Remove the snapshot."""
+        await self._store.async_remove()
+
+    def _compact(self, data: Mapping[str, Any]) -> dict[str, Any]:
+        """Return the stored form of the data."""
+        return {
+            "serial": self._uid,
+            "saved": utcnow().isoformat(),
+            "data": {
+                key: value
+                for key, value in data.items()
+                if isinstance(value, _SCALAR_TYPES)
+            },
+        }
@@ -15,10 +15,10 @@ from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_WALLBOXES_IDENTIFIED
 from .coordinator import E3DCCoordinator
+from .utils import E3DCEntity, async_add_entities_on_signal
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,6 +31,8 @@ class E3DCSwitchEntityDescription(SwitchEntityDescription):
     off_icon: str | None = None
     enabling_depends_on_wallbox: bool = False
     available_fn: Callable[[E3DCCoordinator], bool] | None = None
+    # Further data keys available_fn reads, the switch is updated if they change.
+    available_depends_on: tuple[str, ...] = ()
     async_turn_on_action: (
         Callable[[E3DCCoordinator], Coroutine[Any, Any, bool]] | None
     ) = None
@@ -95,6 +97,7 @@ SWITCHES: Final[tuple[E3DCSwitchEntityDescription, ...]] = (
         available_fn=lambda coordinator: (
             not coordinator.data.get("battery-before-car-mode")
         ),
+        available_depends_on=("battery-before-car-mode",),
         async_turn_on_action=lambda coordinator: (
             coordinator.async_set_battery_to_car_mode(True)
         ),
@@ -126,22 +129,40 @@ async def async_setup_entry(
     """Initialize Switch Platform."""
     assert isinstance(entry.unique_id, str)
     coordinator: E3DCCoordinator = hass.data[DOMAIN][entry.unique_id]
-    entities: list[E3DCSwitch] = []
+    entities: list[E3DCSwitch] = [
+        E3DCSwitch(coordinator, description, entry.unique_id)
+        for description in SWITCHES
+        if not description.enabling_depends_on_wallbox
+    ]
+    async_add_entities(entities)
+
+    async_add_entities_on_signal(
+        hass,
+        entry,
+        SIGNAL_WALLBOXES_IDENTIFIED,
+        async_add_entities,
+        lambda: _create_wallbox_entities(coordinator, entry.unique_id),
+    )
+
+
+def _create_wallbox_entities(
+    coordinator: E3DCCoordinator, unique_id: str
+) -> list["E3DCSwitch"]:
+    """Create the switches depending on wallboxes, once they are identified."""
+    wallbox_entities: list[E3DCSwitch] = []
     wallboxes_present = len(coordinator.wallboxes) > 0
     for description in SWITCHES:
         # If enabling_depends_on_wallbox, set entity_registry_enabled_default accordingly
-        if getattr(description, "enabling_depends_on_wallbox", False):
+        if description.enabling_depends_on_wallbox:
             # Create a new instance with the correct flag
             desc = replace(
                 description, entity_registry_enabled_default=wallboxes_present
             )
-            entities.append(E3DCSwitch(coordinator, desc, entry.unique_id))
-        else:
-            entities.append(E3DCSwitch(coordinator, description, entry.unique_id))
+            wallbox_entities.append(E3DCSwitch(coordinator, desc, unique_id))
 
     for wallbox in coordinator.wallboxes:
         # Get the UID & Key for the given wallbox
-        unique_id = list(wallbox["deviceInfo"]["identifiers"])[0][1]
+        wallbox_unique_id = list(wallbox["deviceInfo"]["identifiers"])[0][1]
         wallbox_key = wallbox["key"]
 
         wallbox_sun_mode_description = E3DCSwitchEntityDescription(
@@ -159,11 +180,11 @@ async def async_setup_entry(
                 coordinator.async_set_wallbox_sun_mode(False, index)
             ),
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCSwitch(
                 coordinator,
                 wallbox_sun_mode_description,
-                unique_id,
+                wallbox_unique_id,
                 wallbox["deviceInfo"],
             )
         )
@@ -183,19 +204,19 @@ async def async_setup_entry(
             ),
             entity_registry_enabled_default=False,  # Disabled per default as only Wallbox multi connect I provides this feature
         )
-        entities.append(
+        wallbox_entities.append(
             E3DCSwitch(
                 coordinator,
                 wallbox_schuko_description,
-                unique_id,
+                wallbox_unique_id,
                 wallbox["deviceInfo"],
             )
         )
 
-    async_add_entities(entities)
+    return wallbox_entities
 
 
-class E3DCSwitch(CoordinatorEntity, SwitchEntity):
+class E3DCSwitch(E3DCEntity, SwitchEntity):
     """Custom E3DC Switch Implementation."""
 
     _attr_has_entity_name = True
@@ -208,7 +229,9 @@ class E3DCSwitch(CoordinatorEntity, SwitchEntity):
         device_info: DeviceInfo | None = None,
     ) -> None:
         """Initialize the Switch."""
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator, (description.key, *description.available_depends_on)
+        )
         self.coordinator: E3DCCoordinator = coordinator
         self.entity_description: E3DCSwitchEntityDescription = description
         self._attr_is_on = self.coordinator.data.get(self.entity_description.key)
@@ -253,15 +276,17 @@ class E3DCSwitch(CoordinatorEntity, SwitchEntity):
         """Turn off the switch asynchronnously."""
         if self.entity_description.async_turn_on_action is not None:
             self._attr_is_on = True
-            self.async_write_ha_state()
-            await self.entity_description.async_turn_on_action(self.coordinator)
+            await self._async_write_optimistically(
+                self.entity_description.async_turn_on_action(self.coordinator)
+            )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn on the switch asynchronnously."""
         if self.entity_description.async_turn_off_action is not None:
             self._attr_is_on = False
-            self.async_write_ha_state()
-            await self.entity_description.async_turn_off_action(self.coordinator)
+            await self._async_write_optimistically(
+                self.entity_description.async_turn_off_action(self.coordinator)
+            )
 
     @property
     def device_info(self) -> DeviceInfo:
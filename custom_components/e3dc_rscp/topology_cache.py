@@ -0,0 +1,63 @@
+"""Persistent cache of the discovered E3DC topology."""
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+class E3DCTopologyCache:
+    """Keeps the topology of an E3DC across restarts and reloads.
+
+    The topology covers everything discovered once during startup: powermeter
+    configuration, wallbox identities, battery packs and modules, SG Ready
+    availability and the timezone. It is stored per E3DC, identified by its
+    serial number, and is only valid for the software version it has been
+    discovered with, as a firmware update may change the capabilities.
+    """
+
+    def __init__(self, hass: HomeAssistant, uid: str) -> None:
+        """Initialize the cache for the E3DC with the given unique id."""
+        self._uid: str = uid
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{uid}.topology"
+        )
+
+    async def async_load(self, sw_version: str) -> dict[str, Any] | None:
+        """Return the cached topology, None if there is no valid one."""
+        data: dict[str, Any] | None = await self._store.async_load()
+        if data is None:
+            _LOGGER.debug("No cached topology for %s", self._uid)
+            return None
+
+        if data.get("serial") != self._uid or data.get("sw_version") != sw_version:
+            _LOGGER.debug(
+                "Cached topology for %s is outdated, software version was %s, now is %s",
+                self._uid,
+                data.get("sw_version"),
+                sw_version,
+            )
+            return None
+
+        return data.get("topology", {})
+
+    async def async_save(self, sw_version: str, topology: dict[str, Any]) -> None:
+        """Store the topology discovered with the given software version."""
+        await self._store.async_save(
+            {
+                "serial": self._uid,
+                "sw_version": sw_version,
+                "topology": topology,
+            }
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the cached topology."""
+        await self._store.async_remove()
@@ -1,7 +1,8 @@
 """Utility functions for E3DC RSCP integration."""
 
+from collections.abc import Awaitable, Callable, Iterable
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from .const import CONF_RSCPKEY, DOMAIN
 
@@ -12,7 +13,15 @@ from homeassistant.const import (
     CONF_USERNAME,
     CONF_PORT,
 )
-from homeassistant.config_entries import SOURCE_INTEGRATION_DISCOVERY
+from homeassistant.config_entries import SOURCE_INTEGRATION_DISCOVERY, ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity, EntityDescription
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+if TYPE_CHECKING:
+    from .coordinator import E3DCCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,7 +52,7 @@ async def initialize_farm_controller_flow_if_needed(
     hass, proxy: E3DCProxy, username: str | None, password: str | None, rscp: str | None
 ):
     """Check if farm controller flow needs to be initiated and do so if needed."""
-    remote_control_ip: str | None = proxy.get_remote_control_ip()
+    remote_control_ip: str | None = await proxy.async_get_remote_control_ip()
     _LOGGER.debug(f"Found remote control IP: {remote_control_ip}")
 
     if remote_control_ip:
@@ -86,3 +95,57 @@ async def initialize_farm_controller_flow_if_needed(
                         CONF_RSCPKEY: rscp,
                     },
                 )
+
+
+@callback
+def async_add_entities_on_signal(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    signal: str,
+    async_add_entities: AddEntitiesCallback,
+    create_entities: Callable[[], Iterable[Entity]],
+) -> None:
+    """Add the entities created by the factory whenever the signal of the entry is sent.
+
+    Used by the platforms for subsystems identified after setup, the
+    subscription ends when the entry is unloaded.
+    """
+
+    @callback
+    def _async_add_entities() -> None:
+        async_add_entities(create_entities())
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, signal.format(entry.unique_id), _async_add_entities
+        )
+    )
+
+
+class E3DCEntity(CoordinatorEntity["E3DCCoordinator"]):
+    """Entity showing the value of a single coordinator data key.
+
+    The key is the key of the entity description.
+    """
+
+    coordinator: "E3DCCoordinator"
+    entity_description: EntityDescription
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag a value restored from the last run until E3DC reports it."""
+        if self.coordinator.is_stale(self.entity_description.key):
+            return {"stale": True}
+        return None
+
+    async def _async_write_optimistically(self, write: Awaitable[Any]) -> None:
+        """Show the value already set on the entity while it is being written.
+
+        The entity gets the next update even if its value did not change, so
+        that it reverts if the write did not go through.
+        """
+        self.async_write_ha_state()
+        try:
+            await write
+        finally:
+            self.coordinator.invalidate_key(self.entity_description.key)
@@ -0,0 +1,128 @@
+"""Compare the RSCP cipher of the integration with the one of pye3dc.
+
+Checks that both produce the same bytes for frames of varying size and
+chunking, including the CBC chaining across consecutive frames, then measures
+the cost per frame of both implementations.
+
+Run it via scripts/cipherbench from the repository root.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from pathlib import Path
+import random
+import sys
+import time
+
+from e3dc._RSCPEncryptDecrypt import BLOCK_SIZE, RSCPEncryptDecrypt
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.e3dc_rscp.rscp_cipher import (  # noqa: E402
+    RSCPCipher,
+    numpy_available,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_ROW_FORMAT = "%6s %8s %10s %10s %9s"
+
+
+def _check(rounds: int, rng: random.Random) -> None:
+    """Raise AssertionError if the ciphers differ for any random frame."""
+    for _ in range(rounds):
+        key = os.urandom(rng.randint(0, 32))
+        reference = RSCPEncryptDecrypt(key)
+        cipher = RSCPCipher(key)
+        for numpy in (False, True):
+            if numpy and not numpy_available():
+                continue
+            if not numpy:
+                cipher._numpy = None  # noqa: SLF001
+            for _ in range(5):
+                frame = os.urandom(rng.randint(1, 40 * BLOCK_SIZE))
+                encrypted = cipher.encrypt(frame)
+                assert encrypted == reference.encrypt(frame), "encrypt differs"
+
+                # Decrypt as the transport does, the header block first.
+                decrypted = cipher.decrypt(encrypted[:BLOCK_SIZE])
+                expected = reference.decrypt(encrypted[:BLOCK_SIZE])
+                if len(encrypted) > BLOCK_SIZE:
+                    decrypted += cipher.decrypt(encrypted[BLOCK_SIZE:])
+                    expected = expected.ljust(BLOCK_SIZE, b"\x00")
+                    expected += reference.decrypt(encrypted[BLOCK_SIZE:])
+                assert decrypted.rstrip(b"\x00") == expected.rstrip(b"\x00"), (
+                    "decrypt differs"
+                )
+                assert decrypted[: len(frame)] == frame, "roundtrip failed"
+            cipher = RSCPCipher(key)
+            reference = RSCPEncryptDecrypt(key)
+
+
+def _measure(crypt, data: bytes, repeat: int) -> float:
+    """Return the mean duration of a call in ms."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        crypt(data)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def _bench(repeat: int) -> None:
+    """Print the cost per frame of both ciphers for typical frame sizes."""
+    key = b"benchmark"
+    _LOGGER.info("NumPy available: %s", numpy_available())
+    _LOGGER.info(_ROW_FORMAT, "blocks", "op", "pye3dc ms", "python ms", "numpy ms")
+    for blocks in (1, 4, 16, 64):
+        frame = os.urandom(blocks * BLOCK_SIZE)
+        encrypted = RSCPCipher(key).encrypt(frame)
+
+        reference = RSCPEncryptDecrypt(key)
+        python = RSCPCipher(key)
+        python._numpy = None  # noqa: SLF001
+        _LOGGER.info(
+            _ROW_FORMAT,
+            blocks,
+            "encrypt",
+            f"{_measure(reference.encrypt, frame, repeat):.3f}",
+            f"{_measure(python.encrypt, frame, repeat):.3f}",
+            "-",
+        )
+
+        # pye3dc keeps the previous chunk to derive the IV, reset it every call.
+        reference = RSCPEncryptDecrypt(key)
+
+        def reference_decrypt(data: bytes) -> bytes:
+            reference.oldDecrypt = b""
+            return reference.decrypt(data)
+
+        _LOGGER.info(
+            _ROW_FORMAT,
+            blocks,
+            "decrypt",
+            f"{_measure(reference_decrypt, encrypted, repeat):.3f}",
+            f"{_measure(python.decrypt, encrypted, repeat):.3f}",
+            f"{_measure(RSCPCipher(key).decrypt, encrypted, repeat):.3f}"
+            if numpy_available()
+            else "-",
+        )
+
+
+def main() -> None:
+    """Check compatibility, then benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50, help="random keys to check")
+    parser.add_argument("--repeat", type=int, default=200, help="calls per timing")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    _check(args.rounds, random.Random(args.seed))
+    _LOGGER.info("Byte compatible with pye3dc for %s random keys", args.rounds)
+    _bench(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Replay a capture of RSCP traffic through the coordinator.
+
+Sets up the coordinator the way the integration does, connecting, refreshing
+and identifying the subsystems, but talks to an E3DCReplayTransport instead
+of a real E3DC, then runs the given number of refreshes and reports their
+duration. The refreshes are paced by the coordinator's update interval, as
+the poll groups due depend on the time passed. The captured answer times are
+divided by the speed, zero answers right away and leaves only the cost of the
+integration itself.
+
+The capture has to start with the connection setup, so record it with
+--record against an E3DC or a stand-in. Captures taken with the start_capture
+action begin in the middle of a session and cannot be replayed from scratch.
+
+Run it via scripts/replay from the repository root.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState, current_entry
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_PORT, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from rscp_standin import StandInModel
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.e3dc_rscp.const import (  # noqa: E402
+    CONF_CREATE_BATTERY_DEVICES,
+    CONF_RSCPKEY,
+    DOMAIN,
+)
+from custom_components.e3dc_rscp.coordinator import E3DCCoordinator  # noqa: E402
+from custom_components.e3dc_rscp.e3dc_proxy import (  # noqa: E402
+    E3DCReplayTransport,
+    E3DCTransport,
+    load_capture,
+)
+
+_LOGGER = logging.getLogger("rscp_replay")
+
+
+def _create_entry(args: argparse.Namespace) -> ConfigEntry:
+    """Return a config entry like the one of the config flow."""
+    return ConfigEntry(
+        version=2,
+        minor_version=1,
+        domain=DOMAIN,
+        title="E3DC replay",
+        source="user",
+        data={
+            CONF_HOST: args.host,
+            CONF_PORT: args.port,
+            CONF_USERNAME: args.username,
+            CONF_PASSWORD: args.password,
+            CONF_RSCPKEY: args.key,
+            "farmcontroller": False,
+        },
+        options={CONF_CREATE_BATTERY_DEVICES: args.battery_devices},
+        unique_id=args.serial,
+        discovery_keys={},
+        subentries_data=None,
+    )
+
+
+async def _async_run(
+    hass: HomeAssistant, args: argparse.Namespace, transport: E3DCTransport | None
+) -> list[float]:
+    """Set up the coordinator and return the duration of each refresh."""
+    # The coordinator expects to be set up as part of its config entry.
+    entry = _create_entry(args)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)  # noqa: SLF001
+    current_entry.set(entry)
+    coordinator = E3DCCoordinator(hass, entry, transport)
+    if args.record is not None:
+        await coordinator.proxy.async_start_capture(str(args.record), args.payloads)
+
+    started = time.perf_counter()
+    try:
+        await coordinator.async_connect()
+        await coordinator.async_config_entry_first_refresh()
+        _LOGGER.info("Setup took %.1f ms", (time.perf_counter() - started) * 1000)
+        entry._async_set_state(hass, ConfigEntryState.LOADED, None)  # noqa: SLF001
+
+        started = time.perf_counter()
+        coordinator.async_start_identification()
+        while not coordinator.get_identification_status()["done"]:
+            await asyncio.sleep(0.01)
+        _LOGGER.info(
+            "Identification took %.1f ms: %s",
+            (time.perf_counter() - started) * 1000,
+            coordinator.get_identification_status()["durations"],
+        )
+
+        interval = coordinator.update_interval
+        assert interval is not None
+        durations: list[float] = []
+        for _ in range(args.refreshes):
+            await asyncio.sleep(interval.total_seconds())
+            started = time.perf_counter()
+            await coordinator.async_refresh()
+            durations.append(time.perf_counter() - started)
+            if not coordinator.last_update_success:
+                _LOGGER.warning("Refresh failed: %s", coordinator.last_exception)
+        _LOGGER.debug("Poll status: %s", coordinator.get_poll_status())
+        return durations
+    finally:
+        await coordinator.async_shutdown()
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Replay or record the capture with a throwaway Home Assistant instance."""
+    transport: E3DCTransport | None = None
+    if args.record is None:
+        exchanges: list[dict[str, Any]] = load_capture(str(args.capture))
+        _LOGGER.info("Loaded %s exchanges of %s", len(exchanges), args.capture)
+        transport = E3DCReplayTransport(exchanges, args.speed)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        try:
+            durations = await _async_run(hass, args, transport)
+        finally:
+            await hass.async_stop(force=True)
+
+    if durations:
+        _LOGGER.info(
+            "%s refreshes: min %.1f ms, median %.1f ms, max %.1f ms",
+            len(durations),
+            min(durations) * 1000,
+            statistics.median(durations) * 1000,
+            max(durations) * 1000,
+        )
+
+
+def main() -> None:
+    """Parse the command line and run the replay."""
+    defaults = StandInModel()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", type=Path, nargs="?", help="capture to replay")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1,
+        help="divisor of the captured answer times, 0 answers right away",
+    )
+    parser.add_argument("--refreshes", type=int, default=30)
+    parser.add_argument("--serial", default="replay", help="unique id of the entry")
+    parser.add_argument(
+        "--no-battery-devices", dest="battery_devices", action="store_false"
+    )
+    parser.add_argument(
+        "--record",
+        type=Path,
+        help="record a capture into this file instead of replaying one",
+    )
+    parser.add_argument("--payloads", action="store_true", help="record payloads")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5033)
+    parser.add_argument("--username", default=defaults.username)
+    parser.add_argument("--password", default=defaults.password)
+    parser.add_argument("--key", default=defaults.key, help="RSCP key")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+    if (args.capture is None) == (args.record is None):
+        parser.error("give either a capture to replay or --record")
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    if not args.verbose:
+        logging.getLogger("custom_components").setLevel(logging.WARNING)
+    asyncio.run(_async_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1069 @@
+"""Local stand-in for an E3DC, speaking the encrypted RSCP protocol.
+
+The stand-in answers the requests the integration sends to a real E3DC from a
+configurable model: wallboxes, battery packs with their modules, additional
+powermeters, SG Ready and farm setups. Writes change the model, so that the
+next poll reports them back. Latency, dropped connections and error answers
+can be injected to exercise the error handling and to benchmark changes
+without a physical E3DC.
+
+Run it via scripts/standin and point the integration to its host and port,
+using the credentials and RSCP key given on the command line.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+import math
+import random
+import struct
+import time
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from e3dc._RSCPEncryptDecrypt import BLOCK_SIZE, RSCPEncryptDecrypt
+from e3dc._rscpLib import (
+    rscpDecode,
+    rscpEncode,
+    rscpFrame,
+    rscpFrameDecode,
+    endianSwapUint16,
+)
+from e3dc._rscpTags import (
+    PowermeterType,
+    RscpError,
+    RscpTag,
+    RscpType,
+    getHexRscpTag,
+)
+
+_LOGGER = logging.getLogger("rscp_standin")
+
+RscpMessage = tuple[str, str, Any]
+
+_FRAME_MAGIC = 0xE3DC
+_FRAME_HEADER_FORMAT = "<HHIIIH"
+_FRAME_HEADER_SIZE = struct.calcsize(_FRAME_HEADER_FORMAT)
+_FRAME_CTRL_CRC = 0x10
+
+_MAX_POWERMETERS = 8
+_USER_LEVEL = 10
+
+# Bits of EMS_SYS_STATUS, see _SYSTEM_STATUS_BITS in e3dc_proxy.py.
+_STATUS_DCDC_ALIVE = 1 << 0
+_STATUS_POWERMETER_ALIVE = 1 << 1
+_STATUS_BATTERY_ALIVE = 1 << 2
+_STATUS_PV_ALIVE = 1 << 3
+_STATUS_PV_INVERTER_INITED = 1 << 4
+_STATUS_SERVER_CONNECTION_ALIVE = 1 << 5
+_STATUS_EMS_ALIVE = 1 << 7
+_STATUS_WALLBOX_ALIVE = 1 << 14
+_STATUS_POWERSAVE_ENABLED = 1 << 15
+
+
+@dataclass
+class StandInModel:
+    """Configuration of the simulated E3DC."""
+
+    username: str = "standin@example.com"
+    password: str = "standin"
+    key: str = "standin"
+    serial_number: str = "721234056789"
+    sw_release: str = "S10_2025_001"
+    timezone: str = "Europe/Berlin"
+    farm_controller: bool = False
+    remote_control: str = ""
+    installed_peak_power: int = 9800
+    wallboxes: int = 1
+    batteries: list[int] = field(default_factory=lambda: [3])
+    powermeters: list[PowermeterType] = field(default_factory=list)
+    sgready: bool = True
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    drop_rate: float = 0.0
+    unavailable: set[str] = field(default_factory=set)
+
+    @property
+    def serial(self) -> str:
+        """Return the serial as reported by INFO_SERIAL_NUMBER.
+
+        The sixth last digit marks farm controllers, see the config flow.
+        """
+        digits = list(self.serial_number)
+        digits[-6] = "1" if self.farm_controller else "0"
+        return "S10-" + "".join(digits)
+
+
+@dataclass
+class _Wallbox:
+    """State of a simulated wallbox."""
+
+    index: int
+    sun_mode: bool = True
+    charging: bool = False
+    phases: int = 3
+    max_current: int = 16
+    schuko: bool = False
+    energy_sun: float = 0.0
+    energy_net: float = 0.0
+
+    @property
+    def power(self) -> int:
+        """Return the current charging power."""
+        return self.phases * 230 * self.max_current if self.charging else 0
+
+
+@dataclass
+class _State:
+    """Mutable state of the simulated E3DC, changed by writes and time."""
+
+    soc: float = 55.0
+    set_power_mode: int = 0
+    set_power_value: int = 0
+    power_limits_used: bool = False
+    max_charge_power: int = 4500
+    max_discharge_power: int = 4500
+    discharge_start_power: int = 65
+    powersave_enabled: bool = True
+    weather_regulated_charge_enabled: bool = False
+    manual_charge_active: bool = False
+    manual_charge_energy: float = 0.0
+    battery_before_car_mode: int = 0
+    battery_to_car_mode: int = 1
+    wb_discharge_bat_until: int = 80
+    wallbox_enforce_power_assignment: bool = False
+    sgready_state: int = 2
+    wallboxes: dict[int, _Wallbox] = field(default_factory=dict)
+    pm_energy: dict[int, float] = field(default_factory=dict)
+    updated: float = field(default_factory=time.time)
+
+
+def _response_tag(tag: str) -> str:
+    """Return the tag E3DC answers a request tag with."""
+    return tag.replace("_REQ_", "_", 1)
+
+
+def _error(tag: str, error: RscpError) -> RscpMessage:
+    """Build an error answer."""
+    return (tag, RscpType.Error.name, error.value.to_bytes(4, "little"))
+
+
+def _extern_data(tag: str, data: bytes) -> RscpMessage:
+    """Wrap raw wallbox data the way E3DC returns it."""
+    return (
+        tag,
+        RscpType.Container.name,
+        [
+            ("WB_EXTERN_DATA", RscpType.ByteArray.name, data),
+            ("WB_EXTERN_DATA_LEN", RscpType.UChar8.name, len(data)),
+        ],
+    )
+
+
+def _encode(message: RscpMessage) -> bytes:
+    """RSCP encode a message.
+
+    rscpEncode cannot encode timestamps, E3DC transfers them as seconds and
+    nanoseconds, which rscpDecode adds up again.
+    """
+    tag, rscp_type, value = message
+    if rscp_type == RscpType.Timestamp.name:
+        seconds = int(value)
+        return struct.pack(
+            "<IBHiii",
+            getHexRscpTag(tag),
+            RscpType.Timestamp.value,
+            12,
+            0,
+            seconds,
+            int((value - seconds) * 1e9),
+        )
+    if rscp_type == RscpType.Container.name:
+        data = b"".join(_encode(item) for item in value)
+        return struct.pack(
+            f"<IBH{len(data)}s",
+            getHexRscpTag(tag),
+            RscpType.Container.value,
+            len(data),
+            data,
+        )
+    return rscpEncode(message)
+
+
+class E3DCStandIn:
+    """Answers RSCP requests from a StandInModel."""
+
+    def __init__(self, model: StandInModel) -> None:
+        """Initialize the stand-in with the initial state of the model."""
+        self.model: StandInModel = model
+        self._state: _State = _State(
+            wallboxes={index: _Wallbox(index) for index in range(model.wallboxes)},
+            pm_energy=dict.fromkeys(range(len(model.powermeters) + 1), 0.0),
+        )
+        self._readings: dict[str, float] = {}
+        self._update()
+
+        self._handlers: dict[str, Any] = {
+            "BAT_REQ_DATA": self._handle_battery,
+            "DB_REQ_HISTORY_DATA_DAY": self._handle_db_history,
+            "EMS_REQ_GET_MANUAL_CHARGE": self._handle_manual_charge,
+            "EMS_REQ_GET_POWER_SETTINGS": self._handle_power_settings,
+            "EMS_REQ_GET_SYS_SPECS": self._handle_sys_specs,
+            "EMS_REQ_SET_BATTERY_BEFORE_CAR_MODE": self._handle_set_ems_setting,
+            "EMS_REQ_SET_BATTERY_TO_CAR_MODE": self._handle_set_ems_setting,
+            "EMS_REQ_SET_POWER": self._handle_set_power,
+            "EMS_REQ_SET_POWER_SETTINGS": self._handle_set_power_settings,
+            "EMS_REQ_SET_WALLBOX_ENFORCE_POWER_ASSIGNMENT": self._handle_set_ems_setting,
+            "EMS_REQ_SET_WB_DISCHARGE_BAT_UNTIL": self._handle_set_ems_setting,
+            "EMS_REQ_START_MANUAL_CHARGE": self._handle_start_manual_charge,
+            "PM_REQ_DATA": self._handle_powermeter,
+            "SGR_REQ_DATA": self._handle_sgready,
+            "WB_REQ_DATA": self._handle_wallbox,
+        }
+
+    def answer(self, request: RscpMessage) -> RscpMessage:
+        """Answer a single request of an authenticated session."""
+        tag = request[0]
+        if tag in self.model.unavailable:
+            return _error(_response_tag(tag), RscpError.RSCP_ERR_NOT_AVAILABLE)
+        if random.random() < self.model.error_rate:
+            return _error(_response_tag(tag), RscpError.RSCP_ERR_AGAIN)
+
+        self._update()
+        if tag in self._handlers:
+            return self._handlers[tag](request)
+        if (value := self._simple_values().get(tag)) is not None:
+            return (_response_tag(tag), *value)
+        _LOGGER.debug("Unhandled request %s", tag)
+        return _error(_response_tag(tag), RscpError.RSCP_ERR_NOT_AVAILABLE)
+
+    def _update(self) -> None:
+        """Advance the simulation up to now."""
+        state = self._state
+        now = time.time()
+        hours = (now - state.updated) / 3600
+        state.updated = now
+
+        local = datetime.fromtimestamp(now, ZoneInfo(self.model.timezone))
+        daytime = local.hour + local.minute / 60
+        solar = self.model.installed_peak_power * max(
+            0.0, math.sin(math.pi * (daytime - 6) / 14)
+        )
+        home = 350 + 150 * math.sin(now / 600)
+        wallbox = sum(wb.power for wb in state.wallboxes.values())
+        add = (
+            -250
+            if PowermeterType.PM_TYPE_ADDITIONAL_PRODUCTION in (self.model.powermeters)
+            else 0
+        )
+
+        # Positive battery power charges the battery.
+        surplus = solar - add - home - wallbox
+        if state.manual_charge_active:
+            battery = state.max_charge_power
+        elif state.set_power_mode == 1:
+            battery = 0
+        elif state.set_power_mode == 2:
+            battery = -state.set_power_value
+        elif state.set_power_mode in (3, 4):
+            battery = state.set_power_value
+        else:
+            battery = min(
+                max(surplus, -state.max_discharge_power), state.max_charge_power
+            )
+        if (battery > 0 and state.soc >= 100) or (battery < 0 and state.soc <= 0):
+            battery = 0
+
+        capacity = max(self._capacity(), 1)
+        state.soc = min(max(state.soc + battery * hours / capacity * 100, 0.0), 100.0)
+        if state.manual_charge_active:
+            state.manual_charge_energy += battery * hours / 3650
+        for wb in state.wallboxes.values():
+            if wb.sun_mode:
+                wb.energy_sun += wb.power * hours
+            else:
+                wb.energy_net += wb.power * hours
+        for index in state.pm_energy:
+            state.pm_energy[index] += abs(add if index else home) * hours
+
+        grid = home + wallbox + battery - solar + add
+        consumption = home + wallbox + max(battery, 0)
+        autarky = 1 - max(grid, 0) / consumption
+        self_consumption = 1 - max(-grid, 0) / solar if solar > 0 else 0
+        self._readings = {
+            "solar": solar,
+            "add": add,
+            "home": home,
+            "wallbox": wallbox,
+            "battery": battery,
+            "grid": grid,
+            "autarky": min(max(autarky * 100, 0.0), 100.0),
+            "self_consumption": min(max(self_consumption * 100, 0.0), 100.0),
+        }
+
+    def _capacity(self) -> float:
+        """Return the installed battery capacity in Wh."""
+        return sum(self.model.batteries) * 2500.0
+
+    def _system_status(self) -> int:
+        """Return the EMS_SYS_STATUS bitfield."""
+        status = (
+            _STATUS_DCDC_ALIVE
+            | _STATUS_POWERMETER_ALIVE
+            | _STATUS_PV_ALIVE
+            | _STATUS_PV_INVERTER_INITED
+            | _STATUS_SERVER_CONNECTION_ALIVE
+            | _STATUS_EMS_ALIVE
+        )
+        if self.model.batteries:
+            status |= _STATUS_BATTERY_ALIVE
+        if self.model.wallboxes:
+            status |= _STATUS_WALLBOX_ALIVE
+        if self._state.powersave_enabled:
+            status |= _STATUS_POWERSAVE_ENABLED
+        return status
+
+    def _power_mode(self) -> int:
+        """Return EMS_MODE, which reports what the E3DC is currently doing."""
+        battery = self._readings["battery"]
+        if battery > 0:
+            return 2
+        if battery < 0:
+            return 1
+        return 0
+
+    def _simple_values(self) -> dict[str, tuple[str, Any]]:
+        """Return type and value of all requests answered with a single value."""
+        model = self.model
+        state = self._state
+        readings = self._readings
+        now = time.time()
+        offset = datetime.now(ZoneInfo(model.timezone)).utcoffset()
+        return {
+            "EMS_REQ_AUTARKY": ("Float32", readings["autarky"]),
+            "EMS_REQ_BAT_SOC": ("UChar8", round(state.soc)),
+            "EMS_REQ_BATTERY_BEFORE_CAR_MODE": (
+                "UChar8",
+                state.battery_before_car_mode,
+            ),
+            "EMS_REQ_BATTERY_TO_CAR_MODE": ("UChar8", state.battery_to_car_mode),
+            "EMS_REQ_DERATE_AT_PERCENT_VALUE": ("Float32", 0.7),
+            "EMS_REQ_DERATE_AT_POWER_VALUE": (
+                "Float32",
+                model.installed_peak_power * 0.7,
+            ),
+            "EMS_REQ_EXT_SRC_AVAILABLE": ("UChar8", int(bool(model.powermeters))),
+            "EMS_REQ_GET_WALLBOX_ENFORCE_POWER_ASSIGNMENT": (
+                "Bool",
+                state.wallbox_enforce_power_assignment,
+            ),
+            "EMS_REQ_GET_WB_DISCHARGE_BAT_UNTIL": (
+                "UChar8",
+                state.wb_discharge_bat_until,
+            ),
+            "EMS_REQ_INSTALLED_PEAK_POWER": ("Uint32", model.installed_peak_power),
+            "EMS_REQ_IP_REMOTE_CONTROL": ("CString", model.remote_control),
+            "EMS_REQ_MODE": ("UChar8", self._power_mode()),
+            "EMS_REQ_POWER_ADD": ("Int32", round(readings["add"])),
+            "EMS_REQ_POWER_BAT": ("Int32", round(readings["battery"])),
+            "EMS_REQ_POWER_GRID": ("Int32", round(readings["grid"])),
+            "EMS_REQ_POWER_HOME": ("Int32", round(readings["home"])),
+            "EMS_REQ_POWER_PV": ("Int32", round(readings["solar"])),
+            "EMS_REQ_POWER_WB_ALL": ("Int32", round(readings["wallbox"])),
+            "EMS_REQ_SELF_CONSUMPTION": ("Float32", readings["self_consumption"]),
+            "EMS_REQ_SYS_STATUS": ("Uint32", self._system_status()),
+            "INFO_REQ_IP_ADDRESS": ("CString", "127.0.0.1"),
+            "INFO_REQ_MAC_ADDRESS": ("CString", "00:00:5e:00:53:01"),
+            "INFO_REQ_SERIAL_NUMBER": ("CString", model.serial),
+            "INFO_REQ_SW_RELEASE": ("CString", model.sw_release),
+            "INFO_REQ_TIME": ("Timestamp", now + offset.total_seconds()),
+            "INFO_REQ_TIME_ZONE": ("CString", model.timezone),
+            "INFO_REQ_UTC_TIME": ("Timestamp", now),
+        }
+
+    def _handle_sys_specs(self, request: RscpMessage) -> RscpMessage:
+        """Answer EMS_REQ_GET_SYS_SPECS."""
+        specs = {
+            "hybridModeSupported": 1,
+            "installedBatteryCapacity": round(self._capacity()),
+            "maxAcPower": 12000,
+            "maxBatChargePower": 4500,
+            "maxBatDischargPower": 4500,
+            "maxChargePower": 4500,
+            "maxDischargePower": 4500,
+            "maxFbcChargePower": 4500,
+            "maxFbcDischargePower": 4500,
+            "maxPvPower": self.model.installed_peak_power,
+            "maxStartChargePower": 65,
+            "maxStartDischargePower": 65,
+            "minStartChargePower": 65,
+            "minStartDischargePower": 65,
+            "recommendedMinChargeLimit": 300,
+            "recommendedMinDischargeLimit": 300,
+            "startChargeDefault": 65,
+            "startDischargeDefault": 65,
+        }
+        return (
+            "EMS_GET_SYS_SPECS",
+            RscpType.Container.name,
+            [
+                (
+                    "EMS_SYS_SPEC",
+                    RscpType.Container.name,
+                    [
+                        ("EMS_SYS_SPEC_INDEX", RscpType.Int32.name, index),
+                        ("EMS_SYS_SPEC_NAME", RscpType.CString.name, name),
+                        ("EMS_SYS_SPEC_VALUE_INT", RscpType.Int32.name, value),
+                    ],
+                )
+                for index, (name, value) in enumerate(specs.items())
+            ],
+        )
+
+    def _handle_power_settings(self, request: RscpMessage) -> RscpMessage:
+        """Answer EMS_REQ_GET_POWER_SETTINGS."""
+        state = self._state
+        return (
+            "EMS_GET_POWER_SETTINGS",
+            RscpType.Container.name,
+            [
+                ("EMS_POWER_LIMITS_USED", "Bool", state.power_limits_used),
+                ("EMS_MAX_CHARGE_POWER", "Uint32", state.max_charge_power),
+                ("EMS_MAX_DISCHARGE_POWER", "Uint32", state.max_discharge_power),
+                ("EMS_DISCHARGE_START_POWER", "Uint32", state.discharge_start_power),
+                ("EMS_POWERSAVE_ENABLED", "Bool", state.powersave_enabled),
+                (
+                    "EMS_WEATHER_REGULATED_CHARGE_ENABLED",
+                    "Bool",
+                    state.weather_regulated_charge_enabled,
+                ),
+                ("EMS_WEATHER_FORECAST_MODE", "Int32", 1),
+            ],
+        )
+
+    def _handle_set_power_settings(self, request: RscpMessage) -> RscpMessage:
+        """Apply EMS_REQ_SET_POWER_SETTINGS, answering a result code per setting."""
+        state = self._state
+        results: list[RscpMessage] = []
+        for tag, _, value in request[2]:
+            if tag == "EMS_POWER_LIMITS_USED":
+                state.power_limits_used = bool(value)
+            elif tag == "EMS_MAX_CHARGE_POWER":
+                state.max_charge_power = value
+            elif tag == "EMS_MAX_DISCHARGE_POWER":
+                state.max_discharge_power = value
+            elif tag == "EMS_DISCHARGE_START_POWER":
+                state.discharge_start_power = value
+            elif tag == "EMS_POWERSAVE_ENABLED":
+                state.powersave_enabled = bool(value)
+            elif tag == "EMS_WEATHER_REGULATED_CHARGE_ENABLED":
+                state.weather_regulated_charge_enabled = bool(value)
+            else:
+                results.append((tag.replace("EMS_", "EMS_RES_", 1), "Char8", -1))
+                continue
+            results.append((tag.replace("EMS_", "EMS_RES_", 1), "Char8", 0))
+        return ("EMS_SET_POWER_SETTINGS", RscpType.Container.name, results)
+
+    def _handle_set_power(self, request: RscpMessage) -> RscpMessage:
+        """Apply EMS_REQ_SET_POWER."""
+        settings = {tag: value for tag, _, value in request[2]}
+        self._state.set_power_mode = settings.get("EMS_REQ_SET_POWER_MODE", 0)
+        self._state.set_power_value = settings.get("EMS_REQ_SET_POWER_VALUE", 0)
+        self._update()
+        return ("EMS_SET_POWER", "Int32", round(self._readings["battery"]))
+
+    def _handle_set_ems_setting(self, request: RscpMessage) -> RscpMessage:
+        """Apply one of the wallbox related EMS settings."""
+        state = self._state
+        tag, _, value = request
+        if tag == "EMS_REQ_SET_BATTERY_BEFORE_CAR_MODE":
+            state.battery_before_car_mode = value
+        elif tag == "EMS_REQ_SET_BATTERY_TO_CAR_MODE":
+            state.battery_to_car_mode = value
+        elif tag == "EMS_REQ_SET_WALLBOX_ENFORCE_POWER_ASSIGNMENT":
+            state.wallbox_enforce_power_assignment = value
+            return ("EMS_SET_WALLBOX_ENFORCE_POWER_ASSIGNMENT", "Bool", value)
+        else:
+            # E3DC answers this one with the battery before car mode.
+            state.wb_discharge_bat_until = value
+            return (
+                "EMS_SET_BATTERY_BEFORE_CAR_MODE",
+                "UChar8",
+                state.battery_before_car_mode,
+            )
+        return (_response_tag(tag), "UChar8", value)
+
+    def _handle_manual_charge(self, request: RscpMessage) -> RscpMessage:
+        """Answer EMS_REQ_GET_MANUAL_CHARGE."""
+        state = self._state
+        return (
+            "EMS_GET_MANUAL_CHARGE",
+            RscpType.Container.name,
+            [
+                ("EMS_MANUAL_CHARGE_ACTIVE", "Bool", state.manual_charge_active),
+                (
+                    "EMS_MANUAL_CHARGE_ENERGY_COUNTER",
+                    "Double64",
+                    state.manual_charge_energy,
+                ),
+            ],
+        )
+
+    def _handle_start_manual_charge(self, request: RscpMessage) -> RscpMessage:
+        """Apply EMS_REQ_START_MANUAL_CHARGE, zero stops charging."""
+        self._state.manual_charge_active = request[2] > 0
+        self._state.manual_charge_energy = 0.0
+        return ("EMS_START_MANUAL_CHARGE", "Bool", True)
+
+    def _handle_sgready(self, request: RscpMessage) -> RscpMessage:
+        """Answer SGR_REQ_DATA."""
+        if not self.model.sgready:
+            return _error("SGR_DATA", RscpError.RSCP_ERR_NOT_AVAILABLE)
+        return (
+            "SGR_DATA",
+            RscpType.Container.name,
+            [
+                ("SGR_INDEX", "Uint16", 0),
+                ("SGR_AKTIV", "Bool", True),
+                ("SGR_STATE", "UChar8", self._state.sgready_state),
+            ],
+        )
+
+    def _handle_powermeter(self, request: RscpMessage) -> RscpMessage:
+        """Answer PM_REQ_DATA, unknown powermeters only echo their index."""
+        index, *sub_requests = request[2]
+        pm_index = index[2]
+        result: list[RscpMessage] = [("PM_INDEX", "Uint16", pm_index)]
+        types = [PowermeterType.PM_TYPE_ROOT, *self.model.powermeters]
+        if pm_index >= min(len(types), _MAX_POWERMETERS):
+            return ("PM_DATA", RscpType.Container.name, result)
+
+        power = abs(self._readings["add"]) if pm_index else self._readings["grid"]
+        energy = self._state.pm_energy[pm_index]
+        values: dict[str, tuple[str, Any]] = {
+            "PM_REQ_TYPE": ("UChar8", types[pm_index].value),
+            "PM_REQ_MODE": ("UChar8", 1),
+            "PM_REQ_ACTIVE_PHASES": ("UChar8", 7),
+            "PM_REQ_MAX_PHASE_POWER": ("Double64", 11000.0),
+        }
+        for phase in (1, 2, 3):
+            values[f"PM_REQ_POWER_L{phase}"] = ("Double64", power / 3)
+            values[f"PM_REQ_ENERGY_L{phase}"] = ("Double64", energy / 3)
+            values[f"PM_REQ_VOLTAGE_L{phase}"] = ("Float32", 230.0)
+        for tag, _, _ in sub_requests:
+            if tag in values:
+                result.append((_response_tag(tag), *values[tag]))
+            else:
+                result.append(
+                    _error(_response_tag(tag), RscpError.RSCP_ERR_NOT_AVAILABLE)
+                )
+        return ("PM_DATA", RscpType.Container.name, result)
+
+    def _handle_wallbox(self, request: RscpMessage) -> RscpMessage:
+        """Answer WB_REQ_DATA, unknown wallboxes only echo their index."""
+        index, *sub_requests = request[2]
+        wb_index = index[2]
+        result: list[RscpMessage] = [("WB_INDEX", "UChar8", wb_index)]
+        wallbox = self._state.wallboxes.get(wb_index)
+
+        for tag, _, value in sub_requests:
+            if tag in ("WB_REQ_SET_EXTERN", "WB_REQ_SET_PARAM_1"):
+                if wallbox is None:
+                    result.append(
+                        _error(_response_tag(tag), RscpError.RSCP_ERR_NOT_AVAILABLE)
+                    )
+                    continue
+                self._set_wallbox(wallbox, tag, value[0][2])
+                result.append((_response_tag(tag), "UChar8", 0))
+            elif wallbox is not None:
+                result.append(self._wallbox_value(wallbox, tag))
+        return ("WB_DATA", RscpType.Container.name, result)
+
+    def _set_wallbox(self, wallbox: _Wallbox, tag: str, data: bytes) -> None:
+        """Apply the WB_EXTERN_DATA of a set request, see E3DC.sendWallboxRequest()."""
+        if tag == "WB_REQ_SET_PARAM_1":
+            wallbox.max_current = min(max(data[2], 6), 32)
+            return
+        if data[0]:
+            wallbox.sun_mode = data[0] == 1
+        if data[3]:
+            wallbox.phases = 1 if wallbox.phases == 3 else 3
+        if data[4]:
+            wallbox.charging = not wallbox.charging
+        wallbox.schuko = data[5] != 0
+
+    def _wallbox_value(self, wallbox: _Wallbox, tag: str) -> RscpMessage:
+        """Answer a single wallbox request."""
+        response = _response_tag(tag)
+        if tag == "WB_REQ_EXTERN_DATA_ALG":
+            status = 8 | 16  # plugged and locked
+            if wallbox.sun_mode:
+                status |= 128
+            if wallbox.charging:
+                status |= 32
+            return _extern_data(
+                response,
+                bytes(
+                    [0, wallbox.phases, status, wallbox.max_current, 0, wallbox.schuko]
+                ),
+            )
+        if tag == "WB_REQ_EXTERN_DATA_SUN":
+            power = wallbox.power if wallbox.sun_mode else 0
+            return _extern_data(
+                response, struct.pack("<hi", power, int(wallbox.energy_sun))
+            )
+        if tag == "WB_REQ_EXTERN_DATA_NET":
+            power = 0 if wallbox.sun_mode else wallbox.power
+            return _extern_data(
+                response, struct.pack("<hi", power, int(wallbox.energy_net))
+            )
+
+        values: dict[str, tuple[str, Any]] = {
+            "WB_REQ_APP_SOFTWARE": ("Uint32", 0x0521),
+            "WB_REQ_DEVICE_NAME": ("CString", f"Wallbox {wallbox.index + 1}"),
+            "WB_REQ_FIRMWARE_VERSION": ("CString", "1.21"),
+            "WB_REQ_KEY_STATE": ("UChar8", 0),
+            "WB_REQ_LOWER_CURRENT_LIMIT": ("UChar8", 6),
+            "WB_REQ_MAC_ADDRESS": (
+                "CString",
+                f"00:00:5e:00:53:{wallbox.index + 16:02x}",
+            ),
+            "WB_REQ_SERIAL": (
+                "CString",
+                f"WB{self.model.serial_number}{wallbox.index}",
+            ),
+            "WB_REQ_UPPER_CURRENT_LIMIT": ("UChar8", 32),
+            "WB_REQ_WALLBOX_TYPE": ("Int32", 6),
+        }
+        if tag in values:
+            return (response, *values[tag])
+        return _error(response, RscpError.RSCP_ERR_NOT_AVAILABLE)
+
+    def _handle_battery(self, request: RscpMessage) -> RscpMessage:
+        """Answer BAT_REQ_DATA for a pack or one of its modules."""
+        index, *sub_requests = request[2]
+        bat_index = index[2]
+        if bat_index >= len(self.model.batteries):
+            return _error("BAT_DATA", RscpError.RSCP_ERR_NOT_AVAILABLE)
+
+        dcb_count = self.model.batteries[bat_index]
+        result: list[RscpMessage] = [("BAT_INDEX", "Uint16", bat_index)]
+        values = self._battery_values(dcb_count)
+        for tag, _, value in sub_requests:
+            response = _response_tag(tag)
+            if tag.startswith("BAT_REQ_DCB_") and tag != "BAT_REQ_DCB_COUNT":
+                if value >= dcb_count:
+                    result.append(_error(response, RscpError.RSCP_ERR_OUT_OF_BOUNDS))
+                else:
+                    result.append(self._battery_dcb_value(response, value, dcb_count))
+            elif tag == "BAT_REQ_DEVICE_STATE":
+                result.append(
+                    (
+                        response,
+                        RscpType.Container.name,
+                        [
+                            ("BAT_DEVICE_CONNECTED", "Bool", True),
+                            ("BAT_DEVICE_WORKING", "Bool", True),
+                            ("BAT_DEVICE_IN_SERVICE", "Bool", False),
+                        ],
+                    )
+                )
+            elif tag in values:
+                result.append((response, *values[tag]))
+            elif tag != "BAT_REQ_INTERNALS":
+                result.append(_error(response, RscpError.RSCP_ERR_NOT_AVAILABLE))
+        return ("BAT_DATA", RscpType.Container.name, result)
+
+    def _battery_values(self, dcb_count: int) -> dict[str, tuple[str, Any]]:
+        """Return the readings of a battery pack."""
+        soc = self._state.soc
+        capacity = dcb_count * 50.0
+        current = self._readings["battery"] / 51.2 / len(self.model.batteries)
+        return {
+            "BAT_REQ_ASOC": ("Float32", 98.0),
+            "BAT_REQ_CHARGE_CYCLES": ("Uint32", 412),
+            "BAT_REQ_CURRENT": ("Float32", current),
+            "BAT_REQ_DCB_COUNT": ("UChar8", dcb_count),
+            "BAT_REQ_DESIGN_CAPACITY": ("Float32", capacity),
+            "BAT_REQ_DEVICE_NAME": ("CString", "BAT_STAND_IN"),
+            "BAT_REQ_EOD_VOLTAGE": ("Float32", 44.0),
+            "BAT_REQ_ERROR_CODE": ("Uint32", 0),
+            "BAT_REQ_FCC": ("Float32", capacity * 0.98),
+            "BAT_REQ_MAX_BAT_VOLTAGE": ("Float32", 56.8),
+            "BAT_REQ_MAX_CHARGE_CURRENT": ("Float32", 90.0),
+            "BAT_REQ_MAX_DCB_CELL_TEMPERATURE": ("Float32", 24.5),
+            "BAT_REQ_MAX_DISCHARGE_CURRENT": ("Float32", 90.0),
+            "BAT_REQ_MIN_DCB_CELL_TEMPERATURE": ("Float32", 21.0),
+            "BAT_REQ_MODULE_VOLTAGE": ("Float32", 51.2),
+            "BAT_REQ_RC": ("Float32", capacity * 0.98 * soc / 100),
+            "BAT_REQ_READY_FOR_SHUTDOWN": ("Bool", False),
+            "BAT_REQ_RSOC": ("Float32", soc),
+            "BAT_REQ_RSOC_REAL": ("Float32", soc),
+            "BAT_REQ_STATUS_CODE": ("Uint32", 0),
+            "BAT_REQ_TERMINAL_VOLTAGE": ("Float32", 51.6),
+            "BAT_REQ_TOTAL_DISCHARGE_TIME": ("Uint32", 0),
+            "BAT_REQ_TOTAL_USE_TIME": ("Uint32", 0),
+            "BAT_REQ_TRAINING_MODE": ("UChar8", 0),
+            "BAT_REQ_USABLE_CAPACITY": ("Float32", capacity * 0.9),
+            "BAT_REQ_USABLE_REMAINING_CAPACITY": (
+                "Float32",
+                capacity * 0.9 * soc / 100,
+            ),
+        }
+
+    def _battery_dcb_value(
+        self, response: str, dcb_index: int, dcb_count: int
+    ) -> RscpMessage:
+        """Answer a request for one of the modules of a battery pack."""
+        if response == "BAT_DCB_ALL_CELL_TEMPERATURES":
+            return (
+                response,
+                RscpType.Container.name,
+                [
+                    ("BAT_DCB_INDEX", "Uint16", dcb_index),
+                    (
+                        "BAT_DATA",
+                        RscpType.Container.name,
+                        [
+                            ("BAT_DCB_CELL_TEMPERATURE", "Float32", 21.0 + sensor / 2)
+                            for sensor in range(4)
+                        ],
+                    ),
+                ],
+            )
+        if response == "BAT_DCB_ALL_CELL_VOLTAGES":
+            return (
+                response,
+                RscpType.Container.name,
+                [
+                    ("BAT_DCB_INDEX", "Uint16", dcb_index),
+                    (
+                        "BAT_DATA",
+                        RscpType.Container.name,
+                        [
+                            ("BAT_DCB_CELL_VOLTAGE", "Float32", 3.2 + cell / 1000)
+                            for cell in range(16)
+                        ],
+                    ),
+                ],
+            )
+        if response != "BAT_DCB_INFO":
+            return _error(response, RscpError.RSCP_ERR_NOT_AVAILABLE)
+
+        soc = self._state.soc
+        current = self._readings["battery"] / 51.2 / len(self.model.batteries)
+        return (
+            response,
+            RscpType.Container.name,
+            [
+                ("BAT_DCB_INDEX", "Uint16", dcb_index),
+                ("BAT_DCB_CURRENT", "Float32", current / dcb_count),
+                ("BAT_DCB_CURRENT_AVG_30S", "Float32", current / dcb_count),
+                ("BAT_DCB_CYCLE_COUNT", "Uint32", 412),
+                ("BAT_DCB_DESIGN_CAPACITY", "Float32", 50.0),
+                ("BAT_DCB_DESIGN_VOLTAGE", "Float32", 51.2),
+                ("BAT_DCB_DEVICE_NAME", "CString", "DCB_STAND_IN"),
+                ("BAT_DCB_END_OF_DISCHARGE", "Float32", 44.0),
+                ("BAT_DCB_ERROR", "Uint32", 0),
+                ("BAT_DCB_FULL_CHARGE_CAPACITY", "Float32", 49.0),
+                ("BAT_DCB_FW_VERSION", "Uint32", 0x0102),
+                ("BAT_DCB_MANUFACTURE_DATE", "Uint32", 1577836800),
+                ("BAT_DCB_MANUFACTURE_NAME", "CString", "Stand-in"),
+                ("BAT_DCB_MAX_CHARGE_CURRENT", "Float32", 30.0),
+                ("BAT_DCB_CHARGE_HIGH_TEMPERATURE", "Float32", 45.0),
+                ("BAT_DCB_MAX_CHARGE_VOLTAGE", "Float32", 56.8),
+                ("BAT_DCB_MAX_DISCHARGE_CURRENT", "Float32", 30.0),
+                ("BAT_DCB_CHARGE_LOW_TEMPERATURE", "Float32", 0.0),
+                ("BAT_DCB_NR_PARALLEL_CELL", "Uint16", 1),
+                ("BAT_DCB_NR_SENSOR", "Uint16", 4),
+                ("BAT_DCB_NR_SERIES_CELL", "Uint16", 16),
+                ("BAT_DCB_PCB_VERSION", "Uint32", 3),
+                ("BAT_DCB_PROTOCOL_VERSION", "Uint32", 2),
+                ("BAT_DCB_REMAINING_CAPACITY", "Float32", 49.0 * soc / 100),
+                ("BAT_DCB_SERIALCODE", "CString", f"SC{dcb_index:04d}"),
+                ("BAT_DCB_SERIALNO", "CString", f"SN{dcb_index:04d}"),
+                ("BAT_DCB_SOC", "Float32", soc),
+                ("BAT_DCB_SOH", "Float32", 98.0),
+                ("BAT_DCB_STATUS", "Uint32", 0),
+                ("BAT_DCB_VOLTAGE", "Float32", 51.6),
+                ("BAT_DCB_VOLTAGE_AVG_30S", "Float32", 51.6),
+                ("BAT_DCB_WARNING", "Uint32", 0),
+            ],
+        )
+
+    def _handle_db_history(self, request: RscpMessage) -> RscpMessage:
+        """Answer DB_REQ_HISTORY_DATA_DAY with plausible sums for the timespan."""
+        params = {tag: value for tag, _, value in request[2]}
+        hours = params.get("DB_REQ_HISTORY_TIME_SPAN", 0) / 3600
+        if hours <= 0:
+            return _error("DB_HISTORY_DATA_DAY", RscpError.RSCP_ERR_OUT_OF_BOUNDS)
+
+        solar = self.model.installed_peak_power * 0.2 * hours
+        consumption = 450 * hours
+        return (
+            "DB_HISTORY_DATA_DAY",
+            RscpType.Container.name,
+            [
+                (
+                    "DB_SUM_CONTAINER",
+                    RscpType.Container.name,
+                    [
+                        ("DB_GRAPH_INDEX", "Float32", 0.0),
+                        ("DB_BAT_POWER_IN", "Float32", solar * 0.3),
+                        ("DB_BAT_POWER_OUT", "Float32", solar * 0.25),
+                        ("DB_DC_POWER", "Float32", solar),
+                        ("DB_GRID_POWER_IN", "Float32", solar * 0.4),
+                        ("DB_GRID_POWER_OUT", "Float32", consumption * 0.2),
+                        ("DB_CONSUMPTION", "Float32", consumption),
+                        ("DB_PM_0_POWER", "Float32", 0.0),
+                        ("DB_PM_1_POWER", "Float32", 0.0),
+                        ("DB_BAT_CHARGE_LEVEL", "Float32", self._state.soc),
+                        ("DB_AUTARKY", "Float32", 80.0),
+                        ("DB_CONSUMED_PRODUCTION", "Float32", 60.0),
+                    ],
+                )
+            ],
+        )
+
+
+class _Session:
+    """A single client connection to the stand-in."""
+
+    def __init__(
+        self,
+        standin: E3DCStandIn,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Initialize the session."""
+        self._standin: E3DCStandIn = standin
+        self._reader: asyncio.StreamReader = reader
+        self._writer: asyncio.StreamWriter = writer
+        self._encdec: RSCPEncryptDecrypt = RSCPEncryptDecrypt(
+            standin.model.key.encode()
+        )
+        self._authenticated: bool = False
+
+    async def async_run(self) -> None:
+        """Answer frames until the client disconnects."""
+        peer = self._writer.get_extra_info("peername")
+        _LOGGER.info("Client %s connected", peer)
+        model = self._standin.model
+        try:
+            while True:
+                requests = await self._async_receive()
+                if requests is None:
+                    _LOGGER.warning("Dropping %s, cannot decrypt its frame", peer)
+                    break
+                _LOGGER.debug("Received %s", [request[0] for request in requests])
+
+                delay = model.latency + random.uniform(0, model.jitter)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                # Dropping the authentication would look like a wrong RSCP key.
+                if self._authenticated and random.random() < model.drop_rate:
+                    _LOGGER.info("Dropping %s as configured", peer)
+                    break
+
+                responses = [self._answer(request) for request in requests]
+                payload = b"".join(_encode(response) for response in responses)
+                self._writer.write(self._encdec.encrypt(rscpFrame(payload)))
+                await self._writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            _LOGGER.info("Client %s disconnected", peer)
+            self._writer.close()
+
+    async def _async_receive(self) -> list[RscpMessage] | None:
+        """Receive a frame and decode its requests, None if it is garbage."""
+        decrypted = self._encdec.decrypt(
+            await self._reader.readexactly(BLOCK_SIZE)
+        ).ljust(BLOCK_SIZE, b"\x00")
+        magic, ctrl, _, _, _, length = struct.unpack(
+            _FRAME_HEADER_FORMAT, decrypted[:_FRAME_HEADER_SIZE]
+        )
+        if endianSwapUint16(magic) != _FRAME_MAGIC:
+            return None
+
+        frame_size = _FRAME_HEADER_SIZE + length
+        if endianSwapUint16(ctrl) & _FRAME_CTRL_CRC:
+            frame_size += 4
+        remaining = -(-frame_size // BLOCK_SIZE) * BLOCK_SIZE - BLOCK_SIZE
+        if remaining > 0:
+            decrypted += self._encdec.decrypt(
+                await self._reader.readexactly(remaining)
+            ).ljust(remaining, b"\x00")
+
+        payload = rscpFrameDecode(decrypted[:frame_size])[0]
+        requests: list[RscpMessage] = []
+        offset = 0
+        while offset < len(payload):
+            request, used = rscpDecode(payload[offset:])
+            requests.append(request)
+            offset += used
+        return requests
+
+    def _answer(self, request: RscpMessage) -> RscpMessage:
+        """Answer a request, taking care of the authentication."""
+        if request[0] == RscpTag.RSCP_REQ_AUTHENTICATION.name:
+            credentials = {tag: value for tag, _, value in request[2]}
+            model = self._standin.model
+            self._authenticated = (
+                credentials.get("RSCP_AUTHENTICATION_USER") == model.username
+                and credentials.get("RSCP_AUTHENTICATION_PASSWORD") == model.password
+            )
+            return (
+                "RSCP_AUTHENTICATION",
+                "UChar8",
+                _USER_LEVEL if self._authenticated else 0,
+            )
+        if not self._authenticated:
+            return _error(_response_tag(request[0]), RscpError.RSCP_ERR_ACCESS_DENIED)
+        return self._standin.answer(request)
+
+
+async def async_start_standin(
+    model: StandInModel, host: str = "127.0.0.1", port: int = 0
+) -> asyncio.Server:
+    """Start a stand-in server, port 0 picks a free one."""
+    standin = E3DCStandIn(model)
+
+    async def _async_handle(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        await _Session(standin, reader, writer).async_run()
+
+    return await asyncio.start_server(_async_handle, host, port)
+
+
+def _powermeter_type(value: str) -> PowermeterType:
+    """Parse a powermeter type like additional-production."""
+    try:
+        return PowermeterType["PM_TYPE_" + value.upper().replace("-", "_")]
+    except KeyError as ex:
+        raise argparse.ArgumentTypeError(f"unknown powermeter type {value}") from ex
+
+
+def _parse_args() -> tuple[argparse.Namespace, StandInModel]:
+    """Build the model from the command line."""
+    defaults = StandInModel()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5033)
+    parser.add_argument("--username", default=defaults.username)
+    parser.add_argument("--password", default=defaults.password)
+    parser.add_argument("--key", default=defaults.key, help="RSCP key")
+    parser.add_argument(
+        "--serial", default=defaults.serial_number, help="serial without prefix"
+    )
+    parser.add_argument("--sw-release", default=defaults.sw_release)
+    parser.add_argument("--timezone", default=defaults.timezone)
+    parser.add_argument("--wallboxes", type=int, default=defaults.wallboxes)
+    parser.add_argument(
+        "--battery",
+        type=int,
+        action="append",
+        metavar="DCBS",
+        help="add a battery pack with the given number of modules, "
+        "default is a single pack with 3 modules",
+    )
+    parser.add_argument(
+        "--powermeter",
+        type=_powermeter_type,
+        action="append",
+        default=[],
+        metavar="TYPE",
+        help="add a powermeter next to the root one, e.g. additional-production",
+    )
+    parser.add_argument("--farm-controller", action="store_true")
+    parser.add_argument(
+        "--remote-control",
+        default="",
+        metavar="HOST:PORT",
+        help="farm controller this E3DC is a member of",
+    )
+    parser.add_argument("--no-sgready", action="store_true")
+    parser.add_argument(
+        "--latency", type=float, default=0, help="delay of every answer in ms"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0, help="random additional delay in ms"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0,
+        help="probability of answering a request with an error",
+    )
+    parser.add_argument(
+        "--drop-rate",
+        type=float,
+        default=0,
+        help="probability of dropping the connection instead of answering",
+    )
+    parser.add_argument(
+        "--unavailable",
+        action="append",
+        default=[],
+        metavar="TAG",
+        help="request tag to answer with RSCP_ERR_NOT_AVAILABLE",
+    )
+    parser.add_argument("--seed", type=int, help="seed for the injected faults")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    model = StandInModel(
+        username=args.username,
+        password=args.password,
+        key=args.key,
+        serial_number=args.serial,
+        sw_release=args.sw_release,
+        timezone=args.timezone,
+        farm_controller=args.farm_controller,
+        remote_control=args.remote_control,
+        wallboxes=args.wallboxes,
+        batteries=args.battery if args.battery is not None else defaults.batteries,
+        powermeters=args.powermeter,
+        sgready=not args.no_sgready,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        unavailable=set(args.unavailable),
+    )
+    return args, model
+
+
+async def _async_main() -> None:
+    """Run the stand-in until interrupted."""
+    args, model = _parse_args()
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    server = await async_start_standin(model, args.host, args.port)
+    _LOGGER.info(
+        "E3DC stand-in %s listening on %s:%s, user %s, RSCP key %s",
+        model.serial,
+        args.host,
+        args.port,
+        model.username,
+        model.key,
+    )
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    with suppress(KeyboardInterrupt):
+        asyncio.run(_async_main())